@@ -1,10 +1,25 @@
+"""
+PyFBA: flux balance analysis of metabolic models.
 
+The subpackages (PyFBA.fba, PyFBA.gapfill, PyFBA.lp, ...) are only imported when you first use them, so
+``import PyFBA`` is quick and does not need the ModelSEED database or glpk.
+"""
 
-import PyFBA.fba
-import PyFBA.filters
-import PyFBA.gapfill
-import PyFBA.metabolism
-import PyFBA.parse
-import PyFBA.model
+import importlib
 
 __version__ = 0.100
+
+_subpackages = ('fba', 'filters', 'gapfill', 'gapgeneration', 'lp', 'metabolism', 'model', 'parse')
+
+
+def __getattr__(name):
+    """
+    Import a subpackage the first time it is used
+    """
+    if name in _subpackages:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + list(_subpackages))
@@ -1,8 +1,14 @@
-from .external_reactions import uptake_and_secretion_reactions, remove_uptake_and_secretion_reactions
+from .external_reactions import uptake_and_secretion_reactions, remove_uptake_and_secretion_reactions, exchange_reaction
 from .create_stoichiometric_matrix import create_stoichiometric_matrix
-from .bounds import reaction_bounds, compound_bounds
+from .bounds import reaction_bounds, compound_bounds, uptake_from_media
 from .run_fba import run_fba
 from .fluxes import reaction_fluxes
+from .growth_tester import GrowthTester
+from .result import FBAResult
+from .media_screen import screen_media
+from .result_store import ResultStore, fba_key
 
-__all__ = ['uptake_and_secretion_reactions', 'remove_uptake_and_secretion_reactions', 'create_stoichiometric_matrix',
-           'reaction_bounds', 'compound_bounds', 'run_fba', 'reaction_fluxes']
+__all__ = ['uptake_and_secretion_reactions', 'remove_uptake_and_secretion_reactions', 'exchange_reaction',
+           'create_stoichiometric_matrix',
+           'reaction_bounds', 'compound_bounds', 'uptake_from_media', 'run_fba', 'reaction_fluxes', 'GrowthTester',
+           'FBAResult', 'screen_media', 'ResultStore', 'fba_key']
@@ -51,20 +51,7 @@ def reaction_bounds(reactions, reactions_to_run, media, lower=-1000.0, mid=0.0,
 
         # this is where we define whether our media has the components
         if r != 'BIOMASS_EQN' and reactions[r].is_uptake_secretion:
-            in_media = False
-            override = False # if we have external compounds that are not in the media, we don't want to run this as a media reaction
-            for c in reactions[r].left_compounds:
-                if c.location == 'e':
-                    if c in media:
-                        in_media = True
-                    else:
-                        override = True
-            # in this case, we have some external compounds that we should not import.
-            # for example,
-            if override:
-                in_media = False
-
-            if in_media:
+            if uptake_from_media(reactions[r], media):
                 rbvals[r] = (lower, upper)
                 media_uptake_secretion_count += 1
             else:
@@ -97,6 +84,34 @@ def reaction_bounds(reactions, reactions_to_run, media, lower=-1000.0, mid=0.0,
     return rbvals
 
 
+def uptake_from_media(reaction, media):
+    """
+    Can this uptake and secretion reaction take things up from the media? That is only true if all of its external
+    compounds are in the media. Otherwise it can only secrete.
+
+    :param reaction: The uptake and secretion reaction
+    :type reaction: metabolism.Reaction
+    :param media: The media compounds
+    :type media: set
+    :return: Whether the reaction can take up compounds from the media
+    :rtype: bool
+    """
+
+    in_media = False
+    override = False # if we have external compounds that are not in the media, we don't want to run this as a media reaction
+    for c in reaction.left_compounds:
+        if c.location == 'e':
+            if c in media:
+                in_media = True
+            else:
+                override = True
+    # in this case, we have some external compounds that we should not import.
+    # for example,
+    if override:
+        in_media = False
+    return in_media
+
+
 def compound_bounds(cp, lower=0, upper=0):
     """
     Impose constraints on the compounds. These constraints limit what
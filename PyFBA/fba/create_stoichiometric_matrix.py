@@ -1,4 +1,6 @@
 import sys
+from collections import ChainMap
+
 import PyFBA
 from PyFBA import lp
 
@@ -35,50 +37,55 @@ def create_stoichiometric_matrix(reactions_to_run, reactions, compounds, media,
     :type original_reactions_to_run: set
     :param verbose: print more information
     :type verbose: bool
-    :returns: Sorted lists of all the compounds and reactions in the model, and a revised reactions dict that includes the uptake and secretion reactions
-    :rtype: list, list, dict
+    :returns: Sorted lists of all the compounds and reactions in the model, and a view of the reactions dict that also includes the uptake and secretion reactions (the reactions dict itself is not changed)
+    :rtype: list, list, collections.ChainMap
 
     """
 
-    sm = {}  # the matrix
-    allcpds = set()  # all the cpds in the matrix
+    # Internally we use the interned integers for the compounds and reactions (see PyFBA.metabolism.interning) and
+    # only convert back to names when we name the rows and columns of the LP.
+    compound_index = PyFBA.metabolism.compound_index
+    reaction_index = PyFBA.metabolism.reaction_index
+
+    sm = {}  # the matrix. The keys are compound integers and the values are dicts of reaction integer: stoichiometry
 
-    # initialize the compounds set and the stoichiometric matrix with
-    # everything in the media. The order of compounds is irrelevant
+    # initialize the stoichiometric matrix with everything in the media. The order of compounds is irrelevant
     for c in media:
         if str(c) not in compounds:
             compounds[str(c)] = c
-        allcpds.add(str(c))
-        sm[str(c)] = {}
+        sm[compound_index(c)] = {}
 
     # iterate through the reactions
     for r in reactions_to_run:
-        for c in reactions[r].left_compounds:
-            allcpds.add(str(c))
-            if str(c) not in sm:
-                sm[str(c)] = {}
-            sm[str(c)][r] = 0 - reactions[r].get_left_compound_abundance(c)
-
-        for c in reactions[r].right_compounds:
-            allcpds.add(str(c))
-            if str(c) not in sm:
-                sm[str(c)] = {}
-            sm[str(c)][r] = reactions[r].get_right_compound_abundance(c)
-
+        ri = reaction_index(r)
+        rxn = reactions[r]
+        for c in rxn.left_compounds:
+            ci = compound_index(c)
+            if ci not in sm:
+                sm[ci] = {}
+            sm[ci][ri] = 0 - rxn.left_abundance[c]
+
+        for c in rxn.right_compounds:
+            ci = compound_index(c)
+            if ci not in sm:
+                sm[ci] = {}
+            sm[ci][ri] = rxn.right_abundance[c]
+
+    biomass_index = reaction_index("BIOMASS_EQN")
     for c in biomass_equation.left_compounds:
         if str(c) not in compounds:
             compounds[str(c)] = c
-        allcpds.add(str(c))
-        if str(c) not in sm:
-            sm[str(c)] = {}
-        sm[str(c)]["BIOMASS_EQN"] = 0 - biomass_equation.get_left_compound_abundance(c)
+        ci = compound_index(c)
+        if ci not in sm:
+            sm[ci] = {}
+        sm[ci][biomass_index] = 0 - biomass_equation.get_left_compound_abundance(c)
     for c in biomass_equation.right_compounds:
         if str(c) not in compounds:
             compounds[str(c)] = c
-        allcpds.add(str(c))
-        if str(c) not in sm:
-            sm[str(c)] = {}
-        sm[str(c)]["BIOMASS_EQN"] = biomass_equation.get_right_compound_abundance(c)
+        ci = compound_index(c)
+        if ci not in sm:
+            sm[ci] = {}
+        sm[ci][biomass_index] = biomass_equation.get_right_compound_abundance(c)
 
     # Add the uptake/secretion reactions. These are reactions that allow things to flow from the media
     # into the reaction, or from the cell outwards.
@@ -87,48 +94,64 @@ def create_stoichiometric_matrix(reactions_to_run, reactions, compounds, media,
     # of the equation to the stoichiometric matrix. This means that they can appear and disappear at will!
     #
     # When we set the reaction bounds we determine which things are in the media unless they are provided for you
+    #
+    # We don't add these to the reactions dict (it is usually the whole database and may be shared with other
+    # models), instead we return a view that layers them on top of it.
 
     if not uptake_secretion:
-        uptake_secretion = PyFBA.fba.uptake_and_secretion_reactions(allcpds, compounds)
+        external = set()
+        for ci in sm:
+            name, location = PyFBA.metabolism.interning.compound_table.key(ci)
+            if location == 'e' or name == 'Biomass':
+                external.add(PyFBA.metabolism.compound_string(ci))
+        uptake_secretion = PyFBA.fba.uptake_and_secretion_reactions(external, compounds)
+    exchange = {}
+    exchange_indices = []
     for r in uptake_secretion:
-        reactions[uptake_secretion[r].name] = uptake_secretion[r]
-        for c in uptake_secretion[r].left_compounds:
-            allcpds.add(str(c))
-            if str(c) not in sm:
-                sm[str(c)] = {}
-            sm[str(c)][uptake_secretion[r].name] = 0 - uptake_secretion[r].get_left_compound_abundance(c)
+        usr = uptake_secretion[r]
+        exchange[usr.name] = usr
+        ri = reaction_index(usr.name)
+        exchange_indices.append(ri)
+        for c in usr.left_compounds:
+            ci = compound_index(c)
+            if ci not in sm:
+                sm[ci] = {}
+            sm[ci][ri] = 0 - usr.get_left_compound_abundance(c)
 
     # now we need to make this into a matrix sorted by
     # reaction id and by cpds
-    cp = list(allcpds)
-    cp.sort()
+    cpi = sorted(sm, key=PyFBA.metabolism.compound_string)
+    cp = [PyFBA.metabolism.compound_string(ci) for ci in cpi]
     rc = list(reactions_to_run)
     rc.sort()
+    rci = [reaction_index(r) for r in rc]
     rc += [uptake_secretion[x].name for x in uptake_secretion]
+    rci += exchange_indices
 
     # it is important that we add these at the end
     rc.append("BIOMASS_EQN")
+    rci.append(biomass_index)
 
     if verbose:
         sys.stderr.write(sys.argv[0] + ": " + str(len(cp)) + " compounds and " + str(len(rc)) + " reactions\n")
 
-    # here we create the matrix from our sm hash
+    # here we create the matrix from our sm hash. We only keep the non-zero entries: for a large model (or the whole
+    # database) the full matrix would not fit in memory
+    columns = {}
+    for j, ri in enumerate(rci):
+        columns.setdefault(ri, []).append(j)
     data = []
-    for i, j in enumerate(cp):
-        if j not in sm:
-            sys.exit("Error while parsing: no " + j + " in sm")
-        data.append([])
-        for c in rc:
-            if c in sm[j]:
-                data[i].append(sm[j][c])
-            else:
-                data[i].append(0.0)
+    for i, ci in enumerate(cpi):
+        for ri, val in sm[ci].items():
+            if val:
+                for j in columns[ri]:
+                    data.append((i, j, val))
 
     # load the data into the model
     if likelihood_gapfill:
-        PyFBA.lp.load(data, cp, rc, likelihood_gapfill=True)
+        PyFBA.lp.load_sparse(data, cp, rc, likelihood_gapfill=True)
     else:
-        PyFBA.lp.load(data, cp, rc)
+        PyFBA.lp.load_sparse(data, cp, rc)
 
     # Now set the objective function.
     # In likelihood-based gapfill mode, the objective coefficients are penalty values for adding
@@ -157,4 +180,4 @@ def create_stoichiometric_matrix(reactions_to_run, reactions, compounds, media,
 
     PyFBA.lp.objective_coefficients(ob)
 
-    return cp, rc, reactions
+    return cp, rc, ChainMap(exchange, reactions)
@@ -1,7 +1,64 @@
 import copy
+import threading
 
 import PyFBA
 
+# The uptake and secretion reactions only depend on the compound that they move across the boundary, so we build each
+# of them once and share them between all the models (and threads) that need them. The key is str(compound).
+_exchange_reactions = {}
+_exchange_lock = threading.Lock()
+
+
+def _new_exchange_reaction(compound):
+    """
+    Build a new uptake and secretion reaction for a compound. This does not change the compound.
+
+    :param compound: The compound that is taken up and/or secreted
+    :type compound: PyFBA.metabolism.Compound
+    :return: The uptake and secretion reaction
+    :rtype: PyFBA.metabolism.Reaction
+    """
+
+    # we need to add a new compound like this with a false location
+    us_leftside = compound
+    us_rightside = copy.copy(us_leftside)
+    us_rightside.location = 'b'
+    # this is similar name that they use in the model seed
+    # us_reaction = Reaction("EX_" + us_leftside.model_seed_id + "_" + us_leftside.location + "0")
+    # but we normally use a different name
+    us_reaction = PyFBA.metabolism.Reaction("UPTAKE_SECRETION_REACTION " + us_leftside.model_seed_id)
+    us_reaction.equation = '(1) + ' + str(us_leftside) + " <=> (1) + " + str(us_rightside)
+    us_reaction.add_left_compounds({us_leftside})
+    us_reaction.set_left_compound_abundance(us_leftside, 1)
+    us_reaction.add_right_compounds({us_rightside})
+    us_reaction.set_right_compound_abundance(us_rightside, 1)
+    us_reaction.set_direction('=')
+    us_reaction.is_uptake_secretion = True
+    return us_reaction
+
+
+def exchange_reaction(compound):
+    """
+    Get the uptake and secretion reaction for a compound. The reaction is only made the first time we ask for it, and
+    after that everyone gets the same Reaction object back, so please don't change it.
+
+    :param compound: The compound that is taken up and/or secreted
+    :type compound: PyFBA.metabolism.Compound
+    :return: The uptake and secretion reaction
+    :rtype: PyFBA.metabolism.Reaction
+    """
+
+    key = str(compound)
+    try:
+        return _exchange_reactions[key]
+    except KeyError:
+        pass
+
+    with _exchange_lock:
+        if key not in _exchange_reactions:
+            _exchange_reactions[key] = _new_exchange_reaction(compound)
+        return _exchange_reactions[key]
+
 
 def uptake_and_secretion_reactions(model_compounds, compounds):
     """
@@ -11,6 +68,9 @@ def uptake_and_secretion_reactions(model_compounds, compounds):
 
     We also add a reaction for biomass_equation
 
+    The reactions come from a cache (see exchange_reaction), and neither the compounds nor the reactions dict are
+    altered.
+
     :param model_compounds: A set of the identifiers of all the compounds we have identified so far
     :type model_compounds: set
     :param compounds: the dict of all the compounds
@@ -23,24 +83,8 @@ def uptake_and_secretion_reactions(model_compounds, compounds):
     for c in model_compounds:
         if compounds[c].location == 'e' or compounds[c].name == 'Biomass':
             # this is an uptake or secretion reaction
-            # we need to add a new compound like this with a false location
-            us_leftside = compounds[c]
-            us_rightside = copy.copy(us_leftside)
-            us_rightside.location = 'b'
-            # this is similar name that they use in the model seed
-            # us_reaction = Reaction("EX_" + us_leftside.model_seed_id + "_" + us_leftside.location + "0")
-            # but we normally use a different name
-            us_reaction = PyFBA.metabolism.Reaction("UPTAKE_SECRETION_REACTION " + us_leftside.model_seed_id)
-            us_reaction.equation = '(1) + ' + str(us_leftside) + " <=> (1) + " + str(us_rightside)
-            us_reaction.add_left_compounds({us_leftside})
-            us_reaction.set_left_compound_abundance(us_leftside, 1)
-            us_reaction.add_right_compounds({us_rightside})
-            us_reaction.set_right_compound_abundance(us_rightside, 1)
-            us_reaction.set_direction('=')
-            us_reaction.is_uptake_secretion = True
+            us_reaction = exchange_reaction(compounds[c])
             uptake_sec_reactions[str(us_reaction)] = us_reaction
-            us_leftside.add_reactions({us_reaction})
-            us_rightside.add_reactions({us_reaction})
 
     return uptake_sec_reactions
 
@@ -48,6 +92,10 @@ def uptake_and_secretion_reactions(model_compounds, compounds):
 def remove_uptake_and_secretion_reactions(reactions):
     """
     Remove all the uptake and secretion reactions added to a model, eg. when you are running multiple simulations.
+
+    Note that run_fba and create_stoichiometric_matrix no longer add the uptake and secretion reactions to the
+    reactions dict, so you only need this if you have added them yourself.
+
     :param reactions: The reactions dict
     :type reactions: dict
     :return: The enzymes, compounds, and reactions data structure
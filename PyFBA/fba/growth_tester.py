@@ -0,0 +1,76 @@
+import PyFBA
+
+
+class GrowthTester:
+    """
+    Test whether different sets of reactions grow on the same media, reusing the last solution where we can.
+
+    When we knock out reactions one (or a few) at a time, most of the reactions that we remove carried no flux in the
+    last solution that grew. That solution is still a solution without them, so we know the model still grows and we
+    don't need to run the fba. We only run the fba (and remember its fluxes) when the reactions that carried flux are
+    not all there.
+
+    :ivar solves: The number of fba that we have run
+    :type solves: int
+    :ivar saved: The number of times we knew the answer without running the fba
+    :type saved: int
+    """
+
+    def __init__(self, compounds, reactions, media, biomass_equation):
+        """
+        Create a new tester.
+
+        :param compounds: The dict of all compounds
+        :type compounds: dict
+        :param reactions: The dict of all reactions
+        :type reactions: dict
+        :param media: The media compounds
+        :type media: set
+        :param biomass_equation: The biomass_equation equation
+        :type biomass_equation: network.reaction.Reaction
+        """
+        self.compounds = compounds
+        self.reactions = reactions
+        self.media = media
+        self.biomass_equation = biomass_equation
+        self.solves = 0
+        self.saved = 0
+        # the reactions we ran, and those that carried flux, in the last fba that grew
+        self._solved = None
+        self._support = None
+
+    def _zero_flux_allowed(self, reactions_to_run):
+        """
+        Can all of these reactions have no flux? This is only not true if someone has set bounds that exclude 0.
+        """
+        for r in reactions_to_run:
+            lb = self.reactions[r].lower_bound
+            ub = self.reactions[r].upper_bound
+            if lb is not None and ub is not None and (lb > 0 or ub < 0):
+                return False
+        return True
+
+    def grows(self, reactions_to_run):
+        """
+        Does the model grow with these reactions?
+
+        :param reactions_to_run: the reactions to run
+        :type reactions_to_run: set or PyFBA.metabolism.ReactionSet
+        :return: Whether the model grows
+        :rtype: bool
+        """
+
+        reactions_to_run = PyFBA.metabolism.ReactionSet(reactions_to_run)
+        if self._support is not None and self._support.issubset(reactions_to_run) and \
+                self._zero_flux_allowed(reactions_to_run - self._solved):
+            self.saved += 1
+            return True
+
+        status, value, growth = PyFBA.fba.run_fba(self.compounds, self.reactions, reactions_to_run, self.media,
+                                                  self.biomass_equation)
+        self.solves += 1
+        if growth:
+            rxnfluxes = PyFBA.fba.reaction_fluxes()
+            self._solved = reactions_to_run
+            self._support = reactions_to_run & [r for r in rxnfluxes if rxnfluxes[r] != 0.0]
+        return growth
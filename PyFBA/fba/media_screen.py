@@ -0,0 +1,101 @@
+import sys
+
+import PyFBA
+
+
+def screen_media(compounds, reactions, reactions_to_run, media_list, biomass_equation, lower=-1000.0, upper=1000.0,
+                 verbose=False, store=None):
+    """
+    Run the fba for the same reactions on several media and return the result, including the shadow prices of the
+    compounds and the reduced costs of the reactions, for each of them.
+
+    We only build and load the stoichiometric matrix once, with the uptake and secretion reactions for the compounds
+    in all of the media. For each media we just change the bounds of the uptake and secretion reactions, so that they
+    can only take up the compounds in that media, and solve again.
+
+    The shadow prices tell you which compounds limit growth on each media: the compounds with the largest shadow
+    price are the ones where a little more would increase growth the most.
+
+    If store is a PyFBA.fba.ResultStore that keeps the fluxes, we only solve the media that we have not screened before
+    with the same reactions and biomass equation.
+
+    :param compounds: The dict of all compounds
+    :type compounds: dict
+    :param reactions: The dict of all reactions
+    :type reactions: dict
+    :param reactions_to_run: the reactions to run
+    :type reactions_to_run: set
+    :param media_list: The media to test. Each media is a set of compounds, or a PyFBA.parse.Medium
+    :type media_list: list of set
+    :param biomass_equation: The biomass_equation equation
+    :type biomass_equation: network.reaction.Reaction
+    :param lower: The lower bound for the reactions, as in PyFBA.fba.reaction_bounds: reversible reactions, reactions
+        that run right to left, and uptake and secretion reactions that can take up from the media
+    :type lower: float
+    :param upper: The upper bound for the reactions, as in PyFBA.fba.reaction_bounds
+    :type upper: float
+    :param verbose: Print more output
+    :type verbose: bool
+    :param store: A store of the results of earlier screens
+    :type store: PyFBA.fba.ResultStore
+    :return: The results for each media, in the same order as media_list
+    :rtype: list of PyFBA.fba.FBAResult
+    """
+
+    if not media_list:
+        return []
+
+    results = [None] * len(media_list)
+    keys = [None] * len(media_list)
+    if store is not None:
+        for i, media in enumerate(media_list):
+            keys[i] = PyFBA.fba.fba_key(reactions, reactions_to_run, media, biomass_equation, lower=lower, upper=upper,
+                                        screen=True)
+            results[i] = store.get(keys[i], solution=True)
+        if verbose:
+            sys.stderr.write("Found {} of {} media in the result store\n".format(
+                sum(r is not None for r in results), len(media_list)))
+        if all(r is not None for r in results):
+            return results
+
+    all_media = set()
+    for media in media_list:
+        all_media.update(media)
+
+    cp, rc, reactions = PyFBA.fba.create_stoichiometric_matrix(reactions_to_run, reactions, compounds, all_media,
+                                                               biomass_equation, verbose=False)
+    PyFBA.fba.compound_bounds(cp)
+    PyFBA.fba.reaction_bounds(reactions, rc, media_list[0], lower=lower, upper=upper)
+
+    # these are the only bounds that change between media. For each of them we keep the external compounds on the
+    # left as a bitset (see PyFBA.parse.media_bits) so we can tell if it takes up from the media with two bit operations
+    exchange = {}
+    for j, r in enumerate(rc):
+        if r == 'BIOMASS_EQN' or not reactions[r].is_uptake_secretion:
+            continue
+        if reactions[r].lower_bound is not None and reactions[r].upper_bound is not None:
+            continue
+        exchange[j] = PyFBA.parse.media_bits([c for c in reactions[r].left_compounds if c.location == 'e'])
+
+    if verbose:
+        sys.stderr.write("Screening {} media with {} compounds, {} reactions ".format(len(media_list), len(cp), len(rc)) +
+                         "and {} uptake and secretion reactions\n".format(len(exchange)))
+
+    for i, media in enumerate(media_list):
+        if results[i] is not None:
+            continue
+        # the same as PyFBA.fba.uptake_from_media: all the external compounds must be in the media
+        outside = ~PyFBA.parse.media_bits(media)
+        bounds = {}
+        for j, external in exchange.items():
+            if external and not external & outside:
+                bounds[j] = (lower, upper)
+            else:
+                bounds[j] = (0.0, upper)
+        PyFBA.lp.change_col_bounds(bounds)
+        status, value = PyFBA.lp.solve()
+        results[i] = PyFBA.fba.FBAResult.from_solver(status, value, value > 1, cp, rc)
+        if keys[i] is not None:
+            store.put(keys[i], results[i])
+
+    return results
@@ -0,0 +1,157 @@
+from array import array
+
+from PyFBA import lp
+
+
+class FBAResult:
+    """
+    The result of running an fba.
+
+    This is a copy of the solution, so it does not change when the next fba is loaded into the solver. The primals and
+    duals are stored as arrays in the same order as the rows (compounds) and columns (reactions) of the stoichiometric
+    matrix, and the dicts keyed by compound or reaction are only made if you ask for them.
+
+    An FBAResult unpacks like the tuple that run_fba usually returns::
+
+        status, value, growth = run_fba(compounds, reactions, reactions_to_run, media, biomass, result=True)
+
+    :ivar status: The status of the solution
+    :type status: str
+    :ivar value: The value of the objective (the biomass flux)
+    :type value: float
+    :ivar growth: Whether the model grew
+    :type growth: bool
+    :ivar compounds: The compounds (rows), in order
+    :type compounds: tuple of str
+    :ivar reactions: The reactions (columns), in order
+    :type reactions: tuple of str
+    :ivar col_primals: The flux through each reaction
+    :type col_primals: array.array
+    :ivar row_duals: The shadow price of each compound
+    :type row_duals: array.array
+    :ivar col_duals: The reduced cost of each reaction
+    :type col_duals: array.array
+    """
+
+    def __init__(self, status, value, growth, compounds, reactions, col_primals, row_duals, col_duals):
+        """
+        Create a new result. You probably want from_solver() instead.
+
+        :param status: The status of the solution
+        :type status: str
+        :param value: The value of the objective
+        :type value: float
+        :param growth: Whether the model grew
+        :type growth: bool
+        :param compounds: The compounds (rows), in order
+        :type compounds: list of str
+        :param reactions: The reactions (columns), in order
+        :type reactions: list of str
+        :param col_primals: The flux through each reaction
+        :type col_primals: list of float
+        :param row_duals: The shadow price of each compound
+        :type row_duals: list of float
+        :param col_duals: The reduced cost of each reaction
+        :type col_duals: list of float
+        """
+        self.status = status
+        self.value = value
+        self.growth = growth
+        self.compounds = tuple(compounds)
+        self.reactions = tuple(reactions)
+        self.col_primals = array('d', col_primals)
+        self.row_duals = array('d', row_duals)
+        self.col_duals = array('d', col_duals)
+        self._compound_index = None
+        self._reaction_index = None
+        self._fluxes = None
+        self._shadow_prices = None
+        self._reduced_costs = None
+
+    @classmethod
+    def from_solver(cls, status, value, growth, compounds, reactions, row_duals=None, col_duals=None):
+        """
+        Copy the current solution out of the solver.
+
+        :param status: The status of the solution
+        :type status: str
+        :param value: The value of the objective
+        :type value: float
+        :param growth: Whether the model grew
+        :type growth: bool
+        :param compounds: The compounds (rows) of the lp, in order
+        :type compounds: list of str
+        :param reactions: The reactions (columns) of the lp, in order
+        :type reactions: list of str
+        :param row_duals: The row duals if you have already read them (e.g. before a parsimonious fba)
+        :type row_duals: list of float
+        :param col_duals: The column duals if you have already read them
+        :type col_duals: list of float
+        :rtype: FBAResult
+        """
+        if row_duals is None:
+            row_duals = lp.row_duals()
+        if col_duals is None:
+            col_duals = lp.col_duals()
+        return cls(status, value, growth, compounds, reactions, lp.col_primals(), row_duals, col_duals)
+
+    def __iter__(self):
+        return iter((self.status, self.value, self.growth))
+
+    def __repr__(self):
+        return "FBAResult(status={}, value={}, growth={})".format(self.status, self.value, self.growth)
+
+    @property
+    def compound_index(self):
+        """
+        A dict of compound and its row
+        """
+        if self._compound_index is None:
+            self._compound_index = {c: i for i, c in enumerate(self.compounds)}
+        return self._compound_index
+
+    @property
+    def reaction_index(self):
+        """
+        A dict of reaction and its column
+        """
+        if self._reaction_index is None:
+            self._reaction_index = {r: j for j, r in enumerate(self.reactions)}
+        return self._reaction_index
+
+    @property
+    def fluxes(self):
+        """
+        A dict of reaction and its flux, like PyFBA.fba.reaction_fluxes()
+        """
+        if self._fluxes is None:
+            self._fluxes = dict(zip(self.reactions, self.col_primals))
+        return self._fluxes
+
+    @property
+    def shadow_prices(self):
+        """
+        A dict of compound and its shadow price (row dual)
+        """
+        if self._shadow_prices is None:
+            self._shadow_prices = dict(zip(self.compounds, self.row_duals))
+        return self._shadow_prices
+
+    @property
+    def reduced_costs(self):
+        """
+        A dict of reaction and its reduced cost (column dual)
+        """
+        if self._reduced_costs is None:
+            self._reduced_costs = dict(zip(self.reactions, self.col_duals))
+        return self._reduced_costs
+
+    def flux(self, reaction):
+        """
+        The flux through one reaction
+
+        :param reaction: The reaction id
+        :type reaction: str
+        :rtype: float
+        """
+        return self.col_primals[self.reaction_index[reaction]]
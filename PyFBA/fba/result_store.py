@@ -0,0 +1,247 @@
+"""
+A persistent store of fba results.
+
+We often run exactly the same fba again, e.g. when a pipeline is restarted with the same draft model, media and
+biomass equation. A ResultStore keeps the result of each fba in an SQLite database, so run_fba (and screen_media) can
+look the answer up instead of solving the lp again.
+
+The results are keyed by a hash of everything that changes the answer: the stoichiometry, direction and bounds of
+every reaction that we run, the biomass equation, the media (see PyFBA.parse.media_fingerprint), the options we ran the
+fba with, and the version of the solver. If any of those change we get a different key, so we never need to clear the
+store, but you can limit its size and the results that have not been used for the longest time are removed first.
+
+We always store the status, objective value and whether the model grew. If store_fluxes is True we also keep a
+compressed copy of the fluxes and duals, so we can return a complete PyFBA.fba.FBAResult.
+
+The database uses write-ahead logging, so several processes can share one store.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+import PyFBA
+
+# change this if the key or the stored data changes, so we don't read old results
+_STORE_VERSION = 1
+
+
+def _update_reaction(h, reaction):
+    """
+    Add everything about a reaction that changes the fba to a hash
+    """
+    h.update(repr((reaction.name, reaction.direction, reaction.lower_bound, reaction.upper_bound,
+                   reaction.is_uptake_secretion)).encode('utf-8'))
+    for side, abundance in (('l', reaction.left_abundance), ('r', reaction.right_abundance)):
+        compounds = reaction.left_compounds if side == 'l' else reaction.right_compounds
+        for c in sorted(compounds, key=str):
+            h.update(repr((side, str(c), abundance.get(c, 0))).encode('utf-8'))
+    h.update(b"\n")
+
+
+def fba_key(reactions, reactions_to_run, media, biomass_equation, uptake_secretion=None, **options):
+    """
+    The key for an fba: a hash of the reactions that we run, their bounds and stoichiometry, the biomass equation, the
+    media, any other options, and the solver version.
+
+    :param reactions: The dict of all reactions
+    :type reactions: dict
+    :param reactions_to_run: the reactions to run
+    :type reactions_to_run: set
+    :param media: The media compounds
+    :type media: set
+    :param biomass_equation: The biomass_equation equation
+    :type biomass_equation: PyFBA.metabolism.Reaction
+    :param uptake_secretion: The uptake and secretion reactions, if they are provided to run_fba
+    :type uptake_secretion: dict of PyFBA.metabolism.Reaction
+    :param options: Anything else that changes the result (e.g. pfba=True)
+    :return: The key
+    :rtype: str
+    """
+    h = hashlib.sha1()
+    h.update(repr((_STORE_VERSION, PyFBA.lp.solver_version(), sorted(options.items()))).encode('utf-8'))
+    h.update(PyFBA.parse.media_fingerprint(media).encode('utf-8'))
+    _update_reaction(h, biomass_equation)
+    for r in sorted(reactions_to_run):
+        if r in reactions:
+            _update_reaction(h, reactions[r])
+        else:
+            h.update(repr((r, None)).encode('utf-8'))
+    if uptake_secretion:
+        for r in sorted(uptake_secretion):
+            _update_reaction(h, uptake_secretion[r])
+    return h.hexdigest()
+
+
+class ResultStore:
+    """
+    A persistent store of fba results in an SQLite database.
+
+    :ivar path: The database file
+    :type path: str
+    :ivar max_bytes: The most data we keep. None means we keep everything
+    :type max_bytes: int
+    :ivar store_fluxes: Keep the fluxes and duals as well as the objective value
+    :type store_fluxes: bool
+    :ivar hits: The number of results that we found in the store
+    :type hits: int
+    :ivar misses: The number of results that we did not find
+    :type misses: int
+    """
+
+    def __init__(self, path=None, max_bytes=None, store_fluxes=False):
+        """
+        Open a result store, making it if it does not exist.
+
+        :param path: The database file. The default is fba_results-v1.sqlite in the PyFBA cache directory (see
+            PyFBA.parse.cache_dir)
+        :type path: str
+        :param max_bytes: The most data we keep. When there is more, we remove the results that were used longest ago
+        :type max_bytes: int
+        :param store_fluxes: Keep the fluxes and duals as well as the objective value
+        :type store_fluxes: bool
+        """
+        if path is None:
+            directory = PyFBA.parse.cache_dir()
+            if directory is None:
+                raise IOError("There is no cache directory for the fba results. Please provide a path")
+            path = os.path.join(directory, "fba_results-v{}.sqlite".format(_STORE_VERSION))
+        self.path = path
+        self.max_bytes = max_bytes
+        self.store_fluxes = store_fluxes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, status TEXT, value REAL, "
+                                 "growth INTEGER, solution BLOB, size INTEGER, used REAL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        """
+        Close the database
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get(self, key, solution=False):
+        """
+        Get a result.
+
+        :param key: The key for the fba (see fba_key)
+        :type key: str
+        :param solution: We need the fluxes and duals. If we only stored the objective value this is a miss
+        :type solution: bool
+        :return: The result, an FBAResult if we have the fluxes and duals, otherwise (status, value, growth), or None
+            if we don't have it
+        :rtype: PyFBA.fba.FBAResult or tuple
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT status, value, growth, solution FROM results WHERE key = ?",
+                                           (key,)).fetchone()
+            if row is None or (solution and row[3] is None):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._connection.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+        status, value, growth, data = row
+        if data is None:
+            return status, value, bool(growth)
+        compounds, reactions, col_primals, row_duals, col_duals = pickle.loads(zlib.decompress(data))
+        return PyFBA.fba.FBAResult(status, value, bool(growth), compounds, reactions, col_primals, row_duals,
+                                   col_duals)
+
+    def put(self, key, result):
+        """
+        Store a result.
+
+        :param key: The key for the fba (see fba_key)
+        :type key: str
+        :param result: The result. The fluxes and duals are only stored if this is an FBAResult and store_fluxes is True
+        :type result: PyFBA.fba.FBAResult or (str, float, bool)
+        """
+        status, value, growth = result
+        data = None
+        if self.store_fluxes and isinstance(result, PyFBA.fba.FBAResult):
+            data = zlib.compress(pickle.dumps((result.compounds, result.reactions, result.col_primals,
+                                               result.row_duals, result.col_duals), pickle.HIGHEST_PROTOCOL))
+        size = len(key) + len(status) + 16 + (len(data) if data else 0)
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                     (key, status, value, int(growth), data, size, time.time()))
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def size(self):
+        """
+        The amount of data that we have stored
+
+        :rtype: int
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def evict(self, max_bytes):
+        """
+        Remove the results that were used longest ago until we have at most max_bytes of data.
+
+        :param max_bytes: The most data to keep
+        :type max_bytes: int
+        :return: The number of results that we removed
+        :rtype: int
+        """
+        with self._lock:
+            total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total <= max_bytes:
+                return 0
+            remove = []
+            for key, size in self._connection.execute("SELECT key, size FROM results ORDER BY used"):
+                if total <= max_bytes:
+                    break
+                remove.append((key,))
+                total -= size
+            self._connection.execute("BEGIN")
+            self._connection.executemany("DELETE FROM results WHERE key = ?", remove)
+            self._connection.execute("COMMIT")
+            return len(remove)
+
+    def stats(self):
+        """
+        How well the store is working.
+
+        :return: The hits, misses, hit rate, number of results and size of the data
+        :rtype: dict
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                'results': len(self), 'bytes': self.size()}
+
+    def report(self, out=sys.stderr):
+        """
+        Write the stats to a file
+
+        :param out: Where to write them
+        :type out: file
+        """
+        s = self.stats()
+        out.write("FBA result store {}: {} hits, {} misses ({:.1%}), {} results, {} bytes\n".format(
+            self.path, s['hits'], s['misses'], s['hit_rate'], s['results'], s['bytes']))
@@ -4,11 +4,22 @@ from PyFBA import lp
 import PyFBA
 
 def run_fba(compounds, reactions, reactions_to_run, media, biomass_equation, uptake_secretion={}, verbose=False, likelihood_gapfill=False,
-            reaction_probs=None, original_reactions_to_run=None):
+            reaction_probs=None, original_reactions_to_run=None, pfba=False, result=False, store=None):
     """
     Run an fba for a set of data. We required the reactions object,
     a list of reactions to run, the media, and the biomass_equation equation.
 
+    If pfba is True and the model grows, we then run parsimonious FBA: we keep the biomass flux at its maximum and find
+    the fluxes with the smallest total absolute flux (see PyFBA.lp.parsimonious). The value we return is still the
+    biomass flux, and PyFBA.fba.reaction_fluxes() gives the parsimonious fluxes.
+
+    If result is True we return a PyFBA.fba.FBAResult, which is a copy of the fluxes and duals that is not changed by
+    the next fba (the duals are from the biomass optimization, even with pfba). It unpacks to the same three values.
+
+    If store is a PyFBA.fba.ResultStore we look for the result there first, and only run the fba if we have not run
+    exactly the same one before. When we find the result the lp is not loaded, so please use result=True (with a store
+    that keeps the fluxes) rather than PyFBA.fba.reaction_fluxes() if you need the fluxes.
+
     With all of these we run the fba and return:
 
     :param uptake_secretion: A hash of uptake and secretion reactions that should be added to the model. Calculated if not provided.
@@ -23,14 +34,28 @@ def run_fba(compounds, reactions, reactions_to_run, media, biomass_equation, upt
     :type media: set
     :param biomass_equation: The biomass_equation equation
     :type biomass_equation: network.reaction.Reaction
-    :param likelihood_gapfill: Run in likelihood-based gapfilling mode
+    :param likelihood_gapfill: Run in likelihood-based gapfilling mode. See also gapfill.suggest_by_likelihood, which
+        solves this as one mixed integer lp
     :type likelihood_gapfill: bool
     :param verbose: Print more output
     :type verbose: bool
+    :param pfba: Run parsimonious FBA after we find the maximum biomass flux
+    :type pfba: bool
+    :param result: Return an FBAResult
+    :type result: bool
+    :param store: A store of the results of earlier fba. It is not used with likelihood_gapfill
+    :type store: PyFBA.fba.ResultStore
     :return: which type of linear resolution, the output value of the model, whether the model grew
-    :rtype: (str, float, bool)
+    :rtype: (str, float, bool) or PyFBA.fba.FBAResult
 
     """
+    key = None
+    if store is not None and not likelihood_gapfill:
+        key = PyFBA.fba.fba_key(reactions, reactions_to_run, media, biomass_equation, uptake_secretion, pfba=pfba)
+        saved = store.get(key, solution=result)
+        if saved is not None:
+            return saved if result else tuple(saved)
+
     if likelihood_gapfill:
         # Run the FBA using the likelihood-based gapfill mode
         cp, rc, reactions = PyFBA.fba.create_stoichiometric_matrix(reactions_to_run, reactions, compounds, media, biomass_equation,
@@ -62,6 +87,26 @@ def run_fba(compounds, reactions, reactions_to_run, media, biomass_equation, upt
     growth = False
     if value > 1:
         growth = True
-    
+
+    row_duals = col_duals = None
+    if result:
+        row_duals = PyFBA.lp.row_duals()
+        col_duals = PyFBA.lp.col_duals()
+
+    if pfba and growth and not likelihood_gapfill:
+        pstatus, total_flux = PyFBA.lp.parsimonious()
+        if verbose:
+            sys.stderr.write("Parsimonious FBA: {} total flux {}\n".format(pstatus, total_flux))
+        if pstatus != 'opt':
+            sys.stderr.write("WARNING: Parsimonious FBA did not find a solution ({}). ".format(pstatus) +
+                             "The fluxes are not reliable\n")
+
+    if result:
+        fba_result = PyFBA.fba.FBAResult.from_solver(status, value, growth, cp, rc, row_duals, col_duals)
+        if key is not None:
+            store.put(key, fba_result)
+        return fba_result
+    if key is not None:
+        store.put(key, (status, value, growth))
     return status, value, growth
 
@@ -1,6 +1,7 @@
 from .reactions_and_proteins import reactions_with_no_proteins, reactions_with_proteins
-from .roles_and_reactions import roles_to_reactions, reactions_to_roles
+from .roles_and_reactions import roles_to_reactions, reactions_to_roles, role_reaction_index, genome_reactions
 from .roles_and_complexes import roles_to_complexes
 
 
-__all__ = ['reactions_with_no_proteins', 'reactions_with_proteins', 'roles_to_reactions', 'reactions_to_roles', 'roles_to_complexes']
+__all__ = ['reactions_with_no_proteins', 'reactions_with_proteins', 'roles_to_reactions', 'reactions_to_roles',
+           'role_reaction_index', 'genome_reactions', 'roles_to_complexes']
@@ -1,7 +1,13 @@
+import os
 import sys
 import re
+import threading
+
 import PyFBA
 
+_role_reaction_indexes = {}
+_lock = threading.Lock()
+
 
 def reactions_to_roles(reaction_set, verbose=False):
     """
@@ -80,35 +86,85 @@ def roles_to_reactions(roles, verbose=False):
     elif isinstance(roles, str):
         roles = {roles}
 
-    # key is complex and value is all reactions
-    cmpxs = PyFBA.parse.model_seed.complexes()
-    # key is role and value is all complexes
-    seedroles = PyFBA.parse.model_seed.roles()
+    # key is role and value is all reactions. This is only read once
+    index = role_reaction_index()
 
     rcts = {}
     for r in roles:
         # check to see if it is a multifunctional role
         if '; ' in r or ' / ' in r or ' @ ' in r:
             sys.stderr.write("It seems that {} is a multifunctional role. You should separate the roles\n".format(r))
-        if r not in seedroles:
+        if r not in index:
             if verbose:
                 sys.stderr.write(r + " is not a role we understand. Skipped\n")
             continue
 
-        rcts[r] = set()
-        for c in seedroles[r]:
-            if c not in cmpxs:
-                if verbose:
-                    # this occurs because there are reactions like cpx.1898 where we don't yet have a
-                    # reaction for the complex
-                    sys.stderr.write("ERROR: " + c + " was not found in the complexes file, but is from a reaction\n")
-                continue
-            for rc in cmpxs[c]:
-                rcts[r].add(rc)
+        rcts[r] = set(index[r])
 
     return rcts
 
 
+def _read_role_reaction_index():
+    """
+    Read the complexes and roles from the model seed and connect each role to its reactions.
+
+    :rtype: dict of str and frozenset
+    """
+    cmpxs = PyFBA.parse.model_seed.complexes()
+    seedroles = PyFBA.parse.model_seed.roles()
+    index = {}
+    for r in seedroles:
+        rcts = set()
+        for c in seedroles[r]:
+            if c in cmpxs:
+                rcts.update(cmpxs[c])
+        index[r] = frozenset(rcts)
+    return index
+
+
+def role_reaction_index():
+    """
+    Get the reactions for every role in the model seed. We only read the complexes and roles once, and we cache them
+    (see PyFBA.parse.cache), so this can be shared by everything that needs to connect roles to reactions.
+
+    :return: The reactions for each role
+    :rtype: dict of str and frozenset
+    """
+    directory = PyFBA.parse.model_seed.modelseed_dir()
+    files = [os.path.join(directory, "SOLRDump/TemplateReactions.tsv"),
+             os.path.join(directory, "SOLRDump/ComplexRoles.tsv")]
+    with _lock:
+        if directory not in _role_reaction_indexes:
+            _role_reaction_indexes[directory] = PyFBA.parse.cache.cached('role_reactions-v1', files,
+                                                                         _read_role_reaction_index)
+        return _role_reaction_indexes[directory]
+
+
+def genome_reactions(files, spreadsheet=False, verbose=False):
+    """
+    Read many RAST files, one genome at a time, and find the reactions for the roles in each genome.
+
+    We only keep the roles of one genome in memory at a time, and all of the genomes share one role_reaction_index.
+
+    :param files: The assigned functions files (or the spreadsheets) downloaded from RAST. See
+        PyFBA.parse.stream_functions
+    :type files: iterable of str or of (str, str)
+    :param spreadsheet: The files are spreadsheets (tab-separated text format) rather than assigned functions
+    :type spreadsheet: bool
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: The genome and the reactions for each of its roles that we know. This is the same as
+        roles_to_reactions for the roles in the genome
+    :rtype: generator of (str, dict of str and frozenset)
+    """
+    index = role_reaction_index()
+    for genome, roles in PyFBA.parse.genome_roles(files, spreadsheet, verbose):
+        known = {r: index[r] for r in roles if r in index}
+        if verbose:
+            sys.stderr.write("{}: {} of {} roles have reactions\n".format(genome, len(known), len(roles)))
+        yield genome, known
+
+
 if __name__ == '__main__':
     try:
         rt = sys.argv[1]
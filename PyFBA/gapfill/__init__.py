@@ -4,13 +4,16 @@ from .limit_reactions import limit_reactions_by_compound
 from .maps_to_proteins import suggest_reactions_without_proteins, suggest_reactions_with_proteins
 from .media import suggest_from_media
 from .orphan_compound import suggest_by_compound
-from .probability import compound_probability
+from .probability import compound_probability, compound_scores
 from .reaction_minimization import calculate_precision_recall
 from .reaction_minimization import minimize_additional_reactions
 from .reaction_minimization import minimize_by_accuracy
+from .reaction_minimization import group_test_reactions
 from .roles import suggest_from_roles
 from .subsystem import suggest_reactions_from_subsystems
 from .ecnumbers import suggest_reactions_using_ec
+from .whole_database import suggest_from_whole_database, suggest_by_likelihood
+from .reaction_clusters import cluster_reactions, write_clusters, read_clusters
 
 __all__ = ['suggest_reactions_using_ec',
            'suggest_from_media',
@@ -18,7 +21,8 @@ __all__ = ['suggest_reactions_using_ec',
            'suggest_by_compound',
            'suggest_essential_reactions', 'suggest_reactions_from_subsystems',
            'suggest_reactions_without_proteins', 'suggest_reactions_with_proteins',
-           'suggest_from_roles', 'compound_probability', 'minimize_additional_reactions',
+           'suggest_from_roles', 'compound_probability', 'compound_scores', 'minimize_additional_reactions',
            'bisect', 'percent_split', 'optimize_split_by_rclust', 'minimize_by_accuracy',
-           'calculate_precision_recall'
+           'calculate_precision_recall', 'group_test_reactions', 'suggest_from_whole_database',
+           'suggest_by_likelihood', 'cluster_reactions', 'write_clusters', 'read_clusters'
            ]
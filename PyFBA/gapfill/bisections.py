@@ -35,8 +35,9 @@ def percent_split(rxns, percent=50):
     :rtype: list, list
     """
 
-    brk = int(len(rxns) * (1.0 * percent/100))
-    return rxns[:brk], rxns[brk:]
+    rlist = list(rxns)
+    brk = int(len(rlist) * (1.0 * percent/100))
+    return rlist[:brk], rlist[brk:]
 
 
 def optimize_split_by_rclust(rxns, clusters, percent=50):
@@ -44,8 +45,8 @@ def optimize_split_by_rclust(rxns, clusters, percent=50):
     Optimize the split of reactions based on the reaction clusters.
 
     We have code that clusters reactions based on the Jaccard distance between the compounds in the reactions (see
-    example_code/group_reactions.py). This code uses that cluster information to try and optimize the split in reactions
-    to minimize the number of different clusters on each side of the split.
+    PyFBA.gapfill.cluster_reactions). This code uses that cluster information to try and optimize the split in
+    reactions to minimize the number of different clusters on each side of the split.
 
     The approach that we take here is to sort the reactions based on their cluster first, and then split the list
     although this imposes an order on the list before sort it should still work (I think) while being a lot more
@@ -1,10 +1,132 @@
 import os
 import sys
 import re
+import threading
 
-MODELSEED_DIR = os.environ['ModelSEEDDatabase']
+import PyFBA
 
-def suggest_reactions_using_ec(roles, reactions, reactions2run, rf="SOLRDump/Reactions.tsv", verbose=False):
+_ec_indexes = {}
+_lock = threading.Lock()
+
+
+class ECIndex:
+    """
+    The reactions for each EC number, stored as a trie with one level for each of the four parts of the EC number.
+
+    We can look up an EC number exactly (1.1.1.1), or with wildcards (1.1.1.- is all of the reactions whose EC number
+    starts with 1.1.1).
+    """
+
+    def __init__(self):
+        self.children = {}
+        self.reactions = set()
+
+    def add(self, ec, rxnid):
+        """
+        Add a reaction with an EC number.
+
+        :param ec: The EC number
+        :type ec: str
+        :param rxnid: The reaction id
+        :type rxnid: str
+        """
+        node = self
+        for part in ec.strip().split("."):
+            if part not in node.children:
+                node.children[part] = ECIndex()
+            node = node.children[part]
+        node.reactions.add(rxnid)
+
+    def _all_reactions(self):
+        """
+        All the reactions at or below this node
+        """
+        found = set(self.reactions)
+        for child in self.children.values():
+            found.update(child._all_reactions())
+        return found
+
+    def lookup(self, ec, wildcards=True):
+        """
+        Find the reactions for an EC number.
+
+        :param ec: The EC number
+        :type ec: str
+        :param wildcards: Treat a - in the EC number (other than the first number) as matching any number (including a
+            -). Otherwise only reactions with exactly this EC number are returned
+        :type wildcards: bool
+        :return: The reactions with this EC number
+        :rtype: set
+        """
+        parts = ec.strip().split(".")
+        # we need at least the class of the enzyme, so -.-.-.- is not all of the reactions
+        if not wildcards or '-' not in parts or parts[0] == '-':
+            node = self
+            for part in parts:
+                if part not in node.children:
+                    return set()
+                node = node.children[part]
+            return set(node.reactions)
+
+        nodes = [self]
+        for part in parts:
+            if part == '-':
+                nodes = [child for node in nodes for child in node.children.values()]
+            else:
+                nodes = [node.children[part] for node in nodes if part in node.children]
+            if not nodes:
+                return set()
+        found = set()
+        for node in nodes:
+            found.update(node._all_reactions())
+        return found
+
+
+def _read_ec_index(filename):
+    """
+    Read the ModelSEED reactions file and index the reactions by their EC numbers.
+
+    :param filename: The reactions file
+    :type filename: str
+    :rtype: ECIndex
+    """
+    index = ECIndex()
+    with open(filename, "r") as rin:
+        for l in rin:
+            if l.startswith("#") or l.startswith("id"):
+                # Ignore comment lines
+                continue
+            ll = l.strip().split("\t")
+            rxnid = ll[0]
+            ecs = ll[13]
+            # EC number might be null
+            if ecs == "null":
+                continue
+            # Multiple EC numbers can be assigned to a reaction
+            for e in ecs.split(";"):
+                index.add(e, rxnid)
+    return index
+
+
+def ec_index(rf="SOLRDump/Reactions.tsv"):
+    """
+    Get the index of the reactions for each EC number. We only read the reactions file once.
+
+    :param rf: a reactions file from the SEED, relative to the ModelSEEDDatabase directory
+    :type rf: str
+    :return: The index
+    :rtype: ECIndex
+    """
+    filename = os.path.abspath(os.path.join(os.environ.get('ModelSEEDDatabase', ''), rf))
+    with _lock:
+        if filename not in _ec_indexes:
+            _ec_indexes[filename] = PyFBA.parse.cache.cached('ec_numbers-v1', [filename],
+                                                                lambda: _read_ec_index(filename))
+        return _ec_indexes[filename]
+
+
+def suggest_reactions_using_ec(roles, reactions, reactions2run, rf="SOLRDump/Reactions.tsv", wildcards=True,
+                               verbose=False):
     """
     Identify a set of reactions that you should add to your model for growth based on the EC numbers
     that may be found in the role names.
@@ -17,51 +139,35 @@ def suggest_reactions_using_ec(roles, reactions, reactions2run, rf="SOLRDump/Rea
     :type reactions2run: set
     :param rf: a reactions file from the SEED
     :type rf: str
+    :param wildcards: Match partial EC numbers in the roles (e.g. 1.1.1.-) to all the reactions they could be
+    :type wildcards: bool
     :param verbose: add additional output
     :type verbose: bool
     :return: A set of proposed reactions that should be added to your model to see if it grows
     :rtype: set
     """
 
-    if not os.path.exists(os.path.join(MODELSEED_DIR, rf)):
-        sys.stderr.write("FATAL: The reactions file {} does not exist from the directory {}.".format(rf, MODELSEED_DIR) +
+    modelseed_dir = os.environ.get('ModelSEEDDatabase', '')
+    if not os.path.exists(os.path.join(modelseed_dir, rf)):
+        sys.stderr.write("FATAL: The reactions file {} does not exist from the directory {}.".format(rf, modelseed_dir) +
                          " Please provide a path to that file\n")
         return set()
 
-    # Read the ModelSEED reactions file
-    ec_to_reactions = {}
-    with open(os.path.join(MODELSEED_DIR, rf), "r") as rin:
-        for l in rin:
-            if l.startswith("#") or l.startswith("id"):
-                # Ignore comment lines
-                continue
-            ll = l.strip().split("\t")
-            rxnid = ll[0]
-            ecs = ll[13]
-            # EC number might be null
-            if ecs == "null":
-                continue
-            # Multiple EC numbers can be assigned to a reaction
-            for e in ecs.split(";"):
-                if e not in ec_to_reactions:
-                    ec_to_reactions[e] = set()
-                ec_to_reactions[e].add(rxnid)
+    index = ec_index(rf)
 
     # Find all EC numbers in the list of roles
-    suggested_reactions = set()
+    ecs = set()
     for role in roles:
-        # Extract each EC number
-        for ec in re.findall("[\d\-]+\.[\d\-]+\.[\d\-]+\.[\d\-]+", role):
-            # Check if we know what that EC number is
-            if ec in ec_to_reactions:
-                # Check all reactions mapping to that EC number to make sure
-                # we have seen that reaction before
-                for rxnid in ec_to_reactions[ec]:
-                    if rxnid in reactions:
-                        suggested_reactions.add(rxnid)
+        ecs.update(re.findall(r"[\d\-]+\.[\d\-]+\.[\d\-]+\.[\d\-]+", role))
+
+    suggested_reactions = set()
+    for ec in ecs:
+        # Check all reactions mapping to that EC number to make sure we have seen that reaction before
+        suggested_reactions.update(r for r in index.lookup(ec, wildcards) if r in reactions)
 
     if verbose:
-        sys.stderr.write("Found " + str(len(suggested_reactions)) + " reactions\n")
+        sys.stderr.write("Found " + str(len(suggested_reactions)) + " reactions for " + str(len(ecs)) +
+                         " EC numbers\n")
 
     # Remove reactions we already have
     suggested_reactions = suggested_reactions.difference(reactions2run)
@@ -1,6 +1,7 @@
+import PyFBA
 
 
-def limit_reactions_by_compound(reactions, reactions2run, suggestions, max_rcts=50):
+def limit_reactions_by_compound(reactions, reactions2run, suggestions, max_rcts=50, index=None):
     """
     Limit the reactions in suggestions based on the compounds present in
     the reactions in reactions2run and the number of reactions that each
@@ -13,26 +14,33 @@ def limit_reactions_by_compound(reactions, reactions2run, suggestions, max_rcts=
     :param reactions: The reactions dict
     :type reactions: dict
     :param reactions2run: our base set of reactions that we will run
-    :type reactions2run: set
+    :type reactions2run: set or PyFBA.metabolism.ReactionSet
     :param suggestions: the reactions we are considering adding
-    :type suggestions: set
+    :type suggestions: set or PyFBA.metabolism.ReactionSet
     :param max_rcts: the maximum number of reactions per compound
     :type max_rcts: int
+    :param index: An index that you keep for the model, so we only count the compounds in the reactions that changed
+    :type index: PyFBA.metabolism.CompoundReactionIndex
     :return: a set of reactions which is those members of suggestions that meet our criteria
     :rtype: set
 
     """
 
-    cpd = {}
-    for r in reactions2run:
-        for c in reactions[r].all_compounds():
-            cpd[str(c)] = cpd.get(str(c), 0) + 1
+    # count the reactions for each compound using the interned compound integers
+    if index is None:
+        index = PyFBA.metabolism.CompoundReactionIndex(reactions, reactions2run)
+    else:
+        index.sync(reactions2run)
+    cpd = index.degree
 
+    compound_index = PyFBA.metabolism.compound_index
     keep = set()
     for r in suggestions:
         for c in reactions[r].all_compounds():
-            if str(c) in cpd and (cpd[str(c)] < max_rcts):
+            ci = compound_index(c)
+            if ci in cpd and (cpd[ci] < max_rcts):
                 keep.add(r)
+                break
 
     keep.difference_update(reactions2run)
 
@@ -8,7 +8,8 @@ def suggest_reactions_without_proteins(reactions, verbose=False):
     Identify a set of reactions that don't have any proteins associated with them.
 
     It is generally a bad idea to add all of these to your model since there are about 30,000 and they will probably
-    break your computer if you try and solve it with FBA
+    break your computer if you try and solve it with FBA. If you want to consider all of them, use
+    suggest_from_whole_database, which finds the cheapest set of them that grows in a single lp.
 
 
     :param reactions: our reactions dictionary from parsing the model seed
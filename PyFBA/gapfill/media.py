@@ -1,7 +1,7 @@
 import sys
 
 
-def suggest_from_media(compounds, reactions, reactions2run, media, verbose=False):
+def suggest_from_media(compounds, reactions, reactions2run, media, verbose=False, index=None):
     """
     Identify a set of reactions that you should add to your model for growth based on the media compounds
 
@@ -15,6 +15,8 @@ def suggest_from_media(compounds, reactions, reactions2run, media, verbose=False
     :type reactions2run: set.
     :param media: A set of the compounds in the media
     :type media: set.
+    :param index: An index of the reactions for each compound. If you don't have one we use the compounds dict
+    :type index: PyFBA.metabolism.CompoundReactionIndex
     :return: A set of proposed reactions that should be added to your model to see if it grows
     :rtype: set
     """
@@ -23,7 +25,12 @@ def suggest_from_media(compounds, reactions, reactions2run, media, verbose=False
     suggest = set()
     for c in media:
         try:
-            rxns = compounds[str(c)].all_reactions()
+            if index is None:
+                rxns = compounds[str(c)].all_reactions()
+            else:
+                rxns = index.reactions_with(c)
+                if not rxns:
+                    raise KeyError(str(c))
         except KeyError:
             if verbose:
                 sys.stderr.write(str(c) + " does not exist in the database, probably because of its compartment\n")
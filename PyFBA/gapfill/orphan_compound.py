@@ -1,7 +1,9 @@
 import sys
 
+import PyFBA
 
-def suggest_by_compound(compounds, reactions, reactions2run, max_reactions, verbose=False):
+
+def suggest_by_compound(compounds, reactions, reactions2run, max_reactions, verbose=False, index=None):
     """
     Identify a set of reactions that you should add to your model for growth because they contain orphan compounds
 
@@ -31,29 +33,41 @@ def suggest_by_compound(compounds, reactions, reactions2run, max_reactions, verb
     :type max_reactions: int
     :param verbose: Print more output
     :type verbose: bool
+    :param index: An index that you keep for the model. If you don't have one we use the reactions in the compounds
+    :type index: PyFBA.metabolism.CompoundReactionIndex
     :return: A set of proposed reactions that should be added to your model to see if it grows
     :rtype: set
 
     """
 
-    cpd = {}
-    for r in reactions2run:
-        for c in reactions[r].all_compounds():
-            cpd[str(c)] = cpd.get(str(c), 0) + 1
+    if index is None:
+        cpd = PyFBA.metabolism.CompoundReactionIndex(reactions, reactions2run).degree
+    else:
+        index.sync(reactions2run)
+        cpd = index.degree
 
     ikeep = set()
     ekeep = set()
 
+    # we only need to look at the compounds in the model
     external = 0
     internal = 0
-    for c in compounds:
-        if str(compounds[c]) in cpd and cpd[str(compounds[c])] <= max_reactions:
-            if compounds[c].location == 'e':
-                external += 1
-                ekeep.update(compounds[c].all_reactions())
-            else:
-                internal += 1
-                ikeep.update(compounds[c].all_reactions())
+    for ci in cpd:
+        if cpd[ci] > max_reactions:
+            continue
+        if index is None:
+            c = PyFBA.metabolism.compound_string(ci)
+            if c not in compounds:
+                continue
+            rxns = compounds[c].all_reactions()
+        else:
+            rxns = index.reactions_with_index(ci)
+        if PyFBA.metabolism.interning.compound_location(ci) == 'e':
+            external += 1
+            ekeep.update(rxns)
+        else:
+            internal += 1
+            ikeep.update(rxns)
 
     if verbose:
         sys.stdout.write("{} | {} | {} | {} | {}\n".format(max_reactions, internal, len(ikeep), external, len(ekeep)))
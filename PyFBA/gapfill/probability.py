@@ -8,7 +8,8 @@ def compound_probability(reactions, reactions2run, cutoff=0, rxn_with_proteins=T
     Identify a set of reactions that you should add to your model for growth based on the probability for the reaction
     to run left to right and right to left.
 
-    The probability is basically the fraction of compounds that are present.
+    The probability is basically the fraction of compounds that are present (see compound_scores). The reactions are
+    not changed, so you can run this on the same reactions dict for different models at the same time.
 
     If you set cutoff to zero we calculate the minimum coverage of the compounds in the reactions already in the model
     and use that to determine which other reactions should be added based on the observation that they have a similar
@@ -28,42 +29,21 @@ def compound_probability(reactions, reactions2run, cutoff=0, rxn_with_proteins=T
     :rtype: set
     """
 
-    # get a set of all compounds in all the reactions
-    cpds = set()
-    for r in reactions2run:
-        cpds.update(reactions[r].all_compounds())
-
-    if verbose:
-        sys.stderr.write("There are " + str(len(cpds)) + " compounds before assigning probabilities\n")
-
-    r2rscores = {'left': [], 'right': []}
-
     rtest = set(reactions.keys())
     if rxn_with_proteins:
         # just consider those reactions with proteins
         rtest = suggest_reactions_with_proteins(reactions)
 
-    for r in rtest:
-        # score our probability as a similarity so 1 is good, 0 is bad
-        # similarity = (1.0 * len(t)-len(t.difference(s)))/len(t)
-        if len(reactions[r].left_compounds) > 0:
-            left = reactions[r].left_compounds
-            lsim = (1.0 * len(left) - len(left.difference(cpds))) / len(left)
-        else:
-            lsim = 0
-
-        if len(reactions[r].right_compounds) > 0:
-            right = reactions[r].right_compounds
-            rsim = (1.0 * len(right) - len(right.difference(cpds))) / len(right)
-        else:
-            rsim = 0
+    rtest = list(rtest)
+    left_scores, right_scores = compound_scores(reactions, reactions2run, rtest, verbose=verbose)
+    pLR = dict(zip(rtest, left_scores))
+    pRL = dict(zip(rtest, right_scores))
 
-        reactions[r].pLR = lsim
-        reactions[r].pRL = rsim
-
-        if r in reactions2run:
-            r2rscores['left'].append(lsim)
-            r2rscores['right'].append(rsim)
+    r2rscores = {'left': [], 'right': []}
+    for r in reactions2run:
+        if r in pLR:
+            r2rscores['left'].append(pLR[r])
+            r2rscores['right'].append(pRL[r])
 
     # what is the average score for our reactions2run?
     existing_scores = [
@@ -78,9 +58,9 @@ def compound_probability(reactions, reactions2run, cutoff=0, rxn_with_proteins=T
     for r in reactions:
         if r in reactions2run:
             continue
-        if reactions[r].pLR > cutoff:
+        if pLR.get(r, 0) > cutoff:
             suggested_reactions.add(r)
-        elif reactions[r].pRL > cutoff:
+        elif pRL.get(r, 0) > cutoff:
             suggested_reactions.add(r)
 
     if verbose:
@@ -91,3 +71,52 @@ def compound_probability(reactions, reactions2run, cutoff=0, rxn_with_proteins=T
         sys.stderr.write("Proposing " + str(len(suggested_reactions)) + " reactions\n")
 
     return suggested_reactions
+
+
+def compound_scores(reactions, reactions2run, rids, verbose=False):
+    """
+    Score each reaction by the fraction of the compounds on its left and on its right that are in the reactions we
+    are running. A reaction with no compounds on a side scores 0 for that side.
+
+    We look at the reactions as they are each time, so there is nothing to keep up to date if the reactions change.
+
+    :param reactions: our reactions dict
+    :type reactions: dict
+    :param reactions2run: The current set of reactions that we will run
+    :type reactions2run: set
+    :param rids: The reactions to score
+    :type rids: list
+    :param verbose: print more output
+    :type verbose: bool
+    :return: The left to right and right to left scores, in the same order as rids
+    :rtype: list, list
+    """
+
+    present = set()
+    for r in reactions2run:
+        present.update(reactions[r].all_compounds())
+
+    if verbose:
+        sys.stderr.write("There are " + str(len(present)) + " compounds before assigning probabilities\n")
+
+    left_scores = []
+    right_scores = []
+    for r in rids:
+        left_scores.append(_fraction_present(reactions[r].left_compounds, present))
+        right_scores.append(_fraction_present(reactions[r].right_compounds, present))
+    return left_scores, right_scores
+
+
+def _fraction_present(cpds, present):
+    """
+    The fraction of the compounds that are present, or 0 if there are no compounds
+
+    :param cpds: The compounds
+    :type cpds: set of PyFBA.metabolism.Compound
+    :param present: The compounds that are present
+    :type present: set of PyFBA.metabolism.Compound
+    :rtype: float
+    """
+    if not cpds:
+        return 0
+    return 1.0 * len(present.intersection(cpds)) / len(cpds)
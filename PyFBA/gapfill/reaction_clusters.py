@@ -0,0 +1,228 @@
+"""
+Cluster reactions by the compounds that they share.
+
+Comparing every pair of reactions (as example_code/group_reactions.py used to) is about a billion comparisons for the
+whole database. Instead we use MinHash and locality sensitive hashing (LSH): each reaction gets a short signature of
+the minimum hash of its compounds under several hash functions, and two reactions are only compared if they have the
+same values for all the hash functions in at least one band of the signature. The chance of that is high for
+reactions with similar compounds and low for different reactions, so we only compare reactions that are likely to be
+close. We then join the reactions that are closer than the threshold with single linkage clustering.
+
+cluster_reactions returns the cluster of each reaction and the number of clusters, like calculate_clusters in
+example_code/group_reactions.py. The dict of clusters can be written to (and read from) a compact binary file, and
+passed straight to PyFBA.gapfill.optimize_split_by_rclust.
+"""
+
+import random
+import struct
+import sys
+from array import array
+
+import PyFBA
+
+# a Mersenne prime for the universal hash functions
+_PRIME = (1 << 61) - 1
+_MAGIC = b'PyFBArc1'
+
+
+def cluster_reactions(reactions, rids=None, threshold=0.5, num_perm=64, max_compound_reactions=None, seed=42,
+                      max_bucket_size=200, verbose=False):
+    """
+    Cluster the reactions so that reactions with a Jaccard distance (1 - the number of compounds they share / the
+    number of compounds in either) less than threshold are in the same cluster.
+
+    This is approximate: two close reactions are very likely, but not certain, to be compared. Increase num_perm to
+    miss fewer of them. We compare every pair of reactions that share a bucket, so the clusters are the single linkage
+    clusters of those pairs, unless a bucket has more than max_bucket_size reactions. Then we only compare each
+    reaction in that bucket with the first one, and a few close reactions may be left in separate clusters.
+
+    :param reactions: The reactions dictionary
+    :type reactions: dict
+    :param rids: The reactions to cluster. The default is all of them
+    :type rids: list
+    :param threshold: The Jaccard distance below which we join reactions
+    :type threshold: float
+    :param num_perm: The number of hash functions in the signature of each reaction
+    :type num_perm: int
+    :param max_compound_reactions: Ignore compounds that are in more than this many of the reactions (e.g. H2O). The
+        default is to use all of the compounds
+    :type max_compound_reactions: int
+    :param seed: The seed for the hash functions, so that the clusters are the same each time
+    :type seed: int
+    :param max_bucket_size: The most reactions in a bucket for which we compare every pair
+    :type max_bucket_size: int
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: A dict of reaction id and the cluster that it is in, and the number of clusters
+    :rtype: (dict, int)
+    """
+
+    if rids is None:
+        rids = list(reactions.keys())
+    else:
+        rids = list(rids)
+
+    compound_index = PyFBA.metabolism.compound_index
+    cpds = [frozenset(compound_index(c) for c in reactions[r].all_compounds()) for r in rids]
+    if max_compound_reactions is not None:
+        count = {}
+        for cs in cpds:
+            for ci in cs:
+                count[ci] = count.get(ci, 0) + 1
+        common = {ci for ci in count if count[ci] > max_compound_reactions}
+        cpds = [cs - common for cs in cpds]
+
+    parent = list(range(len(rids)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    comparisons = 0
+    joined = 0
+    for members in _buckets(cpds, threshold, num_perm, seed):
+        if len(members) <= max_bucket_size:
+            pairs = ((members[j], members[k]) for j in range(len(members)) for k in range(j))
+        else:
+            # compare each reaction with the first one in a big bucket (e.g. all the reactions that are just water
+            # and a proton) so we don't compare every pair
+            pairs = ((i, members[0]) for i in members[1:])
+        for i, j in pairs:
+            ri, rj = find(i), find(j)
+            if ri == rj:
+                continue
+            comparisons += 1
+            if _jaccard_distance(cpds[i], cpds[j]) < threshold:
+                parent[ri] = rj
+                joined += 1
+
+    clusters = {}
+    numbers = {}
+    for i, r in enumerate(rids):
+        root = find(i)
+        if root not in numbers:
+            numbers[root] = len(numbers)
+        clusters[r] = numbers[root]
+
+    if verbose:
+        bands, rows = _bands(1 - threshold, num_perm)
+        sys.stderr.write("Clustered {} reactions into {} clusters using {} bands of {} hashes. ".format(
+            len(rids), len(numbers), bands, rows) + "We compared {} pairs and joined {}\n".format(comparisons, joined))
+
+    return clusters, len(numbers)
+
+
+def _buckets(cpds, threshold, num_perm, seed):
+    """
+    Put the sets of compounds into buckets with locality sensitive hashing. Sets with a Jaccard distance less than the
+    threshold are likely to share at least one bucket.
+
+    :param cpds: The compound integers in each reaction
+    :type cpds: list of frozenset
+    :param threshold: The Jaccard distance below which we want reactions to share a bucket
+    :type threshold: float
+    :param num_perm: The number of hash functions in the signature of each reaction
+    :type num_perm: int
+    :param seed: The seed for the hash functions
+    :type seed: int
+    :return: The positions in cpds of the sets in each bucket with more than one set
+    :rtype: generator of list of int
+    """
+    bands, rows = _bands(1 - threshold, num_perm)
+    rng = random.Random(seed)
+    coefficients = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(bands * rows)]
+    for b in range(bands):
+        band = coefficients[b * rows:(b + 1) * rows]
+        buckets = {}
+        for i, cs in enumerate(cpds):
+            if not cs:
+                continue
+            key = tuple(min([(a * x + c) % _PRIME for x in cs]) for a, c in band)
+            if key in buckets:
+                buckets[key].append(i)
+            else:
+                buckets[key] = [i]
+        for members in buckets.values():
+            if len(members) > 1:
+                yield members
+
+
+def _bands(similarity, num_perm, probability=0.95):
+    """
+    Choose the number of bands and the number of rows per band. We want two reactions with this similarity to share a
+    band with at least this probability, and as many rows per band as we can so that different reactions rarely do.
+
+    :param similarity: The Jaccard similarity
+    :type similarity: float
+    :param num_perm: The number of hash functions we can use
+    :type num_perm: int
+    :param probability: The chance that two reactions with this similarity share a band
+    :type probability: float
+    :return: The number of bands and the number of rows in each band
+    :rtype: (int, int)
+    """
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - similarity ** rows) ** bands >= probability:
+            return bands, rows
+    return num_perm, 1
+
+
+def _jaccard_distance(s1, s2):
+    """
+    The Jaccard distance between two sets. If either set is empty the distance is 1.
+
+    :type s1: frozenset
+    :type s2: frozenset
+    :rtype: float
+    """
+    if not s1 or not s2:
+        return 1
+    inter = len(s1 & s2)
+    return 1 - 1.0 * inter / (len(s1) + len(s2) - inter)
+
+
+def write_clusters(clusters, filename):
+    """
+    Write the clusters to a binary file. The file has the reaction ids (separated by newlines) and then the cluster
+    for each reaction as an array of integers.
+
+    :param clusters: A dict of reaction id and cluster
+    :type clusters: dict
+    :param filename: The file to write
+    :type filename: str
+    """
+    rids = list(clusters.keys())
+    names = "\n".join(rids).encode('utf-8')
+    numbers = array('i', [clusters[r] for r in rids])
+    with open(filename, 'wb') as out:
+        out.write(_MAGIC)
+        out.write(struct.pack('<QQ', len(rids), len(names)))
+        out.write(names)
+        if sys.byteorder != 'little':
+            numbers.byteswap()
+        numbers.tofile(out)
+
+
+def read_clusters(filename):
+    """
+    Read the clusters from a file written by write_clusters.
+
+    :param filename: The file to read
+    :type filename: str
+    :return: A dict of reaction id and cluster
+    :rtype: dict
+    """
+    with open(filename, 'rb') as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(filename + " is not a reaction cluster file")
+        count, length = struct.unpack('<QQ', f.read(16))
+        names = f.read(length).decode('utf-8')
+        numbers = array('i')
+        numbers.fromfile(f, count)
+        if sys.byteorder != 'little':
+            numbers.byteswap()
+    rids = names.split("\n") if count else []
+    return dict(zip(rids, numbers))
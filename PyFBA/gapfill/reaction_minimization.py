@@ -1,4 +1,8 @@
+import math
+import multiprocessing
+import queue
 import sys
+from collections import ChainMap
 from random import shuffle
 
 import PyFBA
@@ -39,7 +43,6 @@ def calculate_precision_recall(growth_media, no_growth_media, compounds, reactio
     results = {'tp': 0, 'tn': 0, 'fp': 0, 'fn': 0}
     for media in growth_media:
         status, value, growth = PyFBA.fba.run_fba(compounds, reactions, reactions2run, media, biomass_eqtn)
-        reactions = PyFBA.fba.remove_uptake_and_secretion_reactions(reactions)
         if growth:
             results['tp'] += 1
         else:
@@ -47,7 +50,6 @@ def calculate_precision_recall(growth_media, no_growth_media, compounds, reactio
 
     for media in no_growth_media:
         status, value, growth = PyFBA.fba.run_fba(compounds, reactions, reactions2run, media, biomass_eqtn)
-        reactions = PyFBA.fba.remove_uptake_and_secretion_reactions(reactions)
         if growth:
             results['fp'] += 1
         else:
@@ -64,17 +66,17 @@ def iterate_reactions_to_run(base_reactions, optional_reactions, compounds, reac
     If you provide an empty set for base_reactions, we test every member of optional_reactions to see if it is required
     for growth.
 
-    This will run as many FBA reactions as there are elements in optional_reactions and only test them one at a time.
-
-    WE
+    This tests the elements of optional_reactions one at a time. We don't need to run the FBA when the reaction we
+    remove had no flux in the last model that grew (see PyFBA.fba.GrowthTester), so this runs at most as many FBA as
+    there are elements in optional_reactions.
 
     :param compounds: The compounds dictionary
     :type compounds: dict
     :param base_reactions: a set of reactions that are required for the model but that do not result in growth
-    :type base_reactions: set
+    :type base_reactions: set or PyFBA.metabolism.ReactionSet
     :param optional_reactions: a set of reactions that when added to the base_reactions set result in
         growth but for which only a subset may or may not be required.
-    :type optional_reactions: set
+    :type optional_reactions: set or PyFBA.metabolism.ReactionSet
     :param reactions: the reactions data dictionary
     :type reactions: dict
     :param media: our media object
@@ -83,33 +85,138 @@ def iterate_reactions_to_run(base_reactions, optional_reactions, compounds, reac
     :type biomass_eqn: network.reaction.Reaction
     :param verbose: Print more information
     :type verbose: bool
-    :return: The list of reactions that need to be added to base_reactions to get growth
-    :rtype: list
+    :return: The set of reactions that need to be added to base_reactions to get growth
+    :rtype: PyFBA.metabolism.ReactionSet
     """
 
-    num_elements = len(optional_reactions)
-    required_optionals = set()
+    base_reactions = PyFBA.metabolism.ReactionSet(base_reactions)
+    optional_list = list(optional_reactions)
+    optional_reactions = PyFBA.metabolism.ReactionSet(optional_list)
+    num_elements = len(optional_list)
+    required_optionals = PyFBA.metabolism.ReactionSet()
+    tester = PyFBA.fba.GrowthTester(compounds, reactions, media, biomass_eqn)
     i = 1
 
-    for r in range(num_elements):
-        removed_reaction = optional_reactions.pop()
-        r2r = base_reactions.union(optional_reactions).union(required_optionals)
+    while optional_list:
+        removed_reaction = optional_list.pop()
+        optional_reactions = optional_reactions - (removed_reaction,)
+        r2r = base_reactions | optional_reactions | required_optionals
         if verbose:
             sys.stderr.write("Single reaction iteration {} of {}: Attempting without {}: {}\n".format(i, num_elements, removed_reaction, reactions[removed_reaction].equation))
-        status, value, growth = PyFBA.fba.run_fba(compounds, reactions, r2r, media, biomass_eqn)
+        growth = tester.grows(r2r)
         if not growth:
             if verbose:
                 sys.stderr.write("Result: REQUIRED\n")
-            required_optionals.add(removed_reaction)
+            required_optionals = required_optionals | (removed_reaction,)
         elif verbose:
             sys.stderr.write("Result: NOT REQUIRED\n")
         i += 1
 
-    return list(required_optionals)
+    sys.stderr.write("Testing {} reactions one at a time ran {} fba and ".format(num_elements, tester.solves) +
+                     "skipped {} for reactions with no flux\n".format(tester.saved))
+    return required_optionals
+
+
+def group_test_reactions(base_reactions, optional_reactions, compounds, reactions, media, biomass_eqn,
+                         expected_required=None, verbose=False):
+    """
+    Find the reactions in optional_reactions that are required for growth using adaptive group testing (Hwang's
+    generalized binary splitting).
+
+    Like iterate_reactions_to_run we remove reactions and keep them out if we still get growth, but rather than
+    removing them one at a time we remove them in groups sized by the number of required reactions we expect to find.
+    If the model still grows, the whole group is gone after one fba. If it doesn't, we binary split that group to find
+    one required reaction, and put the rest of the group back to be tested again. This needs about
+    d * log2(n / d) fba runs to find d required reactions in n optional reactions, rather than n.
+
+    Removing reactions can never make a model grow, so as with iterate_reactions_to_run, removing any one of the
+    reactions we return stops growth. The result does not depend on the order of a set of optional reactions: we test
+    them in sorted order (or the order of the list if you provide one).
+
+    :param base_reactions: a set of reactions that are required for the model but that do not result in growth
+    :type base_reactions: set or PyFBA.metabolism.ReactionSet
+    :param optional_reactions: the reactions that when added to the base_reactions set result in growth but for which
+        only a subset may be required.
+    :type optional_reactions: set or list or PyFBA.metabolism.ReactionSet
+    :param compounds: The compounds dictionary
+    :type compounds: dict
+    :param reactions: the reactions data dictionary
+    :type reactions: dict
+    :param media: our media object
+    :type media: set
+    :param biomass_eqn: our biomass equation
+    :type biomass_eqn: network.reaction.Reaction
+    :param expected_required: How many required reactions we expect to find. The default is the square root of the
+        number of optional reactions. This only changes the number of fba runs, not the answer.
+    :type expected_required: int
+    :param verbose: Print more information
+    :type verbose: bool
+    :return: The set of reactions that need to be added to base_reactions to get growth
+    :rtype: PyFBA.metabolism.ReactionSet
+    """
+
+    base_reactions = PyFBA.metabolism.ReactionSet(base_reactions)
+    if isinstance(optional_reactions, list):
+        undecided = list(optional_reactions)
+    else:
+        undecided = sorted(optional_reactions)
+    required = PyFBA.metabolism.ReactionSet()
+    if expected_required is None:
+        expected_required = int(math.sqrt(len(undecided)))
+    expected_required = max(1, expected_required)
+    tester = PyFBA.fba.GrowthTester(compounds, reactions, media, biomass_eqn)
+    tests = 0
+
+    def grows_without(removed, kept):
+        # does the model grow with everything we have not decided about except the removed reactions?
+        r2r = base_reactions.union(required, kept)
+        growth = tester.grows(r2r)
+        if verbose:
+            sys.stderr.write("Group test {}: Attempting without {} reactions. Growth: {}\n".format(tests + 1,
+                                                                                             len(removed), growth))
+        return growth
+
+    while undecided:
+        n = len(undecided)
+        d = expected_required
+        if n <= 2 * d - 2:
+            group_size = 1
+        else:
+            group_size = 2 ** int(math.log((n - d + 1) / d, 2))
+        group = undecided[:group_size]
+        rest = undecided[group_size:]
+
+        growth = grows_without(group, rest)
+        tests += 1
+        if growth:
+            # nothing in this group is required
+            undecided = rest
+            continue
+
+        # at least one reaction in the group is required. Binary split the group to find it
+        while len(group) > 1:
+            half = group[:len(group) // 2]
+            other = group[len(group) // 2:]
+            growth = grows_without(half, rest + other)
+            tests += 1
+            if growth:
+                group = other
+            else:
+                group = half
+                rest += other
+        if verbose:
+            sys.stderr.write("Result: {} is REQUIRED\n".format(group[0]))
+        required = required | group
+        expected_required = max(1, expected_required - 1)
+        undecided = rest
+
+    sys.stderr.write("Group testing found {} required reactions in {} tests. ".format(len(required), tests) +
+                     "We ran {} fba and skipped {} for reactions with no flux\n".format(tester.solves, tester.saved))
+    return required
 
 
 def minimize_additional_reactions(base_reactions, optional_reactions, compounds, reactions, media,
-                                  biomass_eqn, verbose=False):
+                                  biomass_eqn, verbose=False, method='bisection', use_flux=True, parsimonious=False):
     """
     Given two sets, one of base reactions (base_reactions), and one of optional
     reactions we will attempt to minimize the reactions in the optional
@@ -117,13 +224,22 @@ def minimize_additional_reactions(base_reactions, optional_reactions, compounds,
     the fba. We return a set of the optional reactions that are required
     for the fba to grow.
 
+    If use_flux is True we start from the optional reactions that carry flux
+    when the base and optional reactions grow. The other reactions are not
+    needed for that solution, so this usually removes most of the optional
+    reactions before we start bisecting. With parsimonious we use the
+    parsimonious FBA solution, which has fewer reactions with flux.
+
+    If method is 'group_testing' we use group_test_reactions instead of the
+    bisection. That is deterministic and every reaction it returns is required.
+
     :param compounds: The compounds dictionary
     :type compounds: dict
     :param base_reactions: a set of reactions that are required for the model but that do not result in growth
-    :type base_reactions: set
+    :type base_reactions: set or PyFBA.metabolism.ReactionSet
     :param optional_reactions: a set of reactions that when added to the base_reactions set result in
         growth but for which only a subset may or may not be required.
-    :type optional_reactions: set
+    :type optional_reactions: set or PyFBA.metabolism.ReactionSet
     :param reactions: the reactions data dictionary
     :type reactions: dict
     :param media: our media object
@@ -132,26 +248,48 @@ def minimize_additional_reactions(base_reactions, optional_reactions, compounds,
     :type biomass_eqn: network.reaction.Reaction
     :param verbose: Print more information
     :type verbose: bool
+    :param method: How to minimize the reactions: 'bisection' or 'group_testing'
+    :type method: str
+    :param use_flux: Only consider the optional reactions that carry flux
+    :type use_flux: bool
+    :param parsimonious: Use the parsimonious FBA fluxes when use_flux is True
+    :type parsimonious: bool
     :return: The set of reactions that need to be added to base_reactions to get growth
-    :rtype: set
+    :rtype: PyFBA.metabolism.ReactionSet
     """
 
-    base_reactions = set(base_reactions)
-    optional_reactions = set(optional_reactions)
+    if method not in ('bisection', 'group_testing'):
+        raise ValueError("Unknown minimization method {}".format(method))
+
+    base_reactions = PyFBA.metabolism.ReactionSet(base_reactions)
+    optional_reactions = PyFBA.metabolism.ReactionSet(optional_reactions)
     # test that (a) the base_reactions set does not grow and the base_reactions
     # + optional set does grow
     status, value, growth = PyFBA.fba.run_fba(compounds, reactions, base_reactions, media, biomass_eqn)
     if growth:
         sys.stderr.write("The set of 'base' reactions results in growth so we don't need to bisect the optional set\n")
-        return set()
+        return PyFBA.metabolism.ReactionSet()
 
     status, value, growth = PyFBA.fba.run_fba(compounds, reactions, base_reactions.union(optional_reactions), media,
-                                              biomass_eqn)
+                                              biomass_eqn, pfba=use_flux and parsimonious)
     if not growth:
         raise Exception("'base' union 'optional' reactions does not generate growth. We can not bisect the set\n")
 
+    if use_flux:
+        # the reactions with no flux in that solution are not needed for it, so we start with the ones that have flux
+        rxnfluxes = PyFBA.fba.reaction_fluxes()
+        flux_rxn = optional_reactions & [r for r in rxnfluxes if rxnfluxes[r] != 0.0]
+        status, value, growth = PyFBA.fba.run_fba(compounds, reactions, base_reactions.union(flux_rxn), media,
+                                                  biomass_eqn)
+        if growth:
+            if verbose:
+                sys.stderr.write("Limited the reactions to those with flux and reduced " +
+                                 " from {} to {}\n".format(len(optional_reactions), len(flux_rxn)))
+            optional_reactions = flux_rxn
+
     # first, lets see if we can limit the reactions based on compounds present and still get growth
-    limited_rxn = PyFBA.gapfill.limit_reactions_by_compound(reactions, base_reactions, optional_reactions)
+    limited_rxn = PyFBA.metabolism.ReactionSet(
+        PyFBA.gapfill.limit_reactions_by_compound(reactions, base_reactions, optional_reactions))
     status, value, growth = PyFBA.fba.run_fba(compounds, reactions, base_reactions.union(limited_rxn), media,
                                               biomass_eqn)
     if growth:
@@ -160,6 +298,10 @@ def minimize_additional_reactions(base_reactions, optional_reactions, compounds,
                              " from {} to {}\n".format(len(optional_reactions), len(limited_rxn)))
         optional_reactions = limited_rxn
 
+    if method == 'group_testing':
+        return group_test_reactions(base_reactions, optional_reactions, compounds, reactions, media, biomass_eqn,
+                                    verbose=verbose)
+
     test = True
     tries = 0
     maxtries = 5
@@ -174,7 +316,7 @@ def minimize_additional_reactions(base_reactions, optional_reactions, compounds,
         itera += 1
         left, right = PyFBA.gapfill.bisections.bisect(current_rx_list)
         # left, right = percent_split(current_rx_list, percent)
-        r2r = base_reactions.union(set(left))
+        r2r = base_reactions.union(left)
         status, value, lgrowth = PyFBA.fba.run_fba(compounds, reactions, r2r, media, biomass_eqn)
         # running the fba takes all the time, so we only run the right half if the left half doesn't grow
         if lgrowth:
@@ -187,7 +329,7 @@ def minimize_additional_reactions(base_reactions, optional_reactions, compounds,
                 sys.stderr.write("Iteration: {} Try: {} Length: {} and {}".format(itera, tries, len(left), len(right)) +
                                  " Growth: {} and NOT TESTED\n".format(lgrowth))
         else:
-            r2r = base_reactions.union(set(right))
+            r2r = base_reactions.union(right)
             status, value, rgrowth = PyFBA.fba.run_fba(compounds, reactions, r2r, media, biomass_eqn)
             if verbose:
                 sys.stderr.write("Iteration: {} Try: {} Length: {} and {}".format(itera, tries, len(left), len(right)) +
@@ -206,7 +348,8 @@ def minimize_additional_reactions(base_reactions, optional_reactions, compounds,
                 # Otherwise, we can we split the list unevenly and see if we get growth
                 uneven_test = True
                 if len(current_rx_list) < 20:
-                    left = iterate_reactions_to_run(base_reactions, current_rx_list, compounds, reactions, media, biomass_eqn, verbose)
+                    left = list(iterate_reactions_to_run(base_reactions, current_rx_list, compounds, reactions, media,
+                                                         biomass_eqn, verbose))
                     right = []
                     test = False
                 else:
@@ -217,9 +360,9 @@ def minimize_additional_reactions(base_reactions, optional_reactions, compounds,
                         #### reactions to the right side. Decreasing the number of reactions will never
                         #### result in growth if it didn't grow with the larger number of reactions.
                         #### Will leave it commented out for now.
-                        #r2r = base_reactions.union(set(left))
+                        #r2r = base_reactions.union(left)
                         #status, value, lgrowth = PyFBA.fba.run_fba(compounds, reactions, r2r, media, biomass_eqn)
-                        r2r = base_reactions.union(set(right))
+                        r2r = base_reactions.union(right)
                         status, value, rgrowth = PyFBA.fba.run_fba(compounds, reactions, r2r, media, biomass_eqn)
                         if verbose:
                             sys.stderr.write(
@@ -246,14 +389,206 @@ def minimize_additional_reactions(base_reactions, optional_reactions, compounds,
                 if tries > maxtries:
                     test = False
 
-    remaining = set(left + right)
+    remaining = PyFBA.metabolism.ReactionSet(left + right)
     if verbose:
         sys.stderr.write("There are {} reactions remaining: {}\n".format(len(remaining), remaining))
     return remaining
 
 
+class _PrecisionRecall:
+    """
+    The tp/tn/fp/fn counts for one set of reactions while we are still testing it on the media. Because we know how
+    many media are still to come, we know the range that the final counts (and accuracy) can be in.
+    """
+
+    def __init__(self, growth_media, no_growth_media):
+        self.results = {'tp': 0, 'tn': 0, 'fp': 0, 'fn': 0}
+        self.growth_pending = len(growth_media)
+        self.no_growth_pending = len(no_growth_media)
+
+    def add(self, growth_medium, growth):
+        """
+        Add the result of one fba
+
+        :param growth_medium: Whether this was one of the growth media (True) or one of the no growth media (False)
+        :type growth_medium: bool
+        :param growth: Whether the model grew
+        :type growth: bool
+        """
+        if growth_medium:
+            self.growth_pending -= 1
+            self.results['tp' if growth else 'fn'] += 1
+        else:
+            self.no_growth_pending -= 1
+            self.results['fp' if growth else 'tn'] += 1
+
+    def tp_range(self):
+        """
+        The smallest and largest number of true positives we can end up with
+        """
+        return self.results['tp'], self.results['tp'] + self.growth_pending
+
+    def accuracy_range(self):
+        """
+        The smallest and largest accuracy we can end up with
+        """
+        total = 1.0 * (sum(self.results.values()) + self.growth_pending + self.no_growth_pending)
+        correct = self.results['tp'] + self.results['tn']
+        return correct / total, (correct + self.growth_pending + self.no_growth_pending) / total
+
+
+def _above_minimum(counts, minimum_tp):
+    """
+    Will these counts have more than minimum_tp true positives?
+
+    :return: True or False, or None if we can't tell yet
+    """
+    lowest, highest = counts.tp_range()
+    if lowest > minimum_tp:
+        return True
+    if highest <= minimum_tp:
+        return False
+    return None
+
+
+def _choose_half(left, right, minimum_tp):
+    """
+    Choose between the two halves of a bisection. We want the half(s) with more than minimum_tp true positives, and if
+    both of them have that, the one with the better accuracy.
+
+    :return: 'left', 'right', 'neither', or None if we can't tell yet
+    """
+    left_above = _above_minimum(left, minimum_tp)
+    right_above = _above_minimum(right, minimum_tp)
+    if left_above is False and right_above is False:
+        return 'neither'
+    if left_above and right_above is False:
+        return 'left'
+    if left_above is False and right_above:
+        return 'right'
+    if left_above and right_above:
+        l_lowest, l_highest = left.accuracy_range()
+        r_lowest, r_highest = right.accuracy_range()
+        if l_lowest > r_highest:
+            return 'left'
+        if l_highest <= r_lowest:
+            return 'right'
+    return None
+
+
+def _choose_uneven(left, right, minimum_tp):
+    """
+    Choose between the two parts of an uneven split. We take the left if it has more than minimum_tp true positives,
+    and otherwise the right if it has any.
+
+    :return: 'left', 'right', 'neither', or None if we can't tell yet
+    """
+    left_above = _above_minimum(left, minimum_tp)
+    if left_above:
+        return 'left'
+    if left_above is None:
+        return None
+    lowest, highest = right.tp_range()
+    if lowest > 0:
+        return 'right'
+    if highest == 0:
+        return 'neither'
+    return None
+
+
+# The data each worker process needs to run the fba. This is set once when the worker starts so that we only send
+# the rows of the reactions to run (in the shared biochemistry) with each task.
+_worker_data = {}
+
+
+def _init_worker(biochemistry, growth_media, no_growth_media, biomass_eqn):
+    """
+    Attach to the shared biochemistry and store the data that a worker process needs to run the fba.
+    """
+    store = PyFBA.parse.attach_biochemistry(biochemistry)
+    _worker_data['store'] = store
+    # run_fba adds the media and biomass compounds to the compounds, so they go in a dict of their own
+    _worker_data['compounds'] = ChainMap({}, store.compounds)
+    _worker_data['reactions'] = store.reactions
+    _worker_data['media'] = {True: growth_media, False: no_growth_media}
+    _worker_data['biomass_eqn'] = biomass_eqn
+
+
+def _worker_growth(which, reaction_numbers, growth_medium, media_index):
+    """
+    Run one fba in a worker process.
+
+    :return: which set of reactions this was, whether it was a growth medium, and whether the model grew
+    :rtype: (int, bool, bool)
+    """
+    media = _worker_data['media'][growth_medium][media_index]
+    reactions2run = _worker_data['store'].reaction_ids(reaction_numbers)
+    status, value, growth = PyFBA.fba.run_fba(_worker_data['compounds'], _worker_data['reactions'], reactions2run,
+                                              media, _worker_data['biomass_eqn'])
+    return which, growth_medium, growth
+
+
+def _test_reaction_sets(reaction_sets, compounds, reactions, growth_media, no_growth_media, biomass_eqn,
+                        decide=None, pool=None, processes=1, shared=None):
+    """
+    Test each set of reactions on all the growth and no growth media.
+
+    If decide is provided, it is called with the counts for each reaction set after every fba, and we stop as soon as
+    it returns something other than None. Otherwise we test everything.
+
+    If pool is provided, the fba are run in the pool, with at most processes of them running at once, and we count
+    the results as they come back. The workers use the shared biochemistry, so we just send them the rows of the
+    reactions in it.
+
+    :return: the decision (or None) and a list of the _PrecisionRecall counts for each reaction set
+    :rtype: (str, list)
+    """
+
+    counts = [_PrecisionRecall(growth_media, no_growth_media) for r in reaction_sets]
+    if pool is not None:
+        reaction_sets = [shared.store.reaction_numbers(r2r) for r2r in reaction_sets]
+    # interleave the reaction sets so that we learn about all of them as quickly as possible
+    tasks = []
+    for growth_medium, media_list in ((True, growth_media), (False, no_growth_media)):
+        for i in range(len(media_list)):
+            for which, r2r in enumerate(reaction_sets):
+                tasks.append((which, r2r, growth_medium, i))
+    tasks.reverse()
+
+    if pool is None:
+        media = {True: growth_media, False: no_growth_media}
+        while tasks:
+            which, r2r, growth_medium, i = tasks.pop()
+            status, value, growth = PyFBA.fba.run_fba(compounds, reactions, r2r, media[growth_medium][i], biomass_eqn)
+            counts[which].add(growth_medium, growth)
+            if decide:
+                decision = decide(*counts)
+                if decision:
+                    return decision, counts
+        return None, counts
+
+    results = queue.Queue()
+    running = 0
+    while tasks or running:
+        while tasks and running < processes:
+            pool.apply_async(_worker_growth, tasks.pop(), callback=results.put, error_callback=results.put)
+            running += 1
+        result = results.get()
+        running -= 1
+        if isinstance(result, BaseException):
+            raise result
+        which, growth_medium, growth = result
+        counts[which].add(growth_medium, growth)
+        if decide:
+            decision = decide(*counts)
+            if decision:
+                # anything still running finishes in the background and is ignored
+                return decision, counts
+    return None, counts
+
+
 def minimize_by_accuracy(base_reactions, optional_reactions, compounds, reactions, growth_media, no_growth_media,
-                                  biomass_eqn, minimum_tp=0, minimum_accuracy=0.50, verbose=False):
+                         biomass_eqn, minimum_tp=0, minimum_accuracy=0.50, verbose=False, processes=1):
     """
     Given two sets, one of base reactions (base_reactions), and one of optional
     reactions we will attempt to minimize the reactions in the optional
@@ -263,6 +598,11 @@ def minimize_by_accuracy(base_reactions, optional_reactions, compounds, reaction
      We return a set of the optional reactions that are required
     for the fba to grow.
 
+    Each iteration tests both halves on all the media. We stop testing as soon as the remaining media can not change
+    which half we choose, and if processes is more than 1 we run the fba for both halves and all the media in a pool
+    of worker processes at the same time. The workers share one copy of the reactions (see
+    PyFBA.parse.SharedBiochemistry), so each task is just the rows of the reactions to run and the number of a media.
+
     :param minimum_tp: Minimum true positives to consider success. If value < 1 we use that as
             the fraction of growth_media conditions that should be used. (e.g. 0.8 -> 80% of len(growth_media))
     :type minimum_tp: float
@@ -275,64 +615,100 @@ def minimize_by_accuracy(base_reactions, optional_reactions, compounds, reaction
     :param compounds: The compounds dictionary
     :type compounds: dict
     :param base_reactions: a set of reactions that are required for the model but that do not result in growth
-    :type base_reactions: set
+    :type base_reactions: set or PyFBA.metabolism.ReactionSet
     :param optional_reactions: a set of reactions that when added to the base_reactions set result in
         growth but for which only a subset may or may not be required.
-    :type optional_reactions: set
+    :type optional_reactions: set or PyFBA.metabolism.ReactionSet
     :param reactions: the reactions data dictionary
     :type reactions: dict
     :param biomass_eqn: our biomass equation
     :type biomass_eqn: network.reaction.Reaction
     :param verbose: Print more information
     :type verbose: bool
+    :param processes: The number of worker processes to run the fba in. 1 runs everything in this process
+    :type processes: int
     :return: The set of reactions that need to be added to base_reactions to get growth
-    :rtype: set
+    :rtype: PyFBA.metabolism.ReactionSet
+    """
+
+    pool = None
+    shared = None
+    if processes > 1:
+        # the workers only ever run these reactions, so that is all we share with them
+        shared = PyFBA.parse.SharedBiochemistry(compounds, reactions,
+                                                reaction_ids=set(base_reactions) | set(optional_reactions))
+        pool = multiprocessing.Pool(processes, _init_worker,
+                                    (shared.handle, growth_media, no_growth_media, biomass_eqn))
+    try:
+        return _minimize_by_accuracy(base_reactions, optional_reactions, compounds, reactions, growth_media,
+                                     no_growth_media, biomass_eqn, minimum_tp, minimum_accuracy, verbose, pool,
+                                     processes, shared)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        if shared is not None:
+            shared.close()
+
+
+def _minimize_by_accuracy(base_reactions, optional_reactions, compounds, reactions, growth_media, no_growth_media,
+                          biomass_eqn, minimum_tp, minimum_accuracy, verbose, pool, processes, shared):
+    """
+    The bisection for minimize_by_accuracy. See that function for the parameters.
     """
 
+    def test_sets(reaction_sets, decide=None):
+        return _test_reaction_sets(reaction_sets, compounds, reactions, growth_media, no_growth_media, biomass_eqn,
+                                   decide, pool, processes, shared)
+
     if minimum_tp < 1:
         minimum_tp *= len(growth_media)
 
-    base_reactions = set(base_reactions)
-    optional_reactions = set(optional_reactions)
+    base_reactions = PyFBA.metabolism.ReactionSet(base_reactions)
+    optional_reactions = PyFBA.metabolism.ReactionSet(optional_reactions)
     # test that (a) the base_reactions set does not grow and the base_reactions
     # + optional set does grow
-    base_precision = calculate_precision_recall(growth_media, no_growth_media, compounds, reactions, base_reactions,
-                                                biomass_eqn)
+    decision, counts = test_sets([base_reactions])
+    base_precision = counts[0].results
+
     if base_precision['tp'] > minimum_tp:
         sys.stderr.write("The set of 'base' reactions results in {} ".format(base_precision['tp']))
         sys.stderr.write("positive reactions. Bigger than {} so no need to bisect\n".format(minimum_tp))
-        return set()
+        return PyFBA.metabolism.ReactionSet()
 
     base_accuracy = accuracy(base_precision)
     if base_accuracy > minimum_accuracy:
         sys.stderr.write("The set of 'base' reactions has an accuracy of {} ".format(base_accuracy))
         sys.stderr.write("which is bigger than the threshold of {}. No need to bisect\n".format(minimum_accuracy))
-        return set()
-
-    beginning_precision = calculate_precision_recall(growth_media, no_growth_media, compounds, reactions,
-                                                     base_reactions.union(optional_reactions), biomass_eqn)
+        return PyFBA.metabolism.ReactionSet()
 
+    # we test all the reactions together with the reactions limited by compound, since we need both of them
+    limited_rxn = PyFBA.metabolism.ReactionSet(
+        PyFBA.gapfill.limit_reactions_by_compound(reactions, base_reactions, optional_reactions))
+    decision, counts = test_sets([base_reactions.union(optional_reactions), base_reactions.union(limited_rxn)])
+    beginning_precision, new_precision = [c.results for c in counts]
     beginning_accuracy = accuracy(beginning_precision)
 
     if beginning_precision['tp'] < minimum_tp:
         sys.stderr.write("If we combine all reactions, we have get {} true positives\n".format(beginning_precision['tp']))
         sys.stderr.write("We can not get more than this, so we can't exceed {}\n".format(minimum_tp))
         sys.stderr.write("No point in continuing\n")
-        return set()
+        return PyFBA.metabolism.ReactionSet()
 
     sys.stderr.write("The beginning accuracy is {}. We aim to improve this\n".format(beginning_accuracy))
 
     # first, lets see if we can limit the reactions based on compounds present and get better accuracy
-    limited_rxn = PyFBA.gapfill.limit_reactions_by_compound(reactions, base_reactions, optional_reactions)
-    new_precision = calculate_precision_recall(growth_media, no_growth_media, compounds, reactions,
-                                               base_reactions.union(limited_rxn), biomass_eqn)
-    new_accuracy = accuracy(new_precision)
-
     if new_precision['tp'] > minimum_tp:
         if verbose:
             sys.stderr.write("Limited reactions by compound from {} to {}\n".format(len(optional_reactions), len(limited_rxn)))
         optional_reactions = limited_rxn
 
+    def choose_half(left_counts, right_counts):
+        return _choose_half(left_counts, right_counts, minimum_tp)
+
+    def choose_uneven(left_counts, right_counts):
+        return _choose_uneven(left_counts, right_counts, minimum_tp)
+
     test = True
     tries = 0
     maxtries = 5
@@ -350,30 +726,17 @@ def minimize_by_accuracy(base_reactions, optional_reactions, compounds, reaction
         if verbose:
             sys.stderr.write("Lengths: left {} right {}\n".format(len(left), len(right)))
         # left, right = percent_split(current_rx_list, percent)
-        r2r = base_reactions.union(set(left))
-        l_precision = calculate_precision_recall(growth_media, no_growth_media, compounds, reactions, r2r, biomass_eqn)
-        l_accuracy = accuracy(l_precision)
+        decision, (l_counts, r_counts) = test_sets([base_reactions.union(left), base_reactions.union(right)],
+                                                   choose_half)
+        l_precision = l_counts.results
+        r_precision = r_counts.results
 
-        r2r = base_reactions.union(set(right))
-        r_precision = calculate_precision_recall(growth_media, no_growth_media, compounds, reactions, r2r, biomass_eqn)
-        r_accuracy = accuracy(r_precision)
-
-        if l_precision['tp'] > minimum_tp and r_precision['tp'] > minimum_tp:
-            if verbose:
-                sys.stderr.write("Both left {} and right {} are above {}\n".format(l_precision['tp'],
-                                                                                   r_precision['tp'], minimum_tp))
-            # now we want to use the one that increases the accuracy the most
-            if l_accuracy > r_accuracy:
-                current_rx_list = left
-            else:
-                current_rx_list = right
-            tries = 0
-        elif l_precision['tp'] > minimum_tp:
+        if decision == 'left':
             if verbose:
                 sys.stderr.write("Left {} is above {}\n".format(l_precision['tp'], minimum_tp))
             current_rx_list = left
             tries = 0
-        elif r_precision['tp'] > minimum_tp:
+        elif decision == 'right':
             if verbose:
                 sys.stderr.write("Right {} is above {}\n".format(r_precision['tp'], minimum_tp))
             current_rx_list = right
@@ -387,24 +750,17 @@ def minimize_by_accuracy(base_reactions, optional_reactions, compounds, reaction
             percent = 40
             left, right = PyFBA.gapfill.bisections.percent_split(current_rx_list, percent)
             while uneven_test and len(left) > 0 and len(right) > 0:
-                r2r = base_reactions.union(set(left))
-                l_precision = calculate_precision_recall(growth_media, no_growth_media, compounds, reactions,
-                                                         r2r, biomass_eqn)
-                l_accuracy = accuracy(l_precision)
-
-                r2r = base_reactions.union(set(right))
-                r_precision = calculate_precision_recall(growth_media, no_growth_media, compounds, reactions,
-                                                         r2r, biomass_eqn)
-                r_accuracy = accuracy(r_precision)
+                decision, (l_counts, r_counts) = test_sets([base_reactions.union(left),
+                                                            base_reactions.union(right)], choose_uneven)
                 if verbose:
                     sys.stderr.write(
                         "Iteration: {} Try: {} Length: {} and {}".format(itera, tries, len(left), len(right)) +
-                        " Growth: {} and {}\n".format(l_precision['tp'], r_precision['tp']))
-                if l_precision['tp'] > minimum_tp:
+                        " Growth: {} and {}\n".format(l_counts.results['tp'], r_counts.results['tp']))
+                if decision == 'left':
                     tries = 0
                     current_rx_list = left
                     uneven_test = False
-                elif r_precision['tp']:
+                elif decision == 'right':
                     tries = 0
                     current_rx_list = right
                     uneven_test = False
@@ -424,7 +780,7 @@ def minimize_by_accuracy(base_reactions, optional_reactions, compounds, reaction
             test = False
             left = current_rx_list
             right = []
-    remaining = set(left + right)
+    remaining = PyFBA.metabolism.ReactionSet(left + right)
     if verbose:
         sys.stderr.write("There are {} reactions remaining: {}\n".format(len(remaining), remaining))
     return remaining
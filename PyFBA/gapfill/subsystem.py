@@ -1,6 +1,5 @@
 import os
 import sys
-import io
 
 import PyFBA
 
@@ -37,28 +36,10 @@ def suggest_reactions_from_subsystems(reactions, reactions2run, ssfile=SS_FILE_P
                          " Please provide a path to that file\n")
         return set()
 
-    # read the ss file
-    subsys_to_roles = {}
-    roles_to_subsys = {}
-    with io.open(ssfile, 'r', encoding="utf-8", errors='replace') as sin:
-        for l in sin:
-            # If using Python2, must convert unicode object to str object
-            if sys.version_info.major == 2:
-                l = l.encode('utf-8', 'replace')
-            if l.startswith('#'):
-                continue
-            p = l.strip().split("\t")
-            if len(p) < 2:
-                if verbose:
-                    sys.stderr.write("Too few columns in subsystem file at line: {}\n".format(l.strip()))
-                continue
-            if p[1] not in subsys_to_roles:
-                subsys_to_roles[p[1]] = set()
-            for role in PyFBA.parse.roles_of_function(p[0]):
-                if role not in roles_to_subsys:
-                    roles_to_subsys[role] = set()
-                subsys_to_roles[p[1]].add(role)
-                roles_to_subsys[role].add(p[1])
+    # read the ss file (we only do this once)
+    ssindex = PyFBA.parse.subsystem_index(ssfile, functions=True)
+    subsys_to_roles = ssindex.subsystems
+    roles_to_subsys = ssindex.role_subsystems
 
     # now convert our reaction ids in reactions2run into roles
     # we have a hash with keys = reactions and values = set of roles
@@ -0,0 +1,164 @@
+import sys
+
+import PyFBA
+
+
+def suggest_from_whole_database(compounds, reactions, reactions2run, media, biomass_eqn, candidates=None,
+                                reaction_costs=None, minimum_growth=10.0, presolve=True, verbose=False):
+    """
+    Suggest reactions to add to a model by considering every reaction in the database at once.
+
+    Rather than adding groups of reactions and testing for growth, we make one lp with all of the reactions in
+    reactions2run and all of the candidate reactions (by default, every reaction in the database). We force the
+    biomass flux to be at least minimum_growth, and minimize the total cost of the flux through the candidate
+    reactions, where the cost of a reaction is its weight times the absolute value of its flux. The reactions
+    already in the model are free. The candidate reactions that carry flux are the suggestions: together with
+    reactions2run they grow, and you can then minimize them with minimize_additional_reactions.
+
+    The stoichiometric matrix is loaded as a sparse matrix, and we use the GLPK presolver, so this works for the whole
+    database on a normal computer.
+
+    :param compounds: The compounds dictionary
+    :type compounds: dict
+    :param reactions: The reactions dictionary
+    :type reactions: dict
+    :param reactions2run: The reactions in the model
+    :type reactions2run: set
+    :param media: The media compounds
+    :type media: set
+    :param biomass_eqn: The biomass equation
+    :type biomass_eqn: PyFBA.metabolism.Reaction
+    :param candidates: The reactions we may add. The default is every reaction in reactions
+    :type candidates: set
+    :param reaction_costs: The cost of adding each reaction, e.g. 1 - the probability of the reaction. Any reactions
+        that are not in this dict cost 1
+    :type reaction_costs: dict of str and float
+    :param minimum_growth: The biomass flux that we must have. This should be more than the 1 that run_fba needs to
+        call it growth
+    :type minimum_growth: float
+    :param presolve: Use the GLPK presolver
+    :type presolve: bool
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: A set of proposed reactions that should be added to your model to see if it grows
+    :rtype: set
+    """
+
+    if candidates is None:
+        candidates = reactions
+    if reaction_costs is None:
+        reaction_costs = {}
+
+    reactions2run = PyFBA.metabolism.ReactionSet(reactions2run)
+    candidates = PyFBA.metabolism.ReactionSet(r for r in candidates if r in reactions) - reactions2run
+    rc = _load_growing_lp(compounds, reactions, reactions2run, candidates, media, biomass_eqn, minimum_growth, verbose)
+
+    weights = []
+    for r in rc:
+        if r in candidates:
+            weights.append(reaction_costs.get(r, 1.0))
+        else:
+            weights.append(0.0)
+
+    status, cost = PyFBA.lp.minimize_absolute(weights, presolve)
+    if status != 'opt':
+        sys.stderr.write("We could not get growth with all the reactions in the database ({})\n".format(status))
+        return set()
+
+    rxnfluxes = PyFBA.lp.col_primal_hash()
+    suggested = {r for r in candidates if rxnfluxes.get(r, 0.0) != 0.0}
+
+    if verbose:
+        sys.stderr.write("Whole database gapfilling suggested {} reactions with a cost of {}\n".format(len(suggested),
+                                                                                                     cost))
+    return suggested
+
+
+def suggest_by_likelihood(compounds, reactions, reactions2run, media, biomass_eqn, reaction_probs, candidates=None,
+                          minimum_growth=10.0, presolve=False, verbose=False):
+    """
+    Suggest the most likely reactions to add to a model, as one mixed integer lp.
+
+    Likelihood based gapfilling with run_fba(likelihood_gapfill=True) minimizes the flux through each reaction times
+    1 - its probability, so a reaction with a lot of flux costs more than one with a little, and we have to minimize
+    the reactions that it suggests afterwards. Here every candidate reaction has a binary indicator that says whether
+    it is used, and we minimize the sum of 1 - probability over the reactions that are used while the biomass flux is
+    at least minimum_growth. That is the set of reactions with the best likelihood that grows, and you do not need to
+    minimize it afterwards. Reversible candidates are split into a forward and reverse column in the lp, so we don't
+    need to make new Reaction objects for them.
+
+    This is an integer program, so it is much slower than suggest_from_whole_database for the same candidates. Limit
+    the candidates to those with some probability (e.g. the keys of reaction_probs) rather than the whole database.
+
+    :param compounds: The compounds dictionary
+    :type compounds: dict
+    :param reactions: The reactions dictionary
+    :type reactions: dict
+    :param reactions2run: The reactions in the model
+    :type reactions2run: set
+    :param media: The media compounds
+    :type media: set
+    :param biomass_eqn: The biomass equation
+    :type biomass_eqn: PyFBA.metabolism.Reaction
+    :param reaction_probs: The probability of each reaction. Candidates that are not in this dict have probability 0
+    :type reaction_probs: dict of str and float
+    :param candidates: The reactions we may add. The default is all the reactions in reaction_probs
+    :type candidates: set
+    :param minimum_growth: The biomass flux that we must have
+    :type minimum_growth: float
+    :param presolve: Use the GLPK presolver
+    :type presolve: bool
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: A set of reactions that should be added to your model to make it grow
+    :rtype: set
+    """
+
+    if candidates is None:
+        candidates = reaction_probs
+
+    reactions2run = PyFBA.metabolism.ReactionSet(reactions2run)
+    candidates = PyFBA.metabolism.ReactionSet(r for r in candidates if r in reactions) - reactions2run
+    rc = _load_growing_lp(compounds, reactions, reactions2run, candidates, media, biomass_eqn, minimum_growth, verbose)
+
+    weights = []
+    for r in rc:
+        if r in candidates:
+            weights.append(1.0 - reaction_probs.get(r, 0.0))
+        else:
+            weights.append(None)
+
+    status, cost = PyFBA.lp.minimize_indicators(weights, presolve)
+    if status != 'opt':
+        sys.stderr.write("We could not get growth with all the candidate reactions ({})\n".format(status))
+        return set()
+
+    rxnfluxes = PyFBA.lp.col_primal_hash()
+    suggested = {r for r in candidates if rxnfluxes.get(r, 0.0) != 0.0}
+
+    if verbose:
+        sys.stderr.write("Likelihood gapfilling suggested {} reactions with a cost of {}\n".format(len(suggested),
+                                                                                                  cost))
+    return suggested
+
+
+def _load_growing_lp(compounds, reactions, reactions2run, candidates, media, biomass_eqn, minimum_growth, verbose):
+    """
+    Load an lp with the reactions and the candidates where the biomass flux must be at least minimum_growth.
+
+    :return: The reactions (columns) of the lp
+    :rtype: list
+    """
+
+    if verbose:
+        sys.stderr.write("Building an lp with {} reactions and {} candidates\n".format(len(reactions2run),
+                                                                                   len(candidates)))
+
+    cp, rc, reactions = PyFBA.fba.create_stoichiometric_matrix(reactions2run.union(candidates), reactions, compounds,
+                                                               media, biomass_eqn, verbose=verbose)
+    rbvals = PyFBA.fba.reaction_bounds(reactions, rc, media)
+    PyFBA.fba.compound_bounds(cp)
+
+    # we must grow
+    PyFBA.lp.change_col_bounds({len(rc) - 1: (minimum_growth, rbvals['BIOMASS_EQN'][1])})
+    return rc
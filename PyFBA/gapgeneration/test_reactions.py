@@ -8,10 +8,14 @@ import sys
 import PyFBA
 
 
-def test_growth(reactions_to_delete, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose):
+def test_growth(reactions_to_delete, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose,
+                tester=None):
     """
     Test growth of reactions_to_run after we have deleted reactions_to_delete. Returns True on growth, False on no growth
 
+    If you provide a PyFBA.fba.GrowthTester we use that, and we don't need to run the fba if the reactions we delete had
+    no flux the last time the model grew.
+
     :param reactions_to_delete: reactions to delete from reactions to run
     :type reactions_to_delete: set
     :param reactions_to_run: Reactions to run for the model
@@ -26,14 +30,18 @@ def test_growth(reactions_to_delete, reactions_to_run, compounds, reactions, med
     :type biomass_eqn: PyFBA.metabolism.reaction.Reaction
     :param verbose: Print more output
     :type verbose: bool
+    :param tester: An optional growth tester for this media
+    :type tester: PyFBA.fba.GrowthTester
     :return: Whether the remaining reactions result in growth
     :rtype: bool
     """
 
     new_r2r = set([x for x in reactions_to_run if x not in reactions_to_delete])
-    reactions = PyFBA.fba.remove_uptake_and_secretion_reactions(reactions)
 
-    status, value, growth = PyFBA.fba.run_fba(compounds, reactions, new_r2r, media, biomass_eqn)
+    if tester is not None:
+        growth = tester.grows(new_r2r)
+    else:
+        status, value, growth = PyFBA.fba.run_fba(compounds, reactions, new_r2r, media, biomass_eqn)
 
     if verbose:
         sys.stderr.write("Deleted {} rxns. Use {}. Growth: {}\n".format(len(reactions_to_delete), len(new_r2r), growth))
@@ -41,7 +49,8 @@ def test_growth(reactions_to_delete, reactions_to_run, compounds, reactions, med
     return growth
 
 
-def not_essential_reactions(reactions_to_delete, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose):
+def not_essential_reactions(reactions_to_delete, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose,
+                            tester=None):
     """
     Iterate through the reactions and return the minimal set that are/are  not essential
 
@@ -65,6 +74,8 @@ def not_essential_reactions(reactions_to_delete, reactions_to_run, compounds, re
     :type biomass_eqn: PyFBA.metabolism.reaction.Reaction
     :param verbose: Print more output
     :type verbose: bool
+    :param tester: An optional growth tester for this media
+    :type tester: PyFBA.fba.GrowthTester
     :return: Whether the remaining reactions result in growth
     :rtype: bool
     """
@@ -72,7 +83,8 @@ def not_essential_reactions(reactions_to_delete, reactions_to_run, compounds, re
     # if we have a one element list, we need to test it, and either return it if there is growth or return an empty
     # set if there is not growth
     if len(reactions_to_delete) == 1:
-        if test_growth(reactions_to_delete, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose):
+        if test_growth(reactions_to_delete, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose,
+                       tester):
             return set(reactions_to_delete)
         else:
             return set()
@@ -80,23 +92,25 @@ def not_essential_reactions(reactions_to_delete, reactions_to_run, compounds, re
     left, right = PyFBA.gapfill.bisect(list(reactions_to_delete))
     # test left to see if every element is redundant
     redundant_elements = set()
-    if test_growth(left, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose):
+    if test_growth(left, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose, tester):
         # we get growth
         redundant_elements.update(left)
     else:
         # test the left half again
         redundant_elements.update(
-            not_essential_reactions(left, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose)
+            not_essential_reactions(left, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose,
+                                    tester)
         )
 
     # now test the right half
-    if test_growth(right, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose):
+    if test_growth(right, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose, tester):
         # we get growth
         redundant_elements.update(right)
     else:
         # test the right half again
         redundant_elements.update(
-            not_essential_reactions(right, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose)
+            not_essential_reactions(right, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose,
+                                    tester)
         )
     return redundant_elements
 
@@ -124,7 +138,10 @@ def test_all_reactions(reactions_to_run, compounds, reactions, media, biomass_eq
     todelete = copy.copy(reactions_to_run)
     # prevent inadvertent edits to reactions_to_run
     reactions_to_run = frozenset(reactions_to_run)
-    redundant = not_essential_reactions(todelete, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose)
+    tester = PyFBA.fba.GrowthTester(compounds, reactions, media, biomass_eqn)
+    redundant = not_essential_reactions(todelete, reactions_to_run, compounds, reactions, media, biomass_eqn, verbose,
+                                        tester)
+    sys.stderr.write("We ran {} fba and skipped {} for reactions with no flux\n".format(tester.solves, tester.saved))
 
     for r in reactions_to_run:
         if r in redundant:
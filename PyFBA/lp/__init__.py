@@ -1,5 +1,8 @@
-from .glpk_solver import load, row_bounds, col_bounds, objective_coefficients, solve
+from .glpk_solver import load, load_sparse, row_bounds, col_bounds, change_col_bounds, objective_coefficients, solve
+from .glpk_solver import parsimonious, minimize_absolute, minimize_indicators, solver_version
 from .glpk_solver import col_primal_hash, col_primals, row_primal_hash, row_primals
+from .glpk_solver import row_dual_hash, row_duals, col_dual_hash, col_duals
 
-__all__ = ['load', 'row_bounds', 'col_bounds', 'objective_coefficients', 'solve', 'col_primal_hash', 'col_primals',
-            'row_primal_hash', 'row_primals']
+__all__ = ['load', 'load_sparse', 'row_bounds', 'col_bounds', 'change_col_bounds', 'objective_coefficients', 'solve',
+           'parsimonious', 'minimize_absolute', 'minimize_indicators', 'solver_version', 'col_primal_hash',
+           'col_primals', 'row_primal_hash', 'row_primals', 'row_dual_hash', 'row_duals', 'col_dual_hash', 'col_duals']
@@ -1,5 +1,4 @@
 import sys
-import glpk
 
 """
 
@@ -17,7 +16,47 @@ That means this code is limited to python2.7.
 
 """
 
-solver = glpk.LPX()
+# the GLPK solver. We only make it (and import glpk) when we first need it, so importing PyFBA is quick and works
+# without glpk
+solver = None
+
+# parsimonious() adds a row for the objective and a column for the reverse direction of each reversible column. We
+# remember how many rows and columns were loaded, and the reverse column for each column, so that we can still
+# report the primals of what was loaded.
+_loaded = {'rows': 0, 'cols': 0}
+_reverse_columns = {}
+
+# when we keep the objective at the value we found, we allow it to be this much (relative to 1 + the value) worse.
+# The value is only as exact as the solver, and without this the lp can be reported infeasible when we solve again
+OBJECTIVE_TOLERANCE = 1e-6
+
+
+def _get_solver():
+    """
+    Get the solver, making it the first time.
+
+    :return: The GLPK solver
+    :rtype: glpk.LPX
+    """
+    global solver
+    if solver is None:
+        import glpk
+        solver = glpk.LPX()
+    return solver
+
+
+def solver_version():
+    """
+    The name and version of the solver, e.g. to tell results from different solvers apart.
+
+    :return: The solver and its version
+    :rtype: str
+    """
+    import glpk
+    try:
+        return "glpk " + ".".join(str(v) for v in glpk.env.version)
+    except AttributeError:
+        return "glpk"
 
 
 def load(matrix, rowheaders=None, colheaders=None, verbose=0, likelihood_gapfill=False):
@@ -39,35 +78,87 @@ def load(matrix, rowheaders=None, colheaders=None, verbose=0, likelihood_gapfill
     :rtype: void
 
     """
-    global solver
+    solver = _get_solver()
+
+    nrows = len(matrix)
+    ncols = len(matrix[0])
+    _initialize(nrows, ncols, verbose, likelihood_gapfill)
+
+    # we need to flatten the 2D array before we add it to the lp object
+    temp = []
+    for i in range(len(matrix)):
+        for j in range(len(matrix[0])):
+            temp.append(matrix[i][j])
+
+    if verbose > 4:
+        sys.stderr.write("Matrix: " + str(temp) + "\n")
+    solver.matrix = temp
+
+    _name(rowheaders, colheaders, nrows, ncols, verbose)
+
+
+def load_sparse(entries, rowheaders, colheaders, verbose=0, likelihood_gapfill=False):
+    """
+    Load a sparse matrix into the linear programming solver. Most of a stoichiometric matrix is zeros, so for large
+    models this uses a lot less memory than load(): we never make the full matrix.
+
+    :param entries: the non-zero entries of the matrix as (row, column, value) tuples
+    :type entries: list of tuple
+    :param rowheaders: the row identifiers. There is one row for each header
+    :type rowheaders: list
+    :param colheaders: the column identifiers. There is one column for each header
+    :type colheaders: list
+    :param verbose: verbose turns on some debugging output. The higher the number the more output is generated
+    :type verbose: int
+    :param likelihood_gapfill: Run in likelihood-based gapfill mode
+    :type likelihood_gapfill: bool
+    :return: void
+    :rtype: void
+    """
+    solver = _get_solver()
+
+    nrows = len(rowheaders)
+    ncols = len(colheaders)
+    _initialize(nrows, ncols, verbose, likelihood_gapfill)
+
+    if verbose > 0:
+        sys.stderr.write("The matrix has " + str(len(entries)) + " non-zero entries\n")
+    if verbose > 4:
+        sys.stderr.write("Matrix: " + str(entries) + "\n")
+    solver.matrix = entries
+
+    _name(rowheaders, colheaders, nrows, ncols, verbose)
+
+
+def _initialize(nrows, ncols, verbose, likelihood_gapfill):
+    """
+    Clear the solver and make space for the rows and columns
+    """
+    solver = _get_solver()
 
     solver.erase()
-    
+    _reverse_columns.clear()
+
     if likelihood_gapfill:
         solver.obj.maximize = False
     else:
         solver.obj.maximize = True
 
-    nrows = len(matrix)
-    ncols = len(matrix[0])
-
     if verbose > 0:
         sys.stderr.write("We are loading " + str(nrows) + " rows and " + str(ncols) + " columns\n")
 
     solver.rows.add(nrows)
     solver.cols.add(ncols)
+    _loaded['rows'] = nrows
+    _loaded['cols'] = ncols
 
-    # we need to flatten the 2D array before we add it to the lp object
-    temp = []
-    for i in range(len(matrix)):
-        for j in range(len(matrix[0])):
-            temp.append(matrix[i][j])
 
-    if verbose > 4:
-        sys.stderr.write("Matrix: " + str(temp) + "\n")
-    solver.matrix = temp
+def _name(rowheaders, colheaders, nrows, ncols, verbose):
+    """
+    Name the rows and columns
+    """
+    solver = _get_solver()
 
-    # name the rows and columns
     if rowheaders and len(rowheaders) == nrows:
         for i in range(len(rowheaders)):
             if len(rowheaders[i]) > 255:
@@ -106,7 +197,7 @@ def row_bounds(bounds):
 
     """
 
-    global solver
+    solver = _get_solver()
     if len(bounds) != len(solver.rows):
         raise ValueError("There must be the same number of bounds as rows bounds:" + str(bounds) + " rows: " + str(len(
             solver.rows)) + "\n")
@@ -127,7 +218,7 @@ def col_bounds(bounds):
     :rtype: void
     """
 
-    global solver
+    solver = _get_solver()
     if len(bounds) != len(solver.cols):
         raise ValueError("There must be the same number of bounds as cols")
 
@@ -135,6 +226,22 @@ def col_bounds(bounds):
         solver.cols[i].bounds = bounds[i]
 
 
+def change_col_bounds(bounds):
+    """
+    Change the bounds of some of the columns, leaving the rest of the lp as it is. This is much quicker than loading
+    the lp again, and the solver starts from the last solution.
+
+    :param bounds: The column index and a tuple of (lower bound, upper bound) for each column to change
+    :type bounds: dict of int and tuple
+    :return: void
+    :rtype: void
+    """
+
+    solver = _get_solver()
+    for j in bounds:
+        solver.cols[j].bounds = bounds[j]
+
+
 def objective_coefficients(coeff):
     """
     Set the objective coefficients. coeff should be an array of
@@ -145,23 +252,189 @@ def objective_coefficients(coeff):
     :return: void
     :rtype: void
     """
-    global solver
+    solver = _get_solver()
     solver.obj[:] = coeff
 
 
-def solve():
+def solve(presolve=False):
     """
     Solve the lp and return the status and the objective function
     value
 
+    :param presolve: Use the GLPK presolver to simplify the lp first. This helps with very large lps
+    :type presolve: bool
     :return: The status and value of the solution
     :rtype: str, float
 
     """
-    solver.simplex()
+    solver = _get_solver()
+    if presolve:
+        solver.simplex(presolve=True)
+    else:
+        solver.simplex()
+    return solver.status, solver.obj.value
+
+
+def parsimonious(fraction=1.0):
+    """
+    Parsimonious FBA. Once the lp has been solved, keep the objective at (at least) fraction of the value we found, and
+    find the solution with the smallest total absolute value of the columns. This gives a reproducible solution
+    without the flux loops and detours that an arbitrary optimal solution can have.
+
+    We split each column that can be both negative and positive into a forward and a reverse column, both of which
+    are positive, so that we can minimize their sum. The primals reported by col_primals and col_primal_hash are the
+    net values of the original columns.
+
+    The lp is changed by this, so load it again before you solve anything else.
+
+    :param fraction: The fraction of the objective value that we must keep. We always allow it to be a little
+        worse than that (see OBJECTIVE_TOLERANCE) so that rounding in the solver does not make the lp infeasible
+    :type fraction: float
+    :return: The status and the total absolute value of the columns
+    :rtype: str, float
+    """
+
+    solver = _get_solver()
+    ncols = _loaded['cols']
+    objective = [(j, solver.obj[j]) for j in range(ncols) if solver.obj[j] != 0]
+    value = solver.obj.value
+    slack = OBJECTIVE_TOLERANCE * (1 + abs(value))
+
+    # keep the objective where it is
+    i = solver.rows.add(1)
+    solver.rows[i].name = "PARSIMONIOUS_OBJECTIVE"
+    solver.rows[i].matrix = objective
+    if solver.obj.maximize:
+        solver.rows[i].bounds = (value - abs(value) * (1 - fraction) - slack, None)
+    else:
+        solver.rows[i].bounds = (None, value + abs(value) * (1 / fraction - 1) + slack)
+
+    return minimize_absolute([1.0] * ncols)
+
+
+def minimize_absolute(weights, presolve=False):
+    """
+    Change the objective to minimize the weighted sum of the absolute values of the columns, and solve.
+
+    We split each column with a non-zero weight that can be both negative and positive into a forward and a reverse
+    column, both of which are positive, so that we can minimize their sum. The primals reported by col_primals and
+    col_primal_hash are the net values of the original columns.
+
+    :param weights: The weight of each column. Columns with a weight of 0 are not in the objective
+    :type weights: list of float
+    :param presolve: Use the GLPK presolver
+    :type presolve: bool
+    :return: The status and the weighted sum
+    :rtype: str, float
+    """
+
+    solver = _get_solver()
+    ncols = _loaded['cols']
+    if len(weights) != ncols:
+        raise ValueError("There must be the same number of weights as cols")
+
+    coefficients = []
+    reverse_coefficients = []
+    for j in range(ncols):
+        weight = weights[j]
+        lower, upper = solver.cols[j].bounds
+        if weight == 0:
+            coefficients.append(0.0)
+        elif lower is not None and lower >= 0:
+            coefficients.append(weight)
+        elif upper is not None and upper <= 0:
+            coefficients.append(-weight)
+        else:
+            _split_column(j)
+            coefficients.append(weight)
+            reverse_coefficients.append(weight)
+
+    solver.obj.maximize = False
+    solver.obj[:] = coefficients + reverse_coefficients
+    return solve(presolve)
+
+
+def minimize_indicators(weights, presolve=False):
+    """
+    Change the objective to minimize the weighted number of columns that are used (that are not zero), and solve this
+    as a mixed integer lp.
+
+    For each column with a weight we add a binary (0 or 1) indicator column, and a row that only lets the column be
+    used if its indicator is 1. The objective is the weighted sum of the indicators. Columns that can be both negative
+    and positive are split into a forward and a reverse column (as in minimize_absolute) so that one row covers
+    both directions. The columns with weights must have finite bounds.
+
+    :param weights: The weight of each column. Columns with a weight of None are not in the objective, and can be used
+        for free
+    :type weights: list of float
+    :param presolve: Use the GLPK presolver
+    :type presolve: bool
+    :return: The status and the weighted sum of the indicators
+    :rtype: str, float
+    """
+
+    solver = _get_solver()
+    ncols = _loaded['cols']
+    if len(weights) != ncols:
+        raise ValueError("There must be the same number of weights as cols")
+
+    indicators = []
+    for j in range(ncols):
+        if weights[j] is None:
+            continue
+        lower, upper = solver.cols[j].bounds
+        if lower is None or upper is None:
+            raise ValueError("Column " + str(solver.cols[j].name) + " needs finite bounds to have an indicator")
+        big_m = max(abs(lower), abs(upper))
+        entries = [(j, 1.0)]
+        if lower < 0 < upper:
+            entries.append((_split_column(j), 1.0))
+        elif upper <= 0:
+            entries = [(j, -1.0)]
+        y = solver.cols.add(1)
+        solver.cols[y].name = (solver.cols[j].name or str(j))[0:245] + " (used)"
+        solver.cols[y].kind = bool
+        solver.cols[y].bounds = (0, 1)
+        i = solver.rows.add(1)
+        solver.rows[i].matrix = entries + [(y, -big_m)]
+        solver.rows[i].bounds = (None, 0)
+        indicators.append((y, weights[j]))
+
+    coefficients = [0.0] * len(solver.cols)
+    for y, weight in indicators:
+        coefficients[y] = weight
+    solver.obj.maximize = False
+    solver.obj[:] = coefficients
+    if presolve:
+        solver.integer(presolve=True)
+    else:
+        solver.simplex()
+        solver.integer()
     return solver.status, solver.obj.value
 
 
+def _split_column(j):
+    """
+    Split a column that can be both negative and positive into a forward column (the original, now only positive) and
+    a new reverse column, with the opposite coefficients, that is also only positive.
+
+    :param j: The column to split
+    :type j: int
+    :return: The index of the reverse column
+    :rtype: int
+    """
+
+    solver = _get_solver()
+    lower, upper = solver.cols[j].bounds
+    r = solver.cols.add(1)
+    solver.cols[r].name = (solver.cols[j].name or str(j))[0:245] + " (reverse)"
+    solver.cols[r].matrix = [(row, -val) for (row, val) in solver.cols[j].matrix]
+    solver.cols[r].bounds = (0, None if lower is None else -lower)
+    solver.cols[j].bounds = (0, upper)
+    _reverse_columns[j] = r
+    return r
+
+
 def col_primal_hash():
     """
     Return a hash of the column names and the primals (activities)
@@ -171,10 +444,11 @@ def col_primal_hash():
     :return: A hash of the column names and their primals
     :rtype: dict
     """
+    solver = _get_solver()
 
     d = {}
-    for c in solver.cols:
-        d[c.name] = c.primal
+    for j, p in enumerate(col_primals()):
+        d[solver.cols[j].name] = p
     return d
 
 
@@ -185,10 +459,13 @@ def col_primals():
     :return: A list of the column primals
     :rtype: list
     """
+    solver = _get_solver()
 
     d = []
-    for c in solver.cols:
-        d.append(c.primal)
+    for j in range(_loaded['cols']):
+        d.append(solver.cols[j].primal)
+    for j, r in _reverse_columns.items():
+        d[j] -= solver.cols[r].primal
     return d
 
 
@@ -199,10 +476,11 @@ def row_primal_hash():
     :return: A hash of the row names and their primals
     :rtype: dict
     """
+    solver = _get_solver()
 
     d = {}
-    for r in solver.rows:
-        d[r.name] = r.primal
+    for i in range(_loaded['rows']):
+        d[solver.rows[i].name] = solver.rows[i].primal
     return d
 
 
@@ -213,10 +491,57 @@ def row_primals():
     :return: A list of the row primals
     :rtype: list
     """
+    solver = _get_solver()
 
     d = []
-    for r in solver.rows:
-        d.append(r.primal)
+    for i in range(_loaded['rows']):
+        d.append(solver.rows[i].primal)
     return d
 
 
+def row_duals():
+    """
+    Return an array of the duals (shadow prices), one for each row
+
+    :return: A list of the row duals
+    :rtype: list
+    """
+    solver = _get_solver()
+
+    return [solver.rows[i].dual for i in range(_loaded['rows'])]
+
+
+def row_dual_hash():
+    """
+    Return a hash of the row names and their duals (shadow prices)
+
+    :return: A hash of the row names and their duals
+    :rtype: dict
+    """
+    solver = _get_solver()
+
+    return {solver.rows[i].name: solver.rows[i].dual for i in range(_loaded['rows'])}
+
+
+def col_dual_hash():
+    """
+    Return a hash of the column names and their duals (reduced costs)
+
+    :return: A hash of the column names and their duals
+    :rtype: dict
+    """
+    solver = _get_solver()
+
+    return {solver.cols[j].name: solver.cols[j].dual for j in range(_loaded['cols'])}
+
+
+def col_duals():
+    """
+    Return an array of the duals (reduced costs), one for each column
+
+    :return: A list of the column duals
+    :rtype: list
+    """
+    solver = _get_solver()
+
+    return [solver.cols[j].dual for j in range(_loaded['cols'])]
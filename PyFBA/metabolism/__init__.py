@@ -3,5 +3,10 @@ from .reaction import Reaction
 from .compound import Compound
 from .enzyme import Enzyme
 from .biomass import biomass_equation
+from .interning import compound_index, compound_string, reaction_index, reaction_id
+from .reaction_set import ReactionSet
+from .compound_reaction_index import CompoundReactionIndex
 
-__all__ = ['biomass_equation', 'Reaction', 'Compound', 'Enzyme']
+__all__ = ['biomass_equation', 'Reaction', 'Compound', 'Enzyme',
+           'compound_index', 'compound_string', 'reaction_index', 'reaction_id', 'ReactionSet',
+           'CompoundReactionIndex']
@@ -0,0 +1,134 @@
+"""
+An inverted index from compounds to the reactions that they are in, and the number of reactions in a model that each
+compound is in.
+
+Several of the gap filling suggestions need to know which reactions a compound is in, or how connected each compound
+is in the model. Rather than work that out from the whole database every time, a CompoundReactionIndex keeps both. The
+counts for the model are updated as reactions are added to (or removed from) the model, so the cost of keeping them up
+to date depends on how many reactions change and not on the size of the model or the database.
+
+Compounds are keyed by their interned integers (see PyFBA.metabolism.interning), so a compound in two locations is two
+different compounds.
+"""
+
+from .interning import compound_index
+
+
+class CompoundReactionIndex:
+    """
+    An index of the reactions for each compound, and the counts of each compound in the reactions of a model.
+
+    :ivar reactions: The reactions dict that we index
+    :type reactions: dict
+    :ivar running: The reactions in the model
+    :type running: set
+    :ivar degree: The number of reactions in the model that each compound (by its integer) is in
+    :type degree: dict of int and int
+    """
+
+    def __init__(self, reactions, reactions2run=None):
+        """
+        Create a new index. The index of all the reactions is only made when we first need it.
+
+        :param reactions: The reactions dict
+        :type reactions: dict
+        :param reactions2run: The reactions in the model
+        :type reactions2run: set
+        """
+        self.reactions = reactions
+        self.running = set()
+        self.degree = {}
+        self._index = None
+        if reactions2run:
+            self.add(reactions2run)
+
+    def _build(self):
+        """
+        Index all the reactions in the reactions dict
+        """
+        self._index = {}
+        for r in self.reactions:
+            self._index_reaction(r)
+
+    def _index_reaction(self, rid):
+        for c in self.reactions[rid].all_compounds():
+            ci = compound_index(c)
+            if ci in self._index:
+                self._index[ci].add(rid)
+            else:
+                self._index[ci] = {rid}
+
+    def index_reaction(self, rid):
+        """
+        Add a reaction that has been added to the reactions dict to the index.
+
+        :param rid: The reaction id
+        :type rid: str
+        """
+        if self._index is not None:
+            self._index_reaction(rid)
+
+    def reactions_with(self, cpd):
+        """
+        The reactions that a compound is in. Don't change the set that this returns.
+
+        :param cpd: The compound
+        :type cpd: PyFBA.metabolism.Compound
+        :rtype: set
+        """
+        return self.reactions_with_index(compound_index(cpd))
+
+    def reactions_with_index(self, ci):
+        """
+        The reactions that the compound with this integer is in. Don't change the set that this returns.
+
+        :param ci: The compound integer
+        :type ci: int
+        :rtype: set
+        """
+        if self._index is None:
+            self._build()
+        return self._index.get(ci, frozenset())
+
+    def add(self, reactions2run):
+        """
+        Add reactions to the model and count their compounds.
+
+        :param reactions2run: The reactions to add
+        :type reactions2run: set
+        """
+        for r in reactions2run:
+            if r in self.running:
+                continue
+            self.running.add(r)
+            for c in self.reactions[r].all_compounds():
+                ci = compound_index(c)
+                self.degree[ci] = self.degree.get(ci, 0) + 1
+
+    def remove(self, reactions2run):
+        """
+        Remove reactions from the model and stop counting their compounds.
+
+        :param reactions2run: The reactions to remove
+        :type reactions2run: set
+        """
+        for r in reactions2run:
+            if r not in self.running:
+                continue
+            self.running.remove(r)
+            for c in self.reactions[r].all_compounds():
+                ci = compound_index(c)
+                self.degree[ci] -= 1
+                if self.degree[ci] == 0:
+                    del self.degree[ci]
+
+    def sync(self, reactions2run):
+        """
+        Make the model have exactly these reactions, adding and removing only the reactions that changed.
+
+        :param reactions2run: The reactions in the model
+        :type reactions2run: set
+        """
+        reactions2run = set(reactions2run)
+        self.remove(self.running - reactions2run)
+        self.add(reactions2run - self.running)
@@ -0,0 +1,155 @@
+"""
+Integer identifiers for compounds and reactions.
+
+Most of PyFBA uses strings to identify things: str(compound) for compounds and the reaction id for reactions. Building
+those strings (and hashing them) over and over is a significant part of the cost of building a stoichiometric matrix,
+so internally we give every compound (name and location) and every reaction id a small, dense, integer. The integers
+are global for the python process and never change once they have been handed out, so they can be used as indices
+into lists and as bit positions in bitsets.
+
+We only convert back to names at the edges, e.g. when we name the rows and columns of the LP.
+"""
+
+import threading
+
+
+class InternTable:
+    """
+    A table that hands out a dense integer for every key it is given. The first key is 0, the next 1, and so on. The
+    same key always gets the same integer.
+
+    :ivar keys: the keys in the order they were added. keys[i] is the key for integer i
+    :type keys: list
+    """
+
+    def __init__(self):
+        """
+        Create a new, empty, table
+        """
+        self.keys = []
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """
+        The number of keys in the table
+
+        :rtype: int
+        """
+        return len(self.keys)
+
+    def __contains__(self, key):
+        """
+        Is this key already in the table?
+
+        :param key: The key to look for
+        :rtype: bool
+        """
+        return key in self._index
+
+    def index(self, key):
+        """
+        Get the integer for a key, adding the key to the table if we have not seen it before.
+
+        :param key: the key (it must be hashable)
+        :return: the integer for that key
+        :rtype: int
+        """
+        try:
+            return self._index[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._index:
+                self._index[key] = len(self.keys)
+                self.keys.append(key)
+            return self._index[key]
+
+    def get(self, key, default=None):
+        """
+        Get the integer for a key without adding it to the table.
+
+        :param key: the key
+        :param default: what to return if we have not seen the key
+        :return: the integer for the key or the default
+        :rtype: int
+        """
+        return self._index.get(key, default)
+
+    def key(self, idx):
+        """
+        Get the key for an integer
+
+        :param idx: The integer
+        :type idx: int
+        :return: the key
+        """
+        return self.keys[idx]
+
+
+# The global tables. Compounds are keyed by (name, location) and reactions by their id.
+compound_table = InternTable()
+reaction_table = InternTable()
+
+
+def compound_index(cpd):
+    """
+    Get the integer for a compound. Two compounds with the same name and location (i.e. that are equal) have the same
+    integer.
+
+    :param cpd: The compound
+    :type cpd: PyFBA.metabolism.Compound
+    :return: The compound's integer
+    :rtype: int
+    """
+    return compound_table.index((cpd.name, cpd.location))
+
+
+def compound_location(idx):
+    """
+    Get the location of an interned compound without making the compound
+
+    :param idx: The compound integer
+    :type idx: int
+    :return: The location of the compound
+    :rtype: str
+    """
+    return compound_table.keys[idx][1]
+
+
+def compound_string(idx):
+    """
+    Get the str() of an interned compound. This is the same as str(compound) and so can be used as the key for the
+    compounds dict.
+
+    :param idx: The compound integer
+    :type idx: int
+    :return: The name of the compound, including its location
+    :rtype: str
+    """
+    name, location = compound_table.keys[idx]
+    return name + " (location: " + location + ")"
+
+
+def reaction_index(rid):
+    """
+    Get the integer for a reaction id.
+
+    :param rid: The reaction id
+    :type rid: str
+    :return: The reaction's integer
+    :rtype: int
+    """
+    return reaction_table.index(rid)
+
+
+def reaction_id(idx):
+    """
+    Get the reaction id for an integer.
+
+    :param idx: The reaction integer
+    :type idx: int
+    :return: The reaction id
+    :rtype: str
+    """
+    return reaction_table.keys[idx]
@@ -0,0 +1,216 @@
+"""
+A set of reaction ids stored as a bitset.
+
+During gap filling we make a lot of sets of reactions, and most of them are unions and differences of the same few
+(often very large) sets. A ReactionSet stores the reactions as a python int, where bit i is set if the reaction with
+the interned integer i (see PyFBA.metabolism.interning) is in the set. Union, intersection and difference are then
+single integer operations, and the sets are cheap to compare.
+
+A ReactionSet behaves like a frozenset of reaction ids: you can iterate over it, test membership with reaction ids, and
+combine it with other ReactionSets or with any iterable of reaction ids.
+"""
+
+from .interning import reaction_table
+
+
+def _bits(reactions):
+    """
+    Convert some reactions to a bitset.
+
+    :param reactions: A ReactionSet or an iterable of reaction ids
+    :return: the bitset
+    :rtype: int
+    """
+    if isinstance(reactions, ReactionSet):
+        return reactions.bits
+    bits = 0
+    for r in reactions:
+        bits |= 1 << reaction_table.index(r)
+    return bits
+
+
+class ReactionSet:
+    """
+    An immutable set of reaction ids backed by an integer bitmask.
+
+    :ivar bits: The bitmask. Bit i is set if the reaction with interned integer i is in the set
+    :type bits: int
+    """
+
+    __slots__ = ('bits', '_hash')
+
+    def __init__(self, reactions=None):
+        """
+        Create a new ReactionSet.
+
+        :param reactions: An optional ReactionSet or iterable of reaction ids to put in the set
+        """
+        self.bits = _bits(reactions) if reactions else 0
+        self._hash = None
+
+    @classmethod
+    def from_bits(cls, bits):
+        """
+        Create a ReactionSet directly from a bitmask
+
+        :param bits: The bitmask
+        :type bits: int
+        :rtype: ReactionSet
+        """
+        rs = cls()
+        rs.bits = bits
+        return rs
+
+    def indices(self):
+        """
+        The interned reaction integers in this set, in increasing order
+
+        :rtype: generator of int
+        """
+        # reading the binary representation is much faster than shifting a large int one bit at a time
+        s = bin(self.bits)[:1:-1]
+        i = s.find('1')
+        while i != -1:
+            yield i
+            i = s.find('1', i + 1)
+
+    def __iter__(self):
+        keys = reaction_table.keys
+        for i in self.indices():
+            yield keys[i]
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __contains__(self, rid):
+        i = reaction_table.get(rid)
+        if i is None:
+            return False
+        return (self.bits >> i) & 1 == 1
+
+    def __hash__(self):
+        # a ReactionSet is equal to a set or frozenset with the same reactions, so it must hash like the frozenset
+        if self._hash is None:
+            self._hash = hash(frozenset(self))
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, ReactionSet):
+            return self.bits == other.bits
+        if isinstance(other, (set, frozenset)):
+            return len(self) == len(other) and all(r in self for r in other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        if eq is NotImplemented:
+            return eq
+        return not eq
+
+    def __repr__(self):
+        return "ReactionSet({})".format(sorted(self))
+
+    def __reduce__(self):
+        # the interned integers are only valid in this process, so we pickle the reaction ids
+        return self.__class__, (list(self),)
+
+    def __or__(self, other):
+        return ReactionSet.from_bits(self.bits | _bits(other))
+
+    __ror__ = __or__
+
+    def __and__(self, other):
+        return ReactionSet.from_bits(self.bits & _bits(other))
+
+    __rand__ = __and__
+
+    def __sub__(self, other):
+        return ReactionSet.from_bits(self.bits & ~_bits(other))
+
+    def __rsub__(self, other):
+        return ReactionSet.from_bits(_bits(other) & ~self.bits)
+
+    def __xor__(self, other):
+        return ReactionSet.from_bits(self.bits ^ _bits(other))
+
+    __rxor__ = __xor__
+
+    def __le__(self, other):
+        return self.issubset(other)
+
+    def __ge__(self, other):
+        return self.issuperset(other)
+
+    def union(self, *others):
+        """
+        The union of this set and one or more others.
+
+        :param others: ReactionSets or iterables of reaction ids
+        :rtype: ReactionSet
+        """
+        bits = self.bits
+        for o in others:
+            bits |= _bits(o)
+        return ReactionSet.from_bits(bits)
+
+    def intersection(self, *others):
+        """
+        The intersection of this set and one or more others.
+
+        :param others: ReactionSets or iterables of reaction ids
+        :rtype: ReactionSet
+        """
+        bits = self.bits
+        for o in others:
+            bits &= _bits(o)
+        return ReactionSet.from_bits(bits)
+
+    def difference(self, *others):
+        """
+        The reactions in this set that are not in any of the others.
+
+        :param others: ReactionSets or iterables of reaction ids
+        :rtype: ReactionSet
+        """
+        bits = self.bits
+        for o in others:
+            bits &= ~_bits(o)
+        return ReactionSet.from_bits(bits)
+
+    def issubset(self, other):
+        """
+        Are all the reactions in this set also in other?
+
+        :param other: A ReactionSet or an iterable of reaction ids
+        :rtype: bool
+        """
+        return self.bits & ~_bits(other) == 0
+
+    def issuperset(self, other):
+        """
+        Are all the reactions in other also in this set?
+
+        :param other: A ReactionSet or an iterable of reaction ids
+        :rtype: bool
+        """
+        return _bits(other) & ~self.bits == 0
+
+    def isdisjoint(self, other):
+        """
+        Do this set and other have no reactions in common?
+
+        :param other: A ReactionSet or an iterable of reaction ids
+        :rtype: bool
+        """
+        return self.bits & _bits(other) == 0
+
+    def copy(self):
+        """
+        ReactionSets can not be changed, so this is the same set
+
+        :rtype: ReactionSet
+        """
+        return self
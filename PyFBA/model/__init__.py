@@ -1,8 +1,8 @@
 
 from .model import Model
-from .build_model import roles_to_model, save_model, load_model
+from .build_model import roles_to_model, roles_to_models, save_model, load_model
 from .fba import model_reaction_fluxes, output_fba, output_fba_with_subsystem
 
 __all__ = ["Model",
-           "roles_to_model", "save_model", "load_model",
+           "roles_to_model", "roles_to_models", "save_model", "load_model",
            "model_reaction_fluxes", "output_fba", "output_fba_with_subsystem"]
@@ -3,6 +3,7 @@ import sys
 import os
 import copy
 import errno
+
 import PyFBA
 
 
@@ -56,6 +57,81 @@ def roles_to_model(rolesFile, id, name, orgtype="gramnegative", verbose=False):
     return model
 
 
+def roles_to_models(role_files, orgtype="gramnegative", spreadsheet=False, out_dir=None, verbose=False):
+    """
+    Read in the 'assigned_functions' files from RAST for many genomes and create a model for each of them.
+
+    We only load the ModelSEED database and the roles of the reactions (see PyFBA.filters.role_reaction_index) once.
+    The reactions of each role are kept as the bits of a ReactionSet (one int), the first time we see the role, and the
+    reactions of a genome are just those ints or'ed together. Then we make the models one at a time as you ask for them.
+
+    The models share the reactions and compounds from one copy of the database.
+
+    :param role_files: The assigned functions files. The id and name of each model is the name of the file without
+        the extension, or you can provide (genome, file name) tuples
+    :type role_files: iterable of str or of (str, str)
+    :param orgtype: Organism type
+    :type orgtype: str
+    :param spreadsheet: The files are spreadsheets (tab-separated text format) rather than assigned functions
+    :type spreadsheet: bool
+    :param out_dir: Save each model in this directory (see save_model) instead of returning it
+    :type out_dir: str
+    :param verbose: Verbose output
+    :type verbose: bool
+    :return: The models, or the ids of the models that were saved if there is an out_dir
+    :rtype: generator of Model or of str
+    """
+
+    # Load ModelSEED database
+    compounds, reactions, enzymes = \
+            PyFBA.parse.model_seed.compounds_reactions_enzymes(orgtype)
+    index = PyFBA.filters.role_reaction_index()
+
+    # the reactions of each role that we have seen in a genome, as ReactionSet bits
+    role_names = []
+    role_numbers = {}
+    role_bits = []
+
+    # each genome, the numbers of its roles that have reactions, and the bits of all of their reactions
+    genomes = []
+    for genome, roles in PyFBA.parse.genome_roles(role_files, spreadsheet, verbose):
+        numbers = []
+        bits = 0
+        for role in roles:
+            if role not in index:
+                continue
+            if role not in role_numbers:
+                role_numbers[role] = len(role_names)
+                role_names.append(role)
+                role_bits.append(PyFBA.metabolism.ReactionSet(r for r in index[role] if r in reactions).bits)
+            numbers.append(role_numbers[role])
+            bits |= role_bits[role_numbers[role]]
+        genomes.append((genome, numbers, bits))
+
+    if verbose:
+        print("Read {} genomes with {} roles that have reactions".format(len(genomes), len(role_names)),
+              file=sys.stderr)
+
+    role_reactions = {}
+    for genome, numbers, bits in genomes:
+        model = PyFBA.model.Model(genome, genome, orgtype)
+        model.add_reactions({reactions[r] for r in PyFBA.metabolism.ReactionSet.from_bits(bits)})
+        for j in numbers:
+            if not role_bits[j]:
+                continue
+            if j not in role_reactions:
+                role_reactions[j] = set(PyFBA.metabolism.ReactionSet.from_bits(role_bits[j]))
+            model.add_roles({role_names[j]: role_reactions[j]})
+
+        # Set biomass equation based on organism type
+        model.set_biomass_reaction(PyFBA.metabolism.biomass_equation(orgtype))
+        if out_dir:
+            save_model(model, out_dir)
+            yield model.id
+        else:
+            yield model
+
+
 def save_model(model, out_dir):
     """
     Save all model information in multiple files.
@@ -1,10 +1,9 @@
 from __future__ import print_function
 import sys
-import os.path
 import PyFBA
 
 
-def model_reaction_fluxes(model, media_file, biomass_reaction=None):
+def model_reaction_fluxes(model, media_file, biomass_reaction=None, pfba=False):
     """
     Run FBA on model and return dictionary of reaction ID and flux.
 
@@ -14,15 +13,17 @@ def model_reaction_fluxes(model, media_file, biomass_reaction=None):
     :type media_file: str
     :param biomass_reaction: Given biomass Reaction object
     :type biomass_reaction: Reaction
+    :param pfba: Return the parsimonious FBA fluxes
+    :type pfba: bool
     :rtype: dict
     """
-    status, value, growth = model.run_fba(media_file, biomass_reaction)
+    status, value, growth = model.run_fba(media_file, biomass_reaction, pfba=pfba)
     if not growth:
         print("Warning: model did not grow on given media", file=sys.stderr)
     return PyFBA.fba.reaction_fluxes()
 
 
-def output_fba(f, model, media_file, biomass_reaction=None):
+def output_fba(f, model, media_file, biomass_reaction=None, pfba=False):
     """
     Run FBA on model and output results in tab-delimited format.
 
@@ -34,6 +35,8 @@ def output_fba(f, model, media_file, biomass_reaction=None):
     :type media_file: str
     :param biomass_reaction: Given biomass Reaction object
     :type biomass_reaction: Reaction
+    :param pfba: Output the parsimonious FBA fluxes
+    :type pfba: bool
     """
     # Get mapping from reaction IDs to roles
     mReactions = {r: [] for r in model.reactions.keys()}
@@ -42,7 +45,7 @@ def output_fba(f, model, media_file, biomass_reaction=None):
             mReactions[r].append(role)
 
     # Run FBA and get fluxes
-    fluxes = model_reaction_fluxes(model, media_file, biomass_reaction)
+    fluxes = model_reaction_fluxes(model, media_file, biomass_reaction, pfba)
 
     # Print header
     f.write("reaction\tflux\tfunction\n")
@@ -55,7 +58,7 @@ def output_fba(f, model, media_file, biomass_reaction=None):
         f.write("\n")
 
 
-def output_fba_with_subsystem(f, model, media_file, biomass_reaction=None):
+def output_fba_with_subsystem(f, model, media_file, biomass_reaction=None, pfba=False):
     """
     Run FBA on model and output results and subsystem info in tab-delimited format.
 
@@ -67,6 +70,8 @@ def output_fba_with_subsystem(f, model, media_file, biomass_reaction=None):
     :type media_file: str
     :param biomass_reaction: Given biomass Reaction object
     :type biomass_reaction: Reaction
+    :param pfba: Output the parsimonious FBA fluxes
+    :type pfba: bool
     """
     # Get mapping from reaction IDs to roles
     mReactions = {r: [] for r in model.reactions.keys()}
@@ -75,19 +80,10 @@ def output_fba_with_subsystem(f, model, media_file, biomass_reaction=None):
             mReactions[r].append(role)
 
     # Load subsystem info
-    ss_data = {}
-    with open(os.path.join(os.path.dirname(__file__), "..", "util", "full_roles_ss.tsv")) as fin:
-        for l in fin:
-            func, cat, subcat, ss = l.rstrip("\n").split("\t")
-            if func not in ss_data:
-                ss_data[func] = set()
-            cat = cat if cat != "" else "Unknown"
-            subcat = subcat if subcat != "" else "Unknown"
-            ss = ss if ss != "" else "Unknown"
-            ss_data[func].add((cat, subcat, ss))
+    ss_data = PyFBA.parse.subsystem_index().roles
 
     # Run FBA and get fluxes
-    fluxes = model_reaction_fluxes(model, media_file, biomass_reaction)
+    fluxes = model_reaction_fluxes(model, media_file, biomass_reaction, pfba)
 
     # Print header
     f.write("reaction\tflux\tfunction\tsubsystem\tsubcategory\tcategory\n")
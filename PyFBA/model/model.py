@@ -189,7 +189,7 @@ class Model:
                 f.write("{}\t{}\t{}\t{}\n".format(role, ss, subcat, cat))
 
 
-    def run_fba(self, media_file, biomass_reaction=None):
+    def run_fba(self, media_file, biomass_reaction=None, pfba=False, store=None):
         """
         Run FBA on model and return status, value, and growth.
 
@@ -197,6 +197,10 @@ class Model:
         :type media_file: str
         :param biomass_reaction: Given biomass Reaction object
         :type biomass_reaction: Reaction
+        :param pfba: Run parsimonious FBA so the fluxes are the smallest that give the most growth
+        :type pfba: bool
+        :param store: A store of the results of earlier fba, so we don't run the same fba again
+        :type store: PyFBA.fba.ResultStore
         :rtype: tuple
         """
         # Check if model has a biomass reaction if none was given
@@ -209,7 +213,7 @@ class Model:
 
         # Read in media file
         try:
-            media = PyFBA.parse.read_media_file(media_file)
+            media = PyFBA.parse.media_library().medium(media_file)
         except IOError as e:
             print(e)
             return (None, None, None)
@@ -226,7 +230,9 @@ class Model:
                                                   reactions,
                                                   modelRxns,
                                                   media,
-                                                  biomass_reaction)
+                                                  biomass_reaction,
+                                                  pfba=pfba,
+                                                  store=store)
 
         return (status, value, growth)
 
@@ -260,7 +266,7 @@ class Model:
 
         # Read in media file
         try:
-            media = PyFBA.parse.read_media_file(media_file)
+            media = PyFBA.parse.media_library().medium(media_file)
         except IOError as e:
             print(e)
             return False
@@ -284,6 +290,9 @@ class Model:
         compounds, reactions, enzymes =\
             PyFBA.parse.model_seed.compounds_reactions_enzymes(
                 self.organism_type)
+        # the reactions for each compound, and how often each compound is
+        # in our reactions
+        index = PyFBA.metabolism.CompoundReactionIndex(reactions)
 
         ########################################
         ## Media import reactions
@@ -294,7 +303,8 @@ class Model:
         gf_reactions = PyFBA.gapfill.suggest_from_media(compounds,
                                                         reactions,
                                                         newModelRxns,
-                                                        media)
+                                                        media,
+                                                        index=index)
         added_reactions.append(("media", gf_reactions))
         newModelRxns.update(gf_reactions)
         rxns_for_new_model = set()
@@ -451,7 +461,8 @@ class Model:
                     PyFBA.gapfill.suggest_by_compound(compounds,
                                                       reactions,
                                                       newModelRxns,
-                                                      max_reactions=1)
+                                                      max_reactions=1,
+                                                      index=index)
             added_reactions.append(("orphans", gf_reactions))
             newModelRxns.update(gf_reactions)
             rxns_for_new_model = set()
@@ -486,8 +497,10 @@ class Model:
         if use_flux:
             # Get fluxes from gap-filled reactions
             # Keep those without a flux of zero
+            # Parsimonious FBA gives the fewest reactions with flux
             rxnfluxes = PyFBA.model.model_reaction_fluxes(newModel,
-                                                          media_file)
+                                                          media_file,
+                                                          pfba=True)
             numRemoved = 0
             tmp_added_reactions = []
             for how, gfrxns in added_reactions:
@@ -1,4 +1,9 @@
 from .read_media import read_media_file
-from .rast import read_assigned_functions, roles_of_function, roles_to_subsystem
-from .model_seed import compounds_reactions_enzymes
+from .media_library import MediaLibrary, Medium, media_library, media_fingerprint, media_bits
+from .rast import read_assigned_functions, roles_of_function, roles_to_subsystem, stream_functions, genome_roles
+from .model_seed import compounds_reactions_enzymes, modelseed_dir
 from .SBML import parse_sbml_file, correct_media_names
+from .subsystems import subsystem_index, SubsystemIndex
+from .cache import cache_dir
+from .compiled_biochemistry import compile_biochemistry, BiochemistryStore, biochemistry_store, SharedBiochemistry, \
+    attach_biochemistry
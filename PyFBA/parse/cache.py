@@ -0,0 +1,92 @@
+"""
+A cache for things that we parse from the data files that come with PyFBA (or from the ModelSEED database).
+
+Parsing some of these files takes a few seconds, and we do it every time we make or gapfill a model. Instead we parse
+them once and keep a pickle of the result in a cache directory. The pickle remembers the size and modification time
+of the files it was made from, so if a file changes we parse it again.
+
+The cache directory is $PYFBA_CACHE_DIR if that is set, otherwise $XDG_CACHE_HOME/PyFBA, otherwise ~/.cache/PyFBA. If
+we can't write to the cache directory we just don't cache.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+
+def cache_dir():
+    """
+    The directory where we keep cached files. This is made if it does not exist.
+
+    :return: The path to the cache directory, or None if we can't make it
+    :rtype: str
+    """
+    if 'PYFBA_CACHE_DIR' in os.environ:
+        path = os.environ['PYFBA_CACHE_DIR']
+    else:
+        base = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+        path = os.path.join(base, 'PyFBA')
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        return None
+    return path
+
+
+def _signature(files):
+    """
+    The absolute path, size and modification time of each file
+    """
+    signature = []
+    for f in files:
+        st = os.stat(f)
+        signature.append((os.path.abspath(f), st.st_size, st.st_mtime_ns))
+    return signature
+
+
+def cached(name, files, build, verbose=False):
+    """
+    Get something that we parse from some files, from the cache if we can.
+
+    :param name: A name for what we are caching, e.g. 'subsystems'
+    :type name: str
+    :param files: The files that we parse
+    :type files: list of str
+    :param build: A function with no arguments that parses the files
+    :type build: function
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: Whatever build returns
+    """
+
+    signature = _signature(files)
+    directory = cache_dir()
+    if directory is None:
+        return build()
+
+    key = hashlib.sha1(repr([s[0] for s in signature]).encode('utf-8')).hexdigest()[0:16]
+    path = os.path.join(directory, "{}-{}.pickle".format(name, key))
+
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                saved_signature, data = pickle.load(f)
+            if saved_signature == signature:
+                return data
+        except Exception as e:
+            if verbose:
+                sys.stderr.write("Could not read the cached {} from {}: {}\n".format(name, path, e))
+
+    data = build()
+    try:
+        # write to a temporary file and move it so two processes don't read a partly written cache
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as out:
+            pickle.dump((signature, data), out, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        if verbose:
+            sys.stderr.write("Could not write the cached {} to {}: {}\n".format(name, path, e))
+    return data
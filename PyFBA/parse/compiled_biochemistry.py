@@ -0,0 +1,740 @@
+"""
+A compiled, memory mapped, copy of the ModelSEED biochemistry.
+
+Parsing the ModelSEED database (or even unpickling it) makes about 35,000 Reaction objects and their compounds, and if
+we use several processes each of them has its own copy. Instead we can compile the compounds, reactions, stoichiometry,
+enzymes and roles once into a directory of columns. Each column is a NumPy .npy file (we write and read them with the
+standard library, so NumPy is not needed, but you can numpy.load(..., mmap_mode='r') them), and we memory map them, so
+all of the processes on a computer share one copy in the page cache. The Reaction and Compound objects are only made
+when you ask for them. SharedBiochemistry puts the same columns in shared memory, for worker processes that we start
+ourselves (e.g. in a multiprocessing.Pool) without writing them to a file. That needs multiprocessing.shared_memory,
+which is in Python 3.8 and later, so we only import it when you use SharedBiochemistry or attach_biochemistry.
+
+The columns are:
+
+    compound_name, compound_location, compound_id, compound_abbreviation, compound_formula, compound_mw,
+    compound_alternate_ids: strings for each compound (see below)
+    compound_reactions_indptr, compound_reactions_indices: the reactions that each compound is in (CSR)
+    reaction_id, reaction_equation: strings for each reaction
+    reaction_direction: the direction of each reaction as an ascii code (0 for None)
+    reaction_deltag, reaction_deltag_error: float64
+    reaction_is_transport, reaction_is_uptake_secretion: uint8
+    reaction_lower_bound, reaction_upper_bound: float64, nan if the bound is not set
+    stoichiometry_indptr, stoichiometry_split, stoichiometry_indices, stoichiometry_data: the stoichiometric matrix
+        with a row for each reaction (CSR). The compounds from indptr[r] to split[r] are on the left of the reaction
+        (with negative coefficients), and the ones from split[r] to indptr[r+1] are on the right
+    reaction_enzymes_indptr, reaction_enzymes_indices: the enzymes for each reaction (CSR)
+    enzyme_name: strings for each enzyme
+    enzyme_roles_indptr, enzyme_roles_indices: the roles of each enzyme (CSR)
+    role_name: strings for each role
+
+A column of strings is a uint8 .npy file of the utf-8 text, and an int64 _offsets.npy file with where each string
+starts (and where the last one ends).
+"""
+
+import ast
+import atexit
+import json
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping
+
+import PyFBA
+from .cache import cache_dir, _signature
+
+# change this if the columns change, so we don't read old stores
+FORMAT_VERSION = 2
+_MANIFEST = "biochemistry.json"
+_NPY_MAGIC = b'\x93NUMPY'
+# the .npy descr for each array typecode, and back again
+_DESCR = {'B': '|u1', 'i': '<i4', 'q': '<i8', 'd': '<f8'}
+_TYPECODE = {v: k for k, v in _DESCR.items()}
+# the shared memory that this process has attached to, and the store in it
+_attached = {}
+_STRING_COLUMNS = ['compound_name', 'compound_location', 'compound_id', 'compound_abbreviation', 'compound_formula',
+                   'compound_mw', 'compound_alternate_ids', 'reaction_id', 'reaction_equation', 'enzyme_name',
+                   'role_name']
+
+
+def _npy_header(values):
+    """
+    The version 1.0 .npy header for an array.
+
+    :param values: The values
+    :type values: array
+    :rtype: bytes
+    """
+    header = "{{'descr': '{}', 'fortran_order': False, 'shape': ({},), }}".format(_DESCR[values.typecode],
+                                                                                 len(values))
+    # the magic, version, and header length are 10 bytes, and the data should start on a multiple of 64
+    header += " " * (63 - (10 + len(header)) % 64) + "\n"
+    return _NPY_MAGIC + b'\x01\x00' + len(header).to_bytes(2, 'little') + header.encode('latin1')
+
+
+def _little_endian(values):
+    """
+    The values in little endian order, which is what we always store
+    """
+    if sys.byteorder != 'little' and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _write_npy(path, values):
+    """
+    Write an array to a version 1.0 .npy file.
+
+    :param path: The file to write
+    :type path: str
+    :param values: The values
+    :type values: array
+    """
+    with open(path, 'wb') as out:
+        out.write(_npy_header(values))
+        _little_endian(values).tofile(out)
+
+
+def _npy_values(buffer, name):
+    """
+    Get the values from the bytes of a .npy file that we wrote, without copying them.
+
+    :param buffer: The bytes of the file, e.g. a memory map
+    :type buffer: mmap or memoryview
+    :param name: The name of the file, for the error messages
+    :type name: str
+    :return: The values, as a read only memoryview of the buffer (or an array if this computer is not little endian)
+    :rtype: memoryview
+    """
+    if bytes(buffer[0:6]) != _NPY_MAGIC or buffer[6] != 1:
+        raise ValueError(name + " is not a version 1 .npy file")
+    length = int.from_bytes(buffer[8:10], 'little')
+    header = ast.literal_eval(bytes(buffer[10:10 + length]).decode('latin1'))
+    if header['descr'] not in _TYPECODE or header['fortran_order'] or len(header['shape']) != 1:
+        raise ValueError("We can not read the array in " + name)
+    typecode = _TYPECODE[header['descr']]
+    start = 10 + length
+    end = start + header['shape'][0] * array(typecode).itemsize
+    if sys.byteorder != 'little' and typecode != 'B':
+        values = array(typecode, buffer[start:end])
+        values.byteswap()
+        return values
+    return memoryview(buffer)[start:end].toreadonly().cast(typecode)
+
+
+def _read_npy(path):
+    """
+    Memory map a .npy file that we wrote.
+
+    :param path: The file to read
+    :type path: str
+    :return: The values, as a read only memoryview of the file (or an array if this computer is not little endian)
+    :rtype: memoryview
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _npy_values(mm, path)
+
+
+class Strings:
+    """
+    A read only list of strings stored in two columns: the utf-8 text and where each string starts.
+    """
+
+    def __init__(self, text, offsets):
+        self.text = text
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return bytes(self.text[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def _string_columns(columns, name, strings):
+    """
+    Add the two columns for a list of strings.
+
+    :param columns: The columns, which we add to
+    :type columns: dict
+    :param name: The name of the column
+    :type name: str
+    :param strings: The strings
+    :type strings: list of str
+    """
+    text = array('B')
+    offsets = array('q', [0])
+    for s in strings:
+        text.frombytes(s.encode('utf-8'))
+        offsets.append(len(text))
+    columns[name] = text
+    columns[name + "_offsets"] = offsets
+
+
+def _csr_columns(columns, name, rows):
+    """
+    Add the indptr and indices columns for a sparse matrix of ones (e.g. the enzymes of each reaction).
+
+    :param columns: The columns, which we add to
+    :type columns: dict
+    :param name: The name of the matrix
+    :type name: str
+    :param rows: The column numbers in each row
+    :type rows: list of list of int
+    """
+    indptr = array('q', [0])
+    indices = array('i')
+    for row in rows:
+        indices.extend(row)
+        indptr.append(len(indices))
+    columns[name + "_indptr"] = indptr
+    columns[name + "_indices"] = indices
+
+
+def _compile(compounds, reactions, enzymes=None):
+    """
+    Compile the compounds, reactions, and enzymes into columns.
+
+    :return: The columns, and the manifest
+    :rtype: (dict of str and array, dict)
+    """
+    columns = {}
+    rids = list(reactions.keys())
+    rnumber = {r: i for i, r in enumerate(rids)}
+    ckeys = list(compounds.keys())
+    cpds = [compounds[k] for k in ckeys]
+    cnumber = {k: i for i, k in enumerate(ckeys)}
+    # every compound in the reactions should be in the compounds, but if one is not we add it
+    for r in rids:
+        for c in reactions[r].all_compounds():
+            if str(c) not in cnumber:
+                cnumber[str(c)] = len(ckeys)
+                ckeys.append(str(c))
+                cpds.append(c)
+
+    def text(value):
+        return "" if value is None else str(value)
+
+    def bound(value):
+        return float('nan') if value is None else float(value)
+
+    _string_columns(columns, "compound_name", [c.name for c in cpds])
+    _string_columns(columns, "compound_location", [c.location for c in cpds])
+    _string_columns(columns, "compound_id", [text(c.model_seed_id) for c in cpds])
+    _string_columns(columns, "compound_abbreviation", [text(c.abbreviation) for c in cpds])
+    _string_columns(columns, "compound_formula", [text(c.formula) for c in cpds])
+    _string_columns(columns, "compound_mw", [text(c.mw) if c.mw else "" for c in cpds])
+    _string_columns(columns, "compound_alternate_ids", [";".join(sorted(c.alternate_seed_ids)) for c in cpds])
+    _csr_columns(columns, "compound_reactions", [sorted(rnumber[r] for r in c.reactions if r in rnumber)
+                                                 for c in cpds])
+
+    rxns = [reactions[r] for r in rids]
+    _string_columns(columns, "reaction_id", rids)
+    _string_columns(columns, "reaction_equation", [text(r.equation) for r in rxns])
+    columns["reaction_direction"] = array('B', [ord(r.direction) if r.direction else 0 for r in rxns])
+    columns["reaction_deltag"] = array('d', [float(r.deltaG) for r in rxns])
+    columns["reaction_deltag_error"] = array('d', [float(r.deltaG_error) for r in rxns])
+    columns["reaction_is_transport"] = array('B', [1 if r.is_transport else 0 for r in rxns])
+    columns["reaction_is_uptake_secretion"] = array('B', [1 if r.is_uptake_secretion else 0 for r in rxns])
+    columns["reaction_lower_bound"] = array('d', [bound(r.lower_bound) for r in rxns])
+    columns["reaction_upper_bound"] = array('d', [bound(r.upper_bound) for r in rxns])
+
+    indptr = array('q', [0])
+    split = array('q')
+    indices = array('i')
+    data = array('d')
+    for r in rxns:
+        for c in r.left_compounds:
+            indices.append(cnumber[str(c)])
+            data.append(-float(r.get_left_compound_abundance(c)))
+        split.append(len(indices))
+        for c in r.right_compounds:
+            indices.append(cnumber[str(c)])
+            data.append(float(r.get_right_compound_abundance(c)))
+        indptr.append(len(indices))
+    columns["stoichiometry_indptr"] = indptr
+    columns["stoichiometry_split"] = split
+    columns["stoichiometry_indices"] = indices
+    columns["stoichiometry_data"] = data
+
+    enames = list(enzymes.keys()) if enzymes else []
+    enumber = {e: i for i, e in enumerate(enames)}
+    _string_columns(columns, "enzyme_name", enames)
+    _csr_columns(columns, "reaction_enzymes", [sorted(enumber[e] for e in r.enzymes if e in enumber) for r in rxns])
+    rolenames = sorted({role for e in enames for role in enzymes[e].roles})
+    rolenumber = {role: i for i, role in enumerate(rolenames)}
+    _string_columns(columns, "role_name", rolenames)
+    _csr_columns(columns, "enzyme_roles", [sorted(rolenumber[role] for role in enzymes[e].roles) for e in enames])
+
+    manifest = {'format': FORMAT_VERSION, 'compounds': len(ckeys), 'reactions': len(rids), 'enzymes': len(enames)}
+    return columns, manifest
+
+
+def compile_biochemistry(directory, compounds, reactions, enzymes=None, sources=None):
+    """
+    Compile the compounds, reactions, and enzymes into a directory of columns that BiochemistryStore can read. The
+    directory is made if it does not exist.
+
+    :param directory: The directory to write
+    :type directory: str
+    :param compounds: The compounds dict, e.g. from PyFBA.parse.model_seed.compounds_reactions_enzymes
+    :type compounds: dict
+    :param reactions: The reactions dict
+    :type reactions: dict
+    :param enzymes: The enzymes dict
+    :type enzymes: dict
+    :param sources: The files that the biochemistry was parsed from, so that we can tell when the store is out of date
+    :type sources: list of str
+    """
+    os.makedirs(directory, exist_ok=True)
+    columns, manifest = _compile(compounds, reactions, enzymes)
+    for name, values in columns.items():
+        _write_npy(os.path.join(directory, name + ".npy"), values)
+
+    # the manifest is written last, so a store without one is incomplete
+    manifest['sources'] = _signature(sources) if sources else []
+    with open(os.path.join(directory, _MANIFEST), 'w') as out:
+        json.dump(manifest, out)
+
+
+class BiochemistryStore:
+    """
+    A compiled biochemistry, memory mapped from a directory written by compile_biochemistry.
+
+    The compounds and reactions properties behave like the compounds and reactions dicts from
+    PyFBA.parse.model_seed.compounds_reactions_enzymes, but each Compound and Reaction is only made the first time
+    that you ask for it.
+
+    :ivar directory: The directory of the store
+    :type directory: str
+    :ivar manifest: The counts and source files of the store
+    :type manifest: dict
+    """
+
+    def __init__(self, directory):
+        """
+        Open a store.
+
+        :param directory: The directory written by compile_biochemistry
+        :type directory: str
+        """
+        self.directory = directory
+        with open(os.path.join(directory, _MANIFEST), 'r') as f:
+            manifest = json.load(f)
+        self._open(manifest, lambda name: _read_npy(os.path.join(directory, name + ".npy")))
+
+    @classmethod
+    def from_buffers(cls, manifest, buffers):
+        """
+        Open a store from the bytes of each of its .npy files, e.g. in shared memory (see SharedBiochemistry). The
+        buffers are used directly, not copied.
+
+        :param manifest: The manifest of the store
+        :type manifest: dict
+        :param buffers: The bytes of the .npy file for each column
+        :type buffers: dict of str and memoryview
+        :rtype: BiochemistryStore
+        """
+        store = cls.__new__(cls)
+        store.directory = None
+        store._open(manifest, lambda name: _npy_values(buffers[name], name))
+        return store
+
+    def _open(self, manifest, read):
+        """
+        Read the columns.
+
+        :param manifest: The manifest of the store
+        :type manifest: dict
+        :param read: A function that gets the values of a column from its name
+        :type read: function
+        """
+        self.manifest = manifest
+        if manifest.get('format') != FORMAT_VERSION:
+            raise ValueError("This is version {} of the compiled biochemistry, not {}".format(
+                manifest.get('format'), FORMAT_VERSION))
+
+        for name in ['compound_reactions_indptr', 'compound_reactions_indices', 'reaction_direction',
+                     'reaction_deltag', 'reaction_deltag_error', 'reaction_is_transport',
+                     'reaction_is_uptake_secretion', 'reaction_lower_bound', 'reaction_upper_bound',
+                     'stoichiometry_indptr', 'stoichiometry_split', 'stoichiometry_indices', 'stoichiometry_data',
+                     'reaction_enzymes_indptr', 'reaction_enzymes_indices', 'enzyme_roles_indptr',
+                     'enzyme_roles_indices']:
+            setattr(self, name, read(name))
+        for name in _STRING_COLUMNS:
+            setattr(self, name, Strings(read(name), read(name + "_offsets")))
+
+        self._reaction_numbers = None
+        self._compound_numbers = None
+        self._reactions = {}
+        self._compounds = {}
+        self.reactions = _LazyDict(self, self.reaction_id, self.reaction_number, self.reaction)
+        self.compounds = _LazyDict(self, _CompoundKeys(self), self.compound_number, self.compound)
+
+    def reaction_number(self, rid):
+        """
+        The row of a reaction in the store.
+
+        :param rid: The reaction id
+        :type rid: str
+        :return: The row, or None if the reaction is not in the store
+        :rtype: int
+        """
+        if self._reaction_numbers is None:
+            self._reaction_numbers = {r: i for i, r in enumerate(self.reaction_id)}
+        return self._reaction_numbers.get(rid)
+
+    def compound_number(self, key):
+        """
+        The row of a compound in the store.
+
+        :param key: The str() of the compound, i.e. the key in the compounds dict
+        :type key: str
+        :return: The row, or None if the compound is not in the store
+        :rtype: int
+        """
+        if self._compound_numbers is None:
+            self._compound_numbers = {k: i for i, k in enumerate(_CompoundKeys(self))}
+        return self._compound_numbers.get(key)
+
+    def compound(self, i):
+        """
+        Get a compound, making it the first time we are asked for it.
+
+        :param i: The row of the compound
+        :type i: int
+        :rtype: PyFBA.metabolism.Compound
+        """
+        if i in self._compounds:
+            return self._compounds[i]
+        c = PyFBA.metabolism.Compound(self.compound_name[i], self.compound_location[i])
+        c.model_seed_id = self.compound_id[i]
+        c.abbreviation = self.compound_abbreviation[i] or None
+        c.formula = self.compound_formula[i] or None
+        c.mw = self.compound_mw[i] or 0
+        alternates = self.compound_alternate_ids[i]
+        if alternates:
+            c.alternate_seed_ids = set(alternates.split(";"))
+        c.reactions = {self.reaction_id[r] for r in self.compound_reactions_indices[
+            self.compound_reactions_indptr[i]:self.compound_reactions_indptr[i + 1]]}
+        self._compounds[i] = c
+        return c
+
+    def reaction(self, i):
+        """
+        Get a reaction, making it the first time we are asked for it.
+
+        :param i: The row of the reaction
+        :type i: int
+        :rtype: PyFBA.metabolism.Reaction
+        """
+        if i in self._reactions:
+            return self._reactions[i]
+        r = PyFBA.metabolism.Reaction(self.reaction_id[i])
+        r.equation = self.reaction_equation[i] or None
+        r.direction = chr(self.reaction_direction[i]) if self.reaction_direction[i] else None
+        r.deltaG = self.reaction_deltag[i]
+        r.deltaG_error = self.reaction_deltag_error[i]
+        r.is_transport = self.reaction_is_transport[i] == 1
+        r.is_uptake_secretion = self.reaction_is_uptake_secretion[i] == 1
+        # nan is the only value that is not equal to itself, and we use it for None
+        if self.reaction_lower_bound[i] == self.reaction_lower_bound[i]:
+            r.lower_bound = self.reaction_lower_bound[i]
+        if self.reaction_upper_bound[i] == self.reaction_upper_bound[i]:
+            r.upper_bound = self.reaction_upper_bound[i]
+        start, split, end = self.stoichiometry_indptr[i], self.stoichiometry_split[i], self.stoichiometry_indptr[i + 1]
+        for j in range(start, end):
+            c = self.compound(self.stoichiometry_indices[j])
+            if j < split:
+                r.add_left_compounds({c})
+                r.set_left_compound_abundance(c, -self.stoichiometry_data[j])
+            else:
+                r.add_right_compounds({c})
+                r.set_right_compound_abundance(c, self.stoichiometry_data[j])
+        r.enzymes = {self.enzyme_name[e] for e in self.reaction_enzymes_indices[
+            self.reaction_enzymes_indptr[i]:self.reaction_enzymes_indptr[i + 1]]}
+        self._reactions[i] = r
+        return r
+
+    def reaction_numbers(self, rids):
+        """
+        The rows of some reactions, e.g. to send to another process that has the same store.
+
+        :param rids: The reaction ids
+        :type rids: iterable of str
+        :return: The rows of the reactions that are in the store
+        :rtype: array
+        """
+        numbers = array('i')
+        for r in rids:
+            i = self.reaction_number(r)
+            if i is not None:
+                numbers.append(i)
+        return numbers
+
+    def reaction_ids(self, numbers):
+        """
+        The reaction ids for some rows.
+
+        :param numbers: The rows
+        :type numbers: iterable of int
+        :rtype: set of str
+        """
+        return {self.reaction_id[i] for i in numbers}
+
+    def roles(self, rid):
+        """
+        The roles of the enzymes that catalyze a reaction.
+
+        :param rid: The reaction id
+        :type rid: str
+        :rtype: set of str
+        """
+        i = self.reaction_number(rid)
+        if i is None:
+            return set()
+        found = set()
+        for e in self.reaction_enzymes_indices[self.reaction_enzymes_indptr[i]:self.reaction_enzymes_indptr[i + 1]]:
+            found.update(self.role_name[role] for role in self.enzyme_roles_indices[
+                self.enzyme_roles_indptr[e]:self.enzyme_roles_indptr[e + 1]])
+        return found
+
+
+class _CompoundKeys:
+    """
+    The str() of each compound in a store, without making the compounds
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store.compound_name)
+
+    def __getitem__(self, i):
+        return self.store.compound_name[i] + " (location: " + self.store.compound_location[i] + ")"
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class _LazyDict(Mapping):
+    """
+    A read only dict of the compounds or reactions in a store that makes each one the first time it is used
+    """
+
+    def __init__(self, store, keys, number, make):
+        self.store = store
+        self._keys = keys
+        self._number = number
+        self._make = make
+
+    def __getitem__(self, key):
+        i = self._number(key)
+        if i is None:
+            raise KeyError(key)
+        return self._make(i)
+
+    def __contains__(self, key):
+        return self._number(key) is not None
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def _store_is_current(directory, sources):
+    """
+    Is there a complete store in directory that was made from these files as they are now?
+    """
+    try:
+        with open(os.path.join(directory, _MANIFEST), 'r') as f:
+            manifest = json.load(f)
+        return manifest.get('format') == FORMAT_VERSION and manifest.get('sources') == \
+            [list(s) for s in _signature(sources)]
+    except (OSError, ValueError):
+        return False
+
+
+def biochemistry_store(organism_type='', verbose=False):
+    """
+    Get the compiled ModelSEED biochemistry. The first time we compile it into the cache directory (see
+    PyFBA.parse.cache), and after that (in this and any other process) we just open it, until the ModelSEED files
+    change.
+
+    :param organism_type: The type of organism, eg. Microbial, Gram_positive, Gram_negative
+    :type organism_type: str
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: The store
+    :rtype: BiochemistryStore
+    """
+    directory = PyFBA.parse.model_seed.modelseed_dir()
+    sources = [os.path.join(directory, f) for f in ['Biochemistry/compounds.master.tsv',
+                                                    'Biochemistry/reactions.master.tsv',
+                                                    'SOLRDump/ComplexRoles.tsv', 'SOLRDump/TemplateReactions.tsv']]
+    cache = cache_dir()
+    if cache is None:
+        raise IOError("We need a cache directory to compile the biochemistry. Please set PYFBA_CACHE_DIR")
+    path = os.path.join(cache, "biochemistry-v{}-{}".format(FORMAT_VERSION, organism_type.lower() or 'all'))
+    if _store_is_current(path, sources):
+        return BiochemistryStore(path)
+
+    if verbose:
+        sys.stderr.write("Compiling the biochemistry into {}\n".format(path))
+    cpds, rcts, enzs = PyFBA.parse.model_seed.compounds_reactions_enzymes(organism_type, verbose=verbose)
+    # compile into a new directory and then move it, so other processes never see part of a store
+    tmp = tempfile.mkdtemp(dir=cache, suffix='.tmp')
+    compile_biochemistry(tmp, cpds, rcts, enzs, sources)
+    old = None
+    if os.path.exists(path):
+        old = tempfile.mkdtemp(dir=cache, suffix='.old')
+        os.replace(path, os.path.join(old, 'store'))
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        # another process got there first
+        shutil.rmtree(tmp, ignore_errors=True)
+    if old:
+        # processes that still have the old store open keep their memory maps
+        shutil.rmtree(old, ignore_errors=True)
+    return BiochemistryStore(path)
+
+
+class SharedBiochemistry:
+    """
+    The compiled biochemistry in one block of shared memory, so that worker processes can use it without a copy.
+
+    Make one of these in the main process and pass its handle (which is small) to each worker, e.g. in the
+    initializer of a multiprocessing.Pool. The workers call attach_biochemistry(handle) to get a BiochemistryStore
+    that reads the shared memory directly, and you can send them the rows of the reactions to run (see
+    BiochemistryStore.reaction_numbers) instead of the reactions.
+
+    The shared memory is removed when you call close (or at the end of a with block).
+
+    :ivar handle: What a worker needs to attach to the shared memory
+    :type handle: tuple
+    :ivar store: The store in the shared memory, for this process
+    :type store: BiochemistryStore
+    """
+
+    def __init__(self, compounds, reactions, enzymes=None, reaction_ids=None):
+        """
+        Compile the biochemistry into shared memory.
+
+        :param compounds: The compounds dict
+        :type compounds: dict
+        :param reactions: The reactions dict
+        :type reactions: dict
+        :param enzymes: The enzymes dict
+        :type enzymes: dict
+        :param reaction_ids: Only share these reactions (and their compounds), e.g. the ones the workers will run.
+            The default is all of them
+        :type reaction_ids: iterable of str
+        """
+        if reaction_ids is not None:
+            reactions = {r: reactions[r] for r in reaction_ids}
+            compounds = {str(c): compounds.get(str(c), c) for r in reactions for c in reactions[r].all_compounds()}
+        columns, manifest = _compile(compounds, reactions, enzymes)
+
+        layout = {}
+        size = 0
+        for name, values in columns.items():
+            length = len(_npy_header(values)) + len(values) * values.itemsize
+            layout[name] = (size, length)
+            # start each column on a multiple of 64, like the data in a .npy file
+            size += length + (-length % 64)
+
+        from multiprocessing import shared_memory
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for name, values in columns.items():
+            offset, length = layout[name]
+            self._shm.buf[offset:offset + length] = _npy_header(values) + _little_endian(values).tobytes()
+
+        self.handle = (self._shm.name, manifest, layout)
+        self.store = BiochemistryStore.from_buffers(manifest, _buffers(self._shm, layout))
+
+    def close(self):
+        """
+        Remove the shared memory. Processes that are still attached keep their copy until they finish.
+        """
+        if self._shm is None:
+            return
+        _release(self.store)
+        self.store = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _release(store):
+    """
+    Release the columns of a store in shared memory. They are views of the shared memory, and we can't close it while
+    they exist.
+    """
+    for value in list(vars(store).values()):
+        if isinstance(value, Strings):
+            value.text.release()
+            value.offsets.release()
+        elif isinstance(value, memoryview):
+            value.release()
+
+
+def _detach_all():
+    """
+    Close the shared memory that this process attached to, when it exits
+    """
+    for shm, store in _attached.values():
+        _release(store)
+        shm.close()
+    _attached.clear()
+
+
+def _buffers(shm, layout):
+    """
+    The bytes of each column in a block of shared memory
+    """
+    return {name: shm.buf[offset:offset + length] for name, (offset, length) in layout.items()}
+
+
+def attach_biochemistry(handle):
+    """
+    Get the biochemistry that another process shared with SharedBiochemistry. We only attach once in each process.
+
+    :param handle: The handle of the SharedBiochemistry
+    :type handle: tuple
+    :return: The store in the shared memory
+    :rtype: BiochemistryStore
+    """
+    from multiprocessing import shared_memory
+    name, manifest, layout = handle
+    if name not in _attached:
+        try:
+            # the process that made the shared memory removes it, not us
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        if not _attached:
+            atexit.register(_detach_all)
+        _attached[name] = (shm, BiochemistryStore.from_buffers(manifest, _buffers(shm, layout)))
+    return _attached[name][1]
@@ -0,0 +1,235 @@
+"""
+A library of media that we only read once.
+
+read_media_file reads and parses the media file every time it is called, and makes new Compound objects each time.
+During gap-filling, and when we screen many media, we ask for the same few media over and over again. The MediaLibrary
+reads each media file the first time we ask for it (or all of the media in a directory at once), keeps the result, and
+only reads the file again if it changes.
+
+Each medium is a Medium: a frozenset of the compounds, so it can be used anywhere we use a set of media compounds, with
+a fingerprint (a hash of the compounds in the media, that is the same in every session and for every file with the
+same compounds) and a bitset of the compounds (bit i is set if the compound with interned integer i is in the media,
+see PyFBA.metabolism.interning).
+"""
+
+import hashlib
+import os
+import threading
+
+import PyFBA
+from .read_media import find_media_file, _read_media
+
+_libraries = {}
+_lock = threading.Lock()
+
+# the extensions of the files that we read from a media directory
+MEDIA_EXTENSIONS = ('.txt', '.tsv')
+
+
+class Medium(frozenset):
+    """
+    The compounds in a medium. This is a frozenset of PyFBA.metabolism.Compound.
+
+    :ivar name: The name of the medium (the name of the file without the extension)
+    :type name: str
+    :ivar fingerprint: A hash of the compounds in the medium
+    :type fingerprint: str
+    :ivar bits: The compounds in the medium as a bitset over the interned compound integers
+    :type bits: int
+    """
+
+    def __new__(cls, compounds=(), name=None):
+        return super(Medium, cls).__new__(cls, compounds)
+
+    def __init__(self, compounds=(), name=None):
+        """
+        Create a new medium.
+
+        :param compounds: The compounds in the medium
+        :type compounds: iterable of PyFBA.metabolism.Compound
+        :param name: The name of the medium
+        :type name: str
+        """
+        super(Medium, self).__init__()
+        self.name = name
+        self.fingerprint = media_fingerprint(self)
+        self.bits = media_bits(self)
+
+    def __reduce__(self):
+        return self.__class__, (list(self), self.name)
+
+    def __repr__(self):
+        return "Medium({!r}, {} compounds)".format(self.name, len(self))
+
+
+def media_fingerprint(media):
+    """
+    A hash of the compounds in the media. Two media with the same compounds have the same fingerprint, in this session
+    and in every other one, so it can be used as part of the key for a cache of results.
+
+    :param media: The media compounds
+    :type media: set of PyFBA.metabolism.Compound
+    :return: The fingerprint as a hex string
+    :rtype: str
+    """
+    fingerprint = getattr(media, 'fingerprint', None)
+    if fingerprint is not None:
+        return fingerprint
+    h = hashlib.sha1()
+    for c in sorted(str(c) for c in media):
+        h.update(c.encode('utf-8'))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def media_bits(media):
+    """
+    The compounds in the media as a bitset over the interned compound integers.
+
+    :param media: The media compounds
+    :type media: set of PyFBA.metabolism.Compound
+    :return: The bitset
+    :rtype: int
+    """
+    bits = getattr(media, 'bits', None)
+    if bits is not None:
+        return bits
+    bits = 0
+    for c in media:
+        bits |= 1 << PyFBA.metabolism.compound_index(c)
+    return bits
+
+
+class MediaLibrary:
+    """
+    The media that we have read. The media are read the first time we ask for them and kept, and the file is only read
+    again if it changes.
+
+    :ivar directories: The directories that we look in for media
+    :type directories: list of str
+    """
+
+    def __init__(self, directories=None):
+        """
+        Create a new library.
+
+        :param directories: The directories with media files. The default is the directory in the PYFBA_MEDIA_DIR
+            environment variable, if it is set
+        :type directories: list of str
+        """
+        if directories is None:
+            directories = [os.environ['PYFBA_MEDIA_DIR']] if 'PYFBA_MEDIA_DIR' in os.environ else []
+        elif isinstance(directories, str):
+            directories = [directories]
+        self.directories = [os.path.abspath(d) for d in directories]
+        # the compounds that we have made, so that every medium shares the same Compound objects
+        self._compounds = {}
+        # the media we have read: absolute path -> ((size, mtime), Medium)
+        self._media = {}
+        self._lock = threading.Lock()
+
+    def _compound(self, name, location):
+        """
+        Get the compound with this name and location, making it the first time we see it.
+
+        :rtype: PyFBA.metabolism.Compound
+        """
+        key = (name, location)
+        if key not in self._compounds:
+            self._compounds[key] = PyFBA.metabolism.Compound(name, location)
+        return self._compounds[key]
+
+    def _path(self, media):
+        """
+        Find a media file. media can be a path to a file, a file name in one of our directories, or the name of a
+        media without the extension.
+
+        :raises IOError: if we can not find the media
+        :rtype: str
+        """
+        if os.path.exists(media):
+            return os.path.abspath(media)
+        for directory in self.directories:
+            for extension in ('',) + MEDIA_EXTENSIONS:
+                filename = os.path.join(directory, media + extension)
+                if os.path.isfile(filename):
+                    return filename
+        return os.path.abspath(find_media_file(media))
+
+    def medium(self, media):
+        """
+        Get a medium.
+
+        :param media: The path to the media file, the name of the file in one of our directories, or the name of the
+            media without the extension
+        :type media: str
+        :return: The medium
+        :rtype: Medium
+        :raises IOError: if we can not find the media
+        """
+        filename = self._path(media)
+        st = os.stat(filename)
+        signature = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if filename in self._media and self._media[filename][0] == signature:
+                return self._media[filename][1]
+            name = os.path.splitext(os.path.basename(filename))[0]
+            medium = Medium([self._compound(n, loc) for n, loc in _read_media(filename)], name)
+            self._media[filename] = (signature, medium)
+            return medium
+
+    def names(self):
+        """
+        The names of all the media in our directories.
+
+        :rtype: list of str
+        """
+        names = set()
+        for directory in self.directories:
+            if not os.path.isdir(directory):
+                continue
+            for f in os.listdir(directory):
+                name, extension = os.path.splitext(f)
+                if extension in MEDIA_EXTENSIONS and os.path.isfile(os.path.join(directory, f)):
+                    names.add(name)
+        return sorted(names)
+
+    def load(self):
+        """
+        Read all the media in our directories.
+
+        :return: The media, by name
+        :rtype: dict of str and Medium
+        """
+        return {name: self.medium(name) for name in self.names()}
+
+    def __getitem__(self, media):
+        return self.medium(media)
+
+    def __contains__(self, media):
+        try:
+            self._path(media)
+        except IOError:
+            return False
+        return True
+
+
+def media_library(directories=None):
+    """
+    Get the media library for some directories. We only make one library for each set of directories, so everyone
+    shares the media that have been read.
+
+    :param directories: The directories with media files. The default is the directory in the PYFBA_MEDIA_DIR
+        environment variable, if it is set
+    :type directories: list of str
+    :rtype: MediaLibrary
+    """
+    if directories is None:
+        directories = [os.environ['PYFBA_MEDIA_DIR']] if 'PYFBA_MEDIA_DIR' in os.environ else []
+    elif isinstance(directories, str):
+        directories = [directories]
+    key = tuple(os.path.abspath(d) for d in directories)
+    with _lock:
+        if key not in _libraries:
+            _libraries[key] = MediaLibrary(list(key))
+        return _libraries[key]
@@ -11,6 +11,8 @@ used in the reactions file!).
 """
 
 import copy
+import gc
+import multiprocessing
 import os
 import re
 import sys
@@ -18,24 +20,31 @@ import io
 
 import PyFBA
 
-MODELSEED_DIR = ""
-if 'ModelSEEDDatabase' in os.environ:
-        MODELSEED_DIR = os.environ['ModelSEEDDatabase']
-else:
-    sys.stderr.write("Please ensure that you install the Model SEED Database somewhere, and set the environment " +
-                     "variable ModelSEEDDatabase to point to that directory.\n" +
-                     " See INSTALLATION.md for more information\n")
-    sys.exit(-1)
+def modelseed_dir():
+    """
+    The directory with the ModelSEED database, from the ModelSEEDDatabase environment variable. We only look for this
+    when we need it, so you can import PyFBA without the database.
+
+    :return: The path to the ModelSEED database
+    :rtype: str
+    """
+    if not os.environ.get('ModelSEEDDatabase', ''):
+        raise IOError("The ModelSEEDDatabase environment variable is not set. Please ensure that you install the Model "
+                      "SEED Database somewhere, and set the environment variable ModelSEEDDatabase to point to that "
+                      "directory. See INSTALLATION.md for more information")
+    directory = os.environ['ModelSEEDDatabase']
+    if not os.path.exists(directory):
+        raise IOError("The MODEL SEED directory: {} does not exist. Please check your installation.".format(directory))
+    return directory
 
-if not MODELSEED_DIR:
-    sys.stderr.write("The ModelSEEDDatabase environment variable is not set.\n")
-    sys.stderr.write("Please install the ModelSEEDDatabase, set the variable, and try again")
-    sys.exit(-1)
 
-if not os.path.exists(MODELSEED_DIR):
-    sys.stderr.write("The MODEL SEED directory: {} does not exist.\n".format(MODELSEED_DIR))
-    sys.stderr.write("Please check your installation.\n")
-    sys.exit(-1)
+def __getattr__(name):
+    """
+    MODELSEED_DIR used to be set when we imported this module, so we still answer to it
+    """
+    if name == 'MODELSEED_DIR':
+        return modelseed_dir()
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
 
 
 def template_reactions(modeltype='microbial'):
@@ -61,12 +70,13 @@ def template_reactions(modeltype='microbial'):
     else:
         raise NotImplementedError("Parsing data for " + inputfile + " has not been implemented!")
 
-    if not os.path.exists(os.path.join(MODELSEED_DIR, inputfile)):
-        raise IOError(os.path.join(MODELSEED_DIR, inputfile) +
-                      " was not found. Please check your model SEED directory (" + MODELSEED_DIR + ")")
+    directory = modelseed_dir()
+    if not os.path.exists(os.path.join(directory, inputfile)):
+        raise IOError(os.path.join(directory, inputfile) +
+                      " was not found. Please check your model SEED directory (" + directory + ")")
 
     new_enz = {}
-    with open(os.path.join(MODELSEED_DIR, inputfile), 'r') as f:
+    with open(os.path.join(directory, inputfile), 'r') as f:
         for l in f:
             if l.startswith('id'):
                 continue
@@ -85,7 +95,7 @@ def compounds(compounds_file=None):
     seed database to avoid ambiguities.
 
     Optionally, you can provide a compounds file. If not, the default
-    in MODELSEED_DIR/Biochemistry/compounds.master.tsv will be used.
+    in the ModelSEEDDatabase directory/Biochemistry/compounds.master.tsv will be used.
 
     :param compounds_file: An optional filename of a compounds file to parse
     :type compounds_file: str
@@ -97,7 +107,7 @@ def compounds(compounds_file=None):
     cpds = {}
 
     if not compounds_file:
-        compounds_file = os.path.join(MODELSEED_DIR, 'Biochemistry/compounds.master.tsv')
+        compounds_file = os.path.join(modelseed_dir(), 'Biochemistry/compounds.master.tsv')
 
     try:
         with open(compounds_file, 'r') as f:
@@ -141,7 +151,7 @@ def location():
     return all_locations
 
 
-def reactions(organism_type="", rctf='Biochemistry/reactions.master.tsv', verbose=False):
+def reactions(organism_type="", rctf='Biochemistry/reactions.master.tsv', verbose=False, processes=None):
     """
     Parse the reaction information in Biochemistry/reactions.master.tsv
 
@@ -154,12 +164,19 @@ def reactions(organism_type="", rctf='Biochemistry/reactions.master.tsv', verbos
     You can supply an alternative reactions file (rctf) if you
     don't like the default.
 
+    Large files are split into byte ranges that are parsed by
+    several processes, and then we make the reactions and compounds
+    in the order they are in the file, so the result is the same.
+
     :param organism_type: The type of organism, eg. microbial, gram_negative, gram_positive
     :type organism_type: str
     :param rctf: The optional reaction file to provide
     :type rctf: str
     :param verbose: Print more output
     :type verbose: bool
+    :param processes: The number of processes to parse the file with. The default is one for each cpu if the file is
+        large, and otherwise one
+    :type processes: int
     :return: Two components, a dict of the reactions and a dict of all the compounds used in the reactions.
     :rtype: dict, dict
 
@@ -176,165 +193,23 @@ def reactions(organism_type="", rctf='Biochemistry/reactions.master.tsv', verbos
 
     all_reactions = {}
 
+    # we make hundreds of thousands of objects and none of them are garbage, so the garbage collector would just
+    # keep looking through all of them while we parse
+    directory = modelseed_dir()
+    collecting = gc.isenabled()
+    gc.disable()
     try:
-        with open(os.path.join(MODELSEED_DIR, rctf), 'r') as rxnf:
-            for l in rxnf:
-                if l.startswith('id'):
-                    # ignore the header line
-                    continue
-                if l.startswith("#"):
-                    # ignore any comment lines
-                    continue
-
-                pieces = l.strip().split("\t")
-                if len(pieces) < 20:
-                    sys.stderr.write("ERROR PARSING REACTION INFO: " + l)
-                    continue
-                if pieces[18] == True or "MI:" in pieces[17]:
-                    # skip any reactions that are obsolete or any reactions that
-                    # are invalid due to mass imbalance, charge imbalance, or
-                    # invalid compound format
-                    continue
-                        
-                rid = pieces[0]
-
-                rxn = pieces[6]
-                for i in range(len(pieces)):
-                    if pieces[i] == "none" or pieces[i] == "null":
-                        pieces[i] = None
-
-                if pieces[14]:
-                    deltaG = float(pieces[14])
-                else:
-                    deltaG = 0.0
-                if pieces[15]:
-                    deltaG_error = float(pieces[15])
-                else:
-                    deltaG_error = 0.0
-
-                # we need to split the reaction, but different reactions
-                # have different splits!
-
-                separator = ""
-                for separator in [" <=> ", " => ", " <= ", " = ", " < ", " > ", "Not found"]:
-                    if separator in rxn:
-                        break
-                if separator == "Not found":
-                    if verbose:
-                        sys.stderr.write("WARNING: Could not find a seperator in " + rxn +
-                                         ". This reaction was skipped. Please check it\n")
-                    continue
-
-                left, right = rxn.split(separator)
-
-                # check and see we have a valid equation
-                left = left.strip()
-                right = right.strip()
-                if False:
-                    if left == "" or right == "":
-                        if verbose:
-                            sys.stderr.write("One side missing for " + rxn + " ignored\n")
-                        continue
-
-                # create a new reaction object to hold all the information ...
-
-                r = PyFBA.metabolism.Reaction(rid)
-
-                r.deltaG = deltaG
-                r.deltaG_error = deltaG_error
-                if pieces[5] != '0':
-                    r.is_transport = True
-                all_reactions[rid] = r
-
-                r.direction = pieces[9]
-
-                # we have to rewrite the equation to accomodate
-                # the proper locations
-                newleft = []
-                newright = []
-
-                # deal with the compounds on the left side of the equation
-                m = re.findall('\(([\d\.e-]+)\)\s+(.*?)\[(\d+)\]', left)
-                if m == [] and verbose:
-                    sys.stderr.write("ERROR: Could not parse the compounds" + " on the left side of the reaction " +
-                                     rid + ": " + rxn + "\n")
-
-                for p in m:
-                    (q, cmpd, locval) = p
-
-                    if locval in locations:
-                        loc = locations[locval]
-                    else:
-                        if verbose:
-                            sys.stderr.write("WARNING: Could not get a location " + " for " + locval + "\n")
-                        loc = locval
-
-                    # we first look up to see whether we have the compound
-                    # and then we need to create a new compound with the
-                    # appropriate location
-
-                    if cmpd in cpds_by_id:
-                        nc = PyFBA.metabolism.Compound(cpds_by_id[cmpd].name, loc)
-                    else:
-                        if verbose:
-                            sys.stderr.write("ERROR: Did not find " + cmpd + " in the compounds file.\n")
-                        nc = PyFBA.metabolism.Compound(cmpd, loc)
-
-                    ncstr = str(nc)
-
-                    if ncstr in cpds:
-                        nc = copy.copy(cpds[ncstr])
-                    nc.add_reactions({rid})
-                    cpds[ncstr] = nc
-
-                    r.add_left_compounds({nc})
-                    r.set_left_compound_abundance(nc, float(q))
-
-                    newleft.append("(" + str(q) + ") " + nc.name + "[" + loc + "]")
-
-                # deal with the right side of the equation
-                m = re.findall('\(([\d\.e-]+)\)\s+(.*?)\[(\d+)\]', right)
-                if m == [] and verbose:
-                        sys.stderr.write("ERROR: Could not parse the compounds on the right side of the reaction " +
-                                         rid + ": " + rxn + " >>" + right + "<<\n")
-
-                for p in m:
-                    (q, cmpd, locval) = p
-
-                    if locval in locations:
-                        loc = locations[locval]
-                    else:
-                        if verbose:
-                            sys.stderr.write("WARNING: Could not get a location " + " for " + locval + "\n")
-                        loc = locval
-
-                    # we first look up to see whether we have the compound
-                    # and then we need to create a new compound with the
-                    # appropriate location
-
-                    if cmpd in cpds_by_id:
-                        nc = PyFBA.metabolism.Compound(cpds_by_id[cmpd].name, loc)
-                    else:
-                        if verbose:
-                            sys.stderr.write("ERROR: Did not find " + cmpd + " in the compounds file.\n")
-                        nc = PyFBA.metabolism.Compound(cmpd, loc)
-
-                    ncstr = str(nc)
-                    if ncstr in cpds:
-                        nc = copy.copy(cpds[ncstr])
-                    nc.add_reactions({rid})
-                    cpds[ncstr] = nc
-
-                    r.add_right_compounds({nc})
-                    r.set_right_compound_abundance(nc, float(q))
-
-                    newright.append("(" + str(q) + ") " + nc.name + "[" + loc + "]")
-
-                r.equation = " + ".join(newleft) + " <=> " + " + ".join(newright)
-
-                all_reactions[rid] = r
+        for records, messages in _parse_reactions_file(os.path.join(directory, rctf), processes, verbose):
+            for always, message in messages:
+                if always or verbose:
+                    sys.stderr.write(message)
+            for record in records:
+                _add_reaction(record, all_reactions, cpds, cpds_by_id, locations, verbose)
     except IOError as e:
         sys.exit("There was an error parsing " + rctf + "\n" + "I/O error({0}): {1}".format(e.errno, e.strerror))
+    finally:
+        if collecting:
+            gc.enable()
 
     # finally, if we need to adjust the organism type based on Template reactions, we shall
     if organism_type:
@@ -347,6 +222,234 @@ def reactions(organism_type="", rctf='Biochemistry/reactions.master.tsv', verbos
     return cpds, all_reactions
 
 
+# the compounds in one side of a reaction, e.g. (1) cpd00001[0]
+_REACTION_COMPOUNDS = re.compile(r'\(([\d\.e-]+)\)\s+(.*?)\[(\d+)\]')
+_SEPARATORS = (" <=> ", " => ", " <= ", " = ", " < ", " > ")
+# files bigger than this are parsed in parallel by default
+_PARALLEL_SIZE = 4 * 1024 * 1024
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _none(value):
+    """
+    The database uses none and null for missing values
+    """
+    if value == "none" or value == "null":
+        return None
+    return value
+
+
+def _parse_reaction_chunk(args):
+    """
+    Parse the lines of a reactions file that start in a range of bytes, without making any objects (so we can do this
+    in another process).
+
+    :param args: The file name, the first byte and the byte after the last one
+    :type args: (str, int, int)
+    :return: The reactions as tuples of (id, equation, deltaG, deltaG error, is transport, direction, left compounds,
+        right compounds), and any messages as tuples of (always print, message)
+    :rtype: (list, list)
+    """
+    filename, start, end = args
+    records = []
+    messages = []
+    with open(filename, 'rb') as f:
+        if start > 0:
+            # the line that we start in belongs to the range before us
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            l = f.readline()
+            if not l:
+                break
+            l = l.decode('utf-8', 'replace')
+            if l.startswith('id'):
+                # ignore the header line
+                continue
+            if l.startswith("#"):
+                # ignore any comment lines
+                continue
+
+            pieces = l.strip().split("\t")
+            if len(pieces) < 20:
+                messages.append((True, "ERROR PARSING REACTION INFO: " + l))
+                continue
+            if "MI:" in pieces[17]:
+                # skip any reactions that are invalid due to mass imbalance, charge imbalance, or
+                # invalid compound format
+                continue
+
+            rid = pieces[0]
+            rxn = pieces[6]
+
+            deltaG = _none(pieces[14])
+            deltaG = float(deltaG) if deltaG else 0.0
+            deltaG_error = _none(pieces[15])
+            deltaG_error = float(deltaG_error) if deltaG_error else 0.0
+
+            # we need to split the reaction, but different reactions
+            # have different splits!
+            for separator in _SEPARATORS:
+                if separator in rxn:
+                    break
+            else:
+                messages.append((False, "WARNING: Could not find a seperator in " + rxn +
+                                 ". This reaction was skipped. Please check it\n"))
+                continue
+
+            left, right = rxn.split(separator)
+            records.append((rid, rxn, deltaG, deltaG_error, _none(pieces[5]) != '0', _none(pieces[9]),
+                            _REACTION_COMPOUNDS.findall(left.strip()), _REACTION_COMPOUNDS.findall(right.strip())))
+    return records, messages
+
+
+def _parse_reactions_file(filename, processes=None, verbose=False):
+    """
+    Parse a reactions file in chunks, in parallel if it is large. We yield each chunk as soon as we have it so that we
+    don't keep all of the parsed lines in memory.
+
+    :param filename: The reactions file
+    :type filename: str
+    :param processes: The number of processes to use. We always use one if we are in a daemonic process (e.g. a worker
+        in a multiprocessing.Pool)
+    :type processes: int
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: The reactions and messages from _parse_reaction_chunk for each chunk, in the order they are in the file
+    :rtype: generator of (list, list)
+    """
+    size = os.path.getsize(filename)
+    if processes is None:
+        processes = (os.cpu_count() or 1) if size > _PARALLEL_SIZE else 1
+    if processes > 1 and multiprocessing.current_process().daemon:
+        # we are in a worker of a multiprocessing.Pool, which is not allowed to start processes of its own
+        if verbose:
+            sys.stderr.write("Parsing {} in one process because we are in a daemonic process\n".format(filename))
+        processes = 1
+
+    # a few chunks for each process so that they all finish at about the same time
+    nchunks = max(processes * 4, size // _CHUNK_SIZE + 1)
+    bounds = [size * i // nchunks for i in range(nchunks + 1)]
+    chunks = [(filename, bounds[i], bounds[i + 1]) for i in range(nchunks)]
+
+    if processes <= 1:
+        for c in chunks:
+            yield _parse_reaction_chunk(c)
+        return
+
+    if verbose:
+        sys.stderr.write("Parsing {} in {} chunks with {} processes\n".format(filename, nchunks, processes))
+    with multiprocessing.Pool(processes) as pool:
+        for result in pool.imap(_parse_reaction_chunk, chunks):
+            yield result
+
+
+def _add_reaction(record, all_reactions, cpds, cpds_by_id, locations, verbose):
+    """
+    Make a reaction (and its compounds) from a line that _parse_reaction_chunk parsed.
+
+    :param record: The parsed reaction
+    :type record: tuple
+    :param all_reactions: The reactions, which we add to
+    :type all_reactions: dict
+    :param cpds: The compounds, which we add to
+    :type cpds: dict
+    :param cpds_by_id: The compounds by their model seed ids
+    :type cpds_by_id: dict
+    :param locations: The locations
+    :type locations: dict
+    :param verbose: Print more output
+    :type verbose: bool
+    """
+    rid, rxn, deltaG, deltaG_error, is_transport, direction, left, right = record
+
+    # create a new reaction object to hold all the information ...
+    r = PyFBA.metabolism.Reaction(rid)
+
+    r.deltaG = deltaG
+    r.deltaG_error = deltaG_error
+    if is_transport:
+        r.is_transport = True
+    all_reactions[rid] = r
+
+    r.direction = direction
+
+    # we have to rewrite the equation to accomodate
+    # the proper locations
+    newleft = []
+    newright = []
+
+    # deal with the compounds on the left side of the equation
+    for nc, q in _reaction_compounds(rid, rxn, left, 'left', cpds, cpds_by_id, locations, verbose):
+        r.add_left_compounds({nc})
+        r.set_left_compound_abundance(nc, float(q))
+        newleft.append("(" + str(q) + ") " + nc.name + "[" + nc.location + "]")
+
+    # deal with the right side of the equation
+    for nc, q in _reaction_compounds(rid, rxn, right, 'right', cpds, cpds_by_id, locations, verbose):
+        r.add_right_compounds({nc})
+        r.set_right_compound_abundance(nc, float(q))
+        newright.append("(" + str(q) + ") " + nc.name + "[" + nc.location + "]")
+
+    r.equation = " + ".join(newleft) + " <=> " + " + ".join(newright)
+
+
+def _reaction_compounds(rid, rxn, m, side, cpds, cpds_by_id, locations, verbose):
+    """
+    Make the compounds for one side of a reaction, and add the reaction to them.
+
+    :param rid: The reaction id
+    :type rid: str
+    :param rxn: The equation of the reaction
+    :type rxn: str
+    :param m: The (abundance, compound id, location) of the compounds
+    :type m: list
+    :param side: left or right, for the error messages
+    :type side: str
+    :param cpds: The compounds, which we add to
+    :type cpds: dict
+    :param cpds_by_id: The compounds by their model seed ids
+    :type cpds_by_id: dict
+    :param locations: The locations
+    :type locations: dict
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: The compounds and their abundances
+    :rtype: list of (PyFBA.metabolism.Compound, str)
+    """
+    if m == [] and verbose:
+        sys.stderr.write("ERROR: Could not parse the compounds on the " + side + " side of the reaction " +
+                         rid + ": " + rxn + "\n")
+
+    compounds_and_abundance = []
+    for q, cmpd, locval in m:
+        if locval in locations:
+            loc = locations[locval]
+        else:
+            if verbose:
+                sys.stderr.write("WARNING: Could not get a location " + " for " + locval + "\n")
+            loc = locval
+
+        # we first look up to see whether we have the compound
+        # and then we need to create a new compound with the
+        # appropriate location
+
+        if cmpd in cpds_by_id:
+            nc = PyFBA.metabolism.Compound(cpds_by_id[cmpd].name, loc)
+        else:
+            if verbose:
+                sys.stderr.write("ERROR: Did not find " + cmpd + " in the compounds file.\n")
+            nc = PyFBA.metabolism.Compound(cmpd, loc)
+
+        ncstr = str(nc)
+        if ncstr in cpds:
+            nc = copy.copy(cpds[ncstr])
+        nc.add_reactions({rid})
+        cpds[ncstr] = nc
+        compounds_and_abundance.append((nc, q))
+    return compounds_and_abundance
+
+
 def complexes(cf="SOLRDump/TemplateReactions.tsv", verbose=False):
     """
     Connection between complexes and reactions. A complex can be
@@ -371,11 +474,12 @@ def complexes(cf="SOLRDump/TemplateReactions.tsv", verbose=False):
     """
 
     cplxes = {}
+    directory = modelseed_dir()
     try:
         # io.open() to enable the encoding and errors arguments when using Python2
         # io.open() will read lines as unicode objects instead of str objects
         # In Python2, unicode objects are equivalent to Python3 str objects
-        with io.open(os.path.join(MODELSEED_DIR, cf), 'r', encoding='utf-8', errors='replace') as rin:
+        with io.open(os.path.join(directory, cf), 'r', encoding='utf-8', errors='replace') as rin:
             for l in rin:
                 # If using Python2, must convert unicode object to str object
                 if sys.version_info.major == 2:
@@ -396,7 +500,7 @@ def complexes(cf="SOLRDump/TemplateReactions.tsv", verbose=False):
                         cplxes[cmplx] = set()
                     cplxes[cmplx].add(p[1])
     except IOError as e:
-        sys.stderr.write("There was an error parsing {}\n".format(os.path.join(MODELSEED_DIR, cf)))
+        sys.stderr.write("There was an error parsing {}\n".format(os.path.join(directory, cf)))
         sys.stderr.write("I/O error({0}): {1}\n".format(e.errno, e.strerror))
         sys.exit(-1)
 
@@ -421,8 +525,9 @@ def roles_ec(rf="SOLRDump/ComplexRoles.tsv"):
 
     """
     rles_ec = {}
+    directory = modelseed_dir()
     try:
-        with open(os.path.join(MODELSEED_DIR, rf), 'r') as rin:
+        with open(os.path.join(directory, rf), 'r') as rin:
             for l in rin:
                 if l.startswith("#") or l.startswith('complex_id'):
                     # ignore any comment lines
@@ -461,8 +566,9 @@ def roles(rf="SOLRDump/ComplexRoles.tsv"):
 
     """
     rles = {}
+    directory = modelseed_dir()
     try:
-        with open(os.path.join(MODELSEED_DIR, rf), 'r') as rin:
+        with open(os.path.join(directory, rf), 'r') as rin:
             for l in rin:
                 if l.startswith("#") or l.startswith('complex_id'):
                     # ignore any comment lines
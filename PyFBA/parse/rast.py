@@ -1,8 +1,16 @@
 import os
 import sys
+from functools import lru_cache
+from itertools import groupby
 
 import re
 
+from .subsystems import subsystem_index
+
+# comments at the end of a function, and the separators between the roles in a function
+_COMMENT = re.compile(r'\s+[#!]\s.*$')
+_ROLE_SEPARATOR = re.compile(r'\s*;\s+|\s+[;/@]\s+')
+
 
 def roles_of_function(role):
     """
@@ -20,10 +28,82 @@ def roles_of_function(role):
     :return: A set of the roles
     :rtype: set
     """
+    return set(_roles_of_function(role))
 
+
+@lru_cache(maxsize=65536)
+def _roles_of_function(role):
+    """
+    The roles of a function. The same functions are in almost every genome, so we remember them.
+
+    :rtype: frozenset
+    """
     # remove comments from functions and split multiple functions
-    func = re.sub('\s+[#!]\s.*$', '', role)
-    return set(re.split('\s*;\s+|\s+[;/@]\s+', func))
+    return frozenset(_ROLE_SEPARATOR.split(_COMMENT.sub('', role)))
+
+
+def _functions(filename, peg_column, function_column):
+    """
+    Read the pegs and the roles of their functions from a tab separated file, one line at a time.
+
+    :return: The peg and its roles, for each line
+    :rtype: generator of (str, frozenset)
+    """
+    with open(filename, 'r') as f:
+        for l in f:
+            p = l.strip().split("\t")
+            yield p[peg_column], _roles_of_function(p[function_column])
+
+
+def stream_functions(files, spreadsheet=False, verbose=False):
+    """
+    Read the functions of the pegs in many RAST files, one line at a time, so that we never keep more than one line
+    in memory.
+
+    The files can be a list of file names, in which case the genome is the name of the file without the extension, or
+    a list of (genome, file name) tuples.
+
+    :param files: The assigned functions files (or the spreadsheets) downloaded from RAST
+    :type files: iterable of str or of (str, str)
+    :param spreadsheet: The files are spreadsheets (tab-separated text format) rather than assigned functions
+    :type spreadsheet: bool
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: The genome, the peg, and the roles of its function, for every peg in every file
+    :rtype: generator of (str, str, frozenset)
+    """
+    peg_column, function_column = (1, 7) if spreadsheet else (0, 1)
+    for f in files:
+        if isinstance(f, tuple):
+            genome, filename = f
+        else:
+            genome, filename = os.path.splitext(os.path.basename(f))[0], f
+        if not os.path.exists(filename):
+            raise IOError("ERROR: {} does not exist".format(filename))
+        if verbose:
+            sys.stderr.write("Reading the functions of {} from {}\n".format(genome, filename))
+        for peg, roles in _functions(filename, peg_column, function_column):
+            yield genome, peg, roles
+
+
+def genome_roles(files, spreadsheet=False, verbose=False):
+    """
+    Read the roles in many RAST files, one genome at a time.
+
+    :param files: The assigned functions files (or the spreadsheets) downloaded from RAST. See stream_functions
+    :type files: iterable of str or of (str, str)
+    :param spreadsheet: The files are spreadsheets (tab-separated text format) rather than assigned functions
+    :type spreadsheet: bool
+    :param verbose: Print more output
+    :type verbose: bool
+    :return: The genome and all of its roles, for each genome. Files for the same genome should be next to each other
+    :rtype: generator of (str, set)
+    """
+    for genome, records in groupby(stream_functions(files, spreadsheet, verbose), lambda x: x[0]):
+        roles = set()
+        for g, peg, rs in records:
+            roles.update(rs)
+        yield genome, roles
 
 
 def read_downloaded_data(spreadsheet_file):
@@ -39,10 +119,8 @@ def read_downloaded_data(spreadsheet_file):
         raise IOError("ERROR: {} does not exist".format(spreadsheet_file))
 
     function = {}
-    with open(spreadsheet_file, 'r') as f:
-        for l in f:
-            p = l.strip().split("\t")
-            function[p[1]] = roles_of_function(p[7])
+    for peg, roles in _functions(spreadsheet_file, 1, 7):
+        function[peg] = set(roles)
     return function
 
 
@@ -62,10 +140,8 @@ def read_assigned_functions(assigned_functions_file):
         raise IOError("ERROR: {} does not exist".format(assigned_functions_file))
 
     function = {}
-    with open(assigned_functions_file, 'r') as f:
-        for l in f:
-            p = l.strip().split("\t")
-            function[p[0]] = roles_of_function(p[1])
+    for peg, roles in _functions(assigned_functions_file, 0, 1):
+        function[peg] = set(roles)
     return function
 
 
@@ -77,27 +153,13 @@ def roles_to_subsystem(roles):
     :type roles: set
     :rtype: dict of sets of 3-tuples
     """
-    ss_data = {}
-    with open(os.path.join(os.path.dirname(__file__), "..", "util", "full_roles_ss.tsv")) as f:
-        for l in f:
-            func, cat, subcat, ss = l.rstrip("\n").split("\t")
-            # Functions can be associated with multiple subsystems
-            try:
-                ss_data[func]
-            except KeyError:
-                ss_data[func] = set()
-            ss_data[func].add((cat, subcat, ss))
+    ss_data = subsystem_index().roles
 
     roles_to_ss = {}
     for r in roles:
-        roles_to_ss[r] = set()
         if r not in ss_data:
-            roles_to_ss[r].add(("Unknown", "Unknown", "Unknown"))
+            roles_to_ss[r] = {("Unknown", "Unknown", "Unknown")}
         else:
-            for cat, subcat, ss in ss_data[r]:
-                cat = cat if cat != "" else "Unknown"
-                subcat = subcat if subcat != "" else "Unknown"
-                ss = ss if ss != "" else "Unknown"
-                roles_to_ss[r].add((cat, subcat, ss))
+            roles_to_ss[r] = set(ss_data[r])
 
     return roles_to_ss
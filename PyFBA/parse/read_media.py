@@ -4,27 +4,34 @@ import sys
 import PyFBA
 
 
-def read_media_file(mediaf):
+def find_media_file(mediaf):
     """
-    Read a media file and return a set with the media added. If the environment variable PYFBA_MEDIA_DIR
-    is set, we will look in there for mediaf if we can not find it.
-        
-    Returns a set of compounds that are in the media.
+    Find a media file. If we can not find mediaf and the environment variable PYFBA_MEDIA_DIR is set, we will look in
+    there for it.
 
-    :param mediaf: The file to read
+    :param mediaf: The file to find
     :type mediaf: str
-    :return: A set of media components
-    :rtype: set of metabolism.Compound
+    :return: The path to the file
+    :rtype: str
+    :raises IOError: if we can not find the file
     """
+    if os.path.exists(mediaf):
+        return mediaf
+    if 'PYFBA_MEDIA_DIR' in os.environ and os.path.exists(os.path.join(os.environ['PYFBA_MEDIA_DIR'], mediaf)):
+        return os.path.join(os.environ['PYFBA_MEDIA_DIR'], mediaf)
+    raise IOError("Media file {} can not be found\nPlease set the environment variable PYFBA_MEDIA_DIR to point to a directory with all the media files".format(mediaf))
 
-    media = set()
 
-    if not os.path.exists(mediaf):
-        if 'PYFBA_MEDIA_DIR' in os.environ and os.path.exists(os.path.join(os.environ['PYFBA_MEDIA_DIR'], mediaf)):
-            mediaf = os.path.join(os.environ['PYFBA_MEDIA_DIR'], mediaf)
-        else:
-            raise IOError("Media file {} can not be found\nPlease set the environment variable PYFBA_MEDIA_DIR to point to a directory with all the media files".format(mediaf))
+def _read_media(mediaf):
+    """
+    Read the compounds in a media file.
 
+    :param mediaf: The file to read
+    :type mediaf: str
+    :return: The name and location of each compound
+    :rtype: list of (str, str)
+    """
+    media = []
     with open(mediaf, 'r') as f:
         for li, l in enumerate(f):
             # skip the header line
@@ -34,9 +41,23 @@ def read_media_file(mediaf):
             if len(p) < 2:
                 sys.stderr.write("Skipped line {} as it does not have enough columns\n".format(l.strip()))
                 continue
-            c = PyFBA.metabolism.Compound(p[1], 'e')
-            media.add(c)
-    
+            media.append((p[1], 'e'))
     return media
 
 
+def read_media_file(mediaf):
+    """
+    Read a media file and return a set with the media added. If the environment variable PYFBA_MEDIA_DIR
+    is set, we will look in there for mediaf if we can not find it.
+
+    If you read the same media more than once, PyFBA.parse.media_library() only reads each file once.
+        
+    Returns a set of compounds that are in the media.
+
+    :param mediaf: The file to read
+    :type mediaf: str
+    :return: A set of media components
+    :rtype: set of metabolism.Compound
+    """
+
+    return {PyFBA.metabolism.Compound(name, location) for name, location in _read_media(find_media_file(mediaf))}
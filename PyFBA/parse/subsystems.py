@@ -0,0 +1,127 @@
+"""
+The subsystems, their classification, and their roles.
+
+We have two files with subsystem information: PyFBA/util/full_roles_ss.tsv (role, category, subcategory, subsystem)
+that we use to report the subsystems of a model, and PyFBA/Biochemistry/SEED/Subsystems/SS_functions.txt (function,
+subsystem, category, subcategory) that we use for gapfilling. Both are parsed into a SubsystemIndex the first time
+we need them, kept for the rest of the session, and cached as a pickle (see PyFBA.parse.cache) so the next session
+does not need to parse them again.
+"""
+
+import io
+import os
+import threading
+
+from .cache import cached
+
+FULL_ROLES_SS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "util", "full_roles_ss.tsv")
+SS_FUNCTIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Biochemistry", "SEED",
+                            "Subsystems", "SS_functions.txt")
+
+# change this if the SubsystemIndex changes, so we don't read old caches
+_CACHE_VERSION = 1
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+class SubsystemIndex:
+    """
+    The roles in each subsystem and the classification of each subsystem. Empty categories, subcategories and
+    subsystems are "Unknown".
+
+    :ivar roles: The (category, subcategory, subsystem) of each role
+    :type roles: dict of str and set of (str, str, str)
+    :ivar subsystems: The roles in each subsystem
+    :type subsystems: dict of str and set of str
+    :ivar role_subsystems: The subsystems that each role is in
+    :type role_subsystems: dict of str and set of str
+    """
+
+    def __init__(self):
+        self.roles = {}
+        self.subsystems = {}
+        self.role_subsystems = {}
+
+    def add(self, role, category, subcategory, subsystem):
+        """
+        Add a role in a subsystem.
+
+        :param role: The role
+        :type role: str
+        :param category: The category of the subsystem
+        :type category: str
+        :param subcategory: The subcategory of the subsystem
+        :type subcategory: str
+        :param subsystem: The subsystem
+        :type subsystem: str
+        """
+        category = category if category != "" else "Unknown"
+        subcategory = subcategory if subcategory != "" else "Unknown"
+        subsystem = subsystem if subsystem != "" else "Unknown"
+        if role not in self.roles:
+            self.roles[role] = set()
+            self.role_subsystems[role] = set()
+        self.roles[role].add((category, subcategory, subsystem))
+        self.role_subsystems[role].add(subsystem)
+        if subsystem not in self.subsystems:
+            self.subsystems[subsystem] = set()
+        self.subsystems[subsystem].add(role)
+
+
+def _read_subsystems(filename, functions):
+    """
+    Read a subsystems file.
+
+    :param filename: The file to read
+    :type filename: str
+    :param functions: The file is an SS_functions.txt file (function, subsystem, category, subcategory), and we split
+        the functions into roles. Otherwise it is a full_roles_ss.tsv file (role, category, subcategory, subsystem)
+    :type functions: bool
+    :rtype: SubsystemIndex
+    """
+    from .rast import roles_of_function
+
+    index = SubsystemIndex()
+    with io.open(filename, 'r', encoding="utf-8", errors='replace') as f:
+        for l in f:
+            if l.startswith('#'):
+                continue
+            p = l.rstrip("\n").split("\t")
+            if len(p) < 2 or p[0].strip() == "":
+                continue
+            p += [""] * (4 - len(p))
+            if functions:
+                if p[1] == "":
+                    continue
+                if p[1] not in index.subsystems:
+                    index.subsystems[p[1]] = set()
+                for role in roles_of_function(p[0].strip()):
+                    index.add(role, p[2], p[3], p[1])
+            else:
+                index.add(p[0], p[1], p[2], p[3])
+    return index
+
+
+def subsystem_index(filename=FULL_ROLES_SS, functions=None):
+    """
+    Get the subsystem index for a file. We only read each file once.
+
+    :param filename: The subsystems file. The default is the full_roles_ss.tsv file that comes with PyFBA. Use
+        PyFBA.parse.subsystems.SS_FUNCTIONS for the SEED subsystems that we use for gapfilling
+    :type filename: str
+    :param functions: The file has functions and then subsystems, like SS_functions.txt. The default is to guess from
+        the name of the file
+    :type functions: bool
+    :return: The subsystem index
+    :rtype: SubsystemIndex
+    """
+    filename = os.path.abspath(filename)
+    if functions is None:
+        functions = os.path.basename(filename) == os.path.basename(SS_FUNCTIONS)
+    key = (filename, functions)
+    with _lock:
+        if key not in _indexes:
+            name = "{}-v{}".format('ss_functions' if functions else 'subsystems', _CACHE_VERSION)
+            _indexes[key] = cached(name, [filename], lambda: _read_subsystems(filename, functions))
+        return _indexes[key]
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import PyFBA
+from PyFBA.tests.toy_model import toy_compound, toy_reaction
+
+"""
+A class to test building models for many genomes at once, with a small database instead of the ModelSEED database
+"""
+
+
+class TestRolesToModels(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.directory = tempfile.mkdtemp()
+        self.compounds = {}
+        ac, bc, cc = [toy_compound(self.compounds, 'build model ' + n, 'c') for n in ('a', 'b', 'c')]
+        self.reactions = {}
+        for r in [toy_reaction('build_r1', ac, bc), toy_reaction('build_r2', bc, cc), toy_reaction('build_r3', cc, ac)]:
+            self.reactions[r.name] = r
+        # the second role has a reaction that is not in our database
+        self.one = 'Build model role one (EC 1.1.1.1)'
+        self.two = 'Build model role two (EC 2.2.2.2)'
+        self.index = {self.one: {'build_r1'}, self.two: {'build_r2', 'build_r3', 'build_missing'}}
+        self.files = []
+        for genome, functions in [('g1', [self.one, 'A role that is not in the index']),
+                                  ('g2', [self.one, self.two + ' # with a comment'])]:
+            self.files.append((genome, os.path.join(self.directory, genome + ".txt")))
+            with open(self.files[-1][1], 'w') as out:
+                for i, f in enumerate(functions):
+                    out.write("fig|1.1.peg.{}\t{}\n".format(i, f))
+        # use our database instead of the ModelSEED database
+        for patcher in [mock.patch.object(PyFBA.parse.model_seed, 'compounds_reactions_enzymes',
+                                          return_value=(self.compounds, self.reactions, {})),
+                        mock.patch.object(PyFBA.filters, 'role_reaction_index', return_value=self.index)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """This method is called after every test_ method"""
+        shutil.rmtree(self.directory)
+
+    def test_roles_to_models(self):
+        """Test that each genome gets the reactions of its roles that are in the database"""
+        models = list(PyFBA.model.roles_to_models(self.files))
+        self.assertEqual([m.id for m in models], ['g1', 'g2'])
+        self.assertEqual(set(models[0].reactions), {'build_r1'})
+        self.assertEqual(set(models[1].reactions), {'build_r1', 'build_r2', 'build_r3'})
+        self.assertEqual(models[0].roles, {self.one: {'build_r1'}})
+        self.assertEqual(models[1].roles, {self.one: {'build_r1'}, self.two: {'build_r2', 'build_r3'}})
+        self.assertIsNotNone(models[1].biomass_reaction)
+
+    def test_out_dir(self):
+        """Test saving the models instead of returning them"""
+        out_dir = os.path.join(self.directory, 'models')
+        self.assertEqual(list(PyFBA.model.roles_to_models(self.files, out_dir=out_dir)), ['g1', 'g2'])
+        model = PyFBA.model.load_model(out_dir, 'g2')
+        self.assertEqual(model.id, 'g2')
+        self.assertEqual(set(model.reactions), {'build_r1', 'build_r2', 'build_r3'})
+        # load_model reads the reactions of each role as a list
+        self.assertEqual({r: set(rxns) for r, rxns in model.roles.items()},
+                         {self.one: {'build_r1'}, self.two: {'build_r2', 'build_r3'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
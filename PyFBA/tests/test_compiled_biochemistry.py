@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import PyFBA
+
+"""
+A class to test the compiled, memory mapped, biochemistry
+"""
+
+
+class TestCompiledBiochemistry(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.directory = tempfile.mkdtemp()
+        self.compounds = {}
+        for name, loc in [('glucose', 'e'), ('glucose', 'c'), ('atp', 'c')]:
+            c = PyFBA.metabolism.Compound(name, loc)
+            self.compounds[str(c)] = c
+        self.compounds['atp (location: c)'].formula = 'C10H16N5O13P3'
+        self.compounds['atp (location: c)'].mw = '507.18'
+        self.compounds['glucose (location: c)'].alternate_seed_ids = {'cpd26821'}
+
+        r = PyFBA.metabolism.Reaction('rxn05226')
+        r.equation = "(1) glucose[e] + (2) atp[c] <=> (1) glucose[c]"
+        r.direction = '>'
+        r.deltaG = -1.5
+        r.is_transport = True
+        r.add_left_compounds({self.compounds['glucose (location: e)'], self.compounds['atp (location: c)']})
+        r.set_left_compound_abundance(self.compounds['glucose (location: e)'], 1)
+        r.set_left_compound_abundance(self.compounds['atp (location: c)'], 2)
+        r.add_right_compounds({self.compounds['glucose (location: c)']})
+        r.set_right_compound_abundance(self.compounds['glucose (location: c)'], 1)
+        r.add_enzymes({'cpx00001'})
+        for c in r.all_compounds():
+            self.compounds[str(c)].add_reactions({'rxn05226'})
+        self.reactions = {'rxn05226': r, 'rxn00001': PyFBA.metabolism.Reaction('rxn00001')}
+
+        e = PyFBA.metabolism.Enzyme('cpx00001')
+        e.add_roles({'Glucose transporter', 'Glucose permease'})
+        self.enzymes = {'cpx00001': e}
+
+        PyFBA.parse.compile_biochemistry(self.directory, self.compounds, self.reactions, self.enzymes)
+        self.store = PyFBA.parse.BiochemistryStore(self.directory)
+
+    def tearDown(self):
+        """This method is called after every test_ method"""
+        shutil.rmtree(self.directory)
+
+    def test_reactions(self):
+        """Test that the reactions are the same as the ones we compiled"""
+        self.assertEqual(list(self.store.reactions), ['rxn05226', 'rxn00001'])
+        self.assertNotIn('rxn00002', self.store.reactions)
+        r = self.store.reactions['rxn05226']
+        self.assertEqual(r, self.reactions['rxn05226'])
+        self.assertEqual(r.equation, self.reactions['rxn05226'].equation)
+        self.assertEqual(r.direction, '>')
+        self.assertEqual(r.deltaG, -1.5)
+        self.assertTrue(r.is_transport)
+        self.assertEqual(r.enzymes, {'cpx00001'})
+        self.assertEqual(r.get_left_compound_abundance(self.compounds['atp (location: c)']), 2)
+        self.assertIsNone(self.store.reactions['rxn00001'].direction)
+        self.assertIs(r, self.store.reactions['rxn05226'])
+
+    def test_compounds(self):
+        """Test that the compounds are the same as the ones we compiled"""
+        self.assertEqual(set(self.store.compounds), set(self.compounds))
+        c = self.store.compounds['atp (location: c)']
+        self.assertEqual(c.formula, 'C10H16N5O13P3')
+        self.assertEqual(c.mw, '507.18')
+        self.assertEqual(c.reactions, {'rxn05226'})
+        self.assertIsNone(self.store.compounds['glucose (location: e)'].formula)
+        self.assertEqual(self.store.compounds['glucose (location: c)'].alternate_seed_ids, {'cpd26821'})
+
+    def test_roles(self):
+        """Test the roles for each reaction"""
+        self.assertEqual(self.store.roles('rxn05226'), {'Glucose transporter', 'Glucose permease'})
+        self.assertEqual(self.store.roles('rxn00001'), set())
+
+    def test_shared_memory(self):
+        """Test sharing the biochemistry in shared memory"""
+        with PyFBA.parse.SharedBiochemistry(self.compounds, self.reactions, self.enzymes) as shared:
+            store = PyFBA.parse.attach_biochemistry(shared.handle)
+            self.assertEqual(store.reactions['rxn05226'], self.reactions['rxn05226'])
+            self.assertEqual(store.roles('rxn05226'), {'Glucose transporter', 'Glucose permease'})
+            numbers = shared.store.reaction_numbers({'rxn05226', 'rxn00001', 'rxn99999'})
+            self.assertEqual(store.reaction_ids(numbers), {'rxn05226', 'rxn00001'})
+        self.assertIsNone(shared.store)
+
+    def test_numpy(self):
+        """Test that numpy can read the columns"""
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy is not installed")
+        data = numpy.load(os.path.join(self.directory, "stoichiometry_data.npy"), mmap_mode='r')
+        self.assertEqual(sorted(data), [-2, -1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import PyFBA
+
+"""
+A class to test the compound to reaction index
+"""
+
+
+class TestCompoundReactionIndex(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.a = PyFBA.metabolism.Compound('index test a', 'c')
+        self.b = PyFBA.metabolism.Compound('index test b', 'c')
+        self.c = PyFBA.metabolism.Compound('index test c', 'c')
+        self.reactions = {}
+        for name, left, right in [('ab', self.a, self.b), ('bc', self.b, self.c), ('ca', self.c, self.a)]:
+            r = PyFBA.metabolism.Reaction(name)
+            r.add_left_compounds({left})
+            r.add_right_compounds({right})
+            self.reactions[name] = r
+        self.index = PyFBA.metabolism.CompoundReactionIndex(self.reactions, {'ab'})
+
+    def test_reactions_with(self):
+        """Test looking up the reactions for a compound"""
+        self.assertEqual(self.index.reactions_with(self.a), {'ab', 'ca'})
+        self.assertEqual(self.index.reactions_with(PyFBA.metabolism.Compound('index test a', 'e')), set())
+
+    def test_degree(self):
+        """Test that the counts follow the reactions in the model"""
+        ci = PyFBA.metabolism.compound_index
+        self.assertEqual(self.index.degree, {ci(self.a): 1, ci(self.b): 1})
+        self.index.sync({'ab', 'bc'})
+        self.assertEqual(self.index.degree, {ci(self.a): 1, ci(self.b): 2, ci(self.c): 1})
+        self.index.sync({'bc'})
+        self.assertEqual(self.index.degree, {ci(self.b): 1, ci(self.c): 1})
+        self.assertEqual(self.index.running, {'bc'})
+
+    def test_limit_reactions_by_compound(self):
+        """Test that limiting reactions by compound gives a set that callers can change"""
+        limited = PyFBA.gapfill.limit_reactions_by_compound(self.reactions, PyFBA.metabolism.ReactionSet({'ab'}),
+                                                            {'bc', 'ca'}, index=self.index)
+        self.assertEqual(limited, {'bc', 'ca'})
+        limited.difference_update({'ca'})
+        self.assertEqual(limited, {'bc'})
+
+
+if __name__ == '__main__':
+    unittest.main()
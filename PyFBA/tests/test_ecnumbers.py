@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import PyFBA
+
+"""
+A class to test finding reactions by EC number
+"""
+
+
+class TestECNumbers(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.directory = tempfile.mkdtemp()
+        self.old_env = {k: os.environ.get(k) for k in ('ModelSEEDDatabase', 'PYFBA_CACHE_DIR')}
+        os.environ['ModelSEEDDatabase'] = self.directory
+        os.environ['PYFBA_CACHE_DIR'] = os.path.join(self.directory, 'cache')
+        os.mkdir(os.path.join(self.directory, 'SOLRDump'))
+        with open(os.path.join(self.directory, 'SOLRDump', 'Reactions.tsv'), 'w') as out:
+            out.write("id" + "\tcolumn" * 13 + "\n")
+            for rxn, ecs in [('rxn00001', '1.1.1.1'), ('rxn00002', '1.1.1.2;2.7.1.1'), ('rxn00003', '1.1.2.1'),
+                             ('rxn00004', 'null'), ('rxn00005', '1.1.1.-')]:
+                out.write(rxn + "\tx" * 12 + "\t" + ecs + "\n")
+
+    def tearDown(self):
+        """This method is called after every test_ method"""
+        for k, v in self.old_env.items():
+            if v is None:
+                del os.environ[k]
+            else:
+                os.environ[k] = v
+        PyFBA.gapfill.ecnumbers._ec_indexes.clear()
+        shutil.rmtree(self.directory)
+
+    def test_lookup(self):
+        """Test exact and wildcard lookups"""
+        index = PyFBA.gapfill.ecnumbers.ec_index()
+        self.assertEqual(index.lookup('1.1.1.1'), {'rxn00001'})
+        self.assertEqual(index.lookup('2.7.1.1'), {'rxn00002'})
+        self.assertEqual(index.lookup('1.1.1.-', wildcards=False), {'rxn00005'})
+        self.assertEqual(index.lookup('1.1.1.-'), {'rxn00001', 'rxn00002', 'rxn00005'})
+        self.assertEqual(index.lookup('1.1.-.-'), {'rxn00001', 'rxn00002', 'rxn00003', 'rxn00005'})
+        self.assertEqual(index.lookup('-.-.-.-'), set())
+        self.assertEqual(index.lookup('3.1.1.-'), set())
+
+    def test_suggest_reactions_using_ec(self):
+        """Test suggesting reactions from the EC numbers in roles"""
+        reactions = {r: None for r in ['rxn00001', 'rxn00002', 'rxn00003', 'rxn00005']}
+        roles = {'Alcohol dehydrogenase (EC 1.1.1.-)', 'Hexokinase (EC 2.7.1.1)'}
+        suggested = PyFBA.gapfill.suggest_reactions_using_ec(roles, reactions, {'rxn00005'})
+        self.assertEqual(suggested, {'rxn00001', 'rxn00002'})
+        suggested = PyFBA.gapfill.suggest_reactions_using_ec(roles, reactions, {'rxn00005'}, wildcards=False)
+        self.assertEqual(suggested, {'rxn00002'})
+
+
+if __name__ == '__main__':
+    unittest.main()
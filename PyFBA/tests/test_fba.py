@@ -51,13 +51,26 @@ class TestFBA(unittest.TestCase):
         emptyset = PyFBA.fba.remove_uptake_and_secretion_reactions(upsec)
         self.assertEqual(len(emptyset), 0)
 
+        # the reactions are cached, so asking again gives us the same objects
+        again = PyFBA.fba.uptake_and_secretion_reactions(model_cpds, compounds)
+        for c in model_cpds:
+            us = PyFBA.fba.exchange_reaction(compounds[c])
+            self.assertIs(again[str(us)], us)
+
     def test_create_sm(self):
         """Test the stoichiometric matrix"""
 
         reactions2run = list(self.__class__.reactions.keys())[0:20]
         biomass_equation = PyFBA.metabolism.biomass_equation('gram_negative')
+        number_of_reactions = len(self.__class__.reactions)
         cp, rc, reactions = PyFBA.fba.create_stoichiometric_matrix(reactions2run, self.__class__.reactions,
                                                              self.__class__.compounds, set(), biomass_equation)
+        # the uptake and secretion reactions are in the view we get back, but not in the reactions dict
+        self.assertEqual(len(self.__class__.reactions), number_of_reactions)
+        for r in rc:
+            if r.startswith("UPTAKE_SECRETION_REACTION"):
+                self.assertIn(r, reactions)
+                self.assertNotIn(r, self.__class__.reactions)
         # this allows some wiggle room as the data changes
         self.assertGreaterEqual(len(cp), 100)
         self.assertLessEqual(len(cp), 150)
@@ -0,0 +1,46 @@
+import unittest
+
+import PyFBA
+from PyFBA import lp
+
+"""
+A class to test the FBAResult
+"""
+
+
+class TestFBAResult(unittest.TestCase):
+
+    def test_snapshot(self):
+        """Test that a result copies the solution and is not changed by the next lp"""
+        mat = [
+                [ 1.0, 1.0, 1.0],
+                [10.0, 4.0, 5.0],
+                [ 2.0, 2.0, 6.0],
+        ]
+        rh = ['a', 'b', 'c']
+        ch = ['x', 'y', 'z']
+
+        lp.load(mat, rh, ch)
+        lp.objective_coefficients([ 10.0, 6.0, 4.0 ])
+        lp.row_bounds([(None, 100.0), (None, 600.0), (None, 300.0)])
+        lp.col_bounds([(0, None), (0, None), (0, None)])
+        status, value = lp.solve()
+        result = PyFBA.fba.FBAResult.from_solver(status, value, value > 1, rh, ch)
+
+        # load something else
+        lp.load([[1.0]], ['d'], ['w'])
+
+        status, value, growth = result
+        self.assertEqual(status, 'opt')
+        self.assertAlmostEqual(value, 733.333, places=3)
+        self.assertTrue(growth)
+        self.assertEqual(len(result.col_primals), 3)
+        self.assertEqual(len(result.row_duals), 3)
+        self.assertAlmostEqual(result.flux('y'), 66.667, places=3)
+        self.assertEqual(set(result.fluxes), {'x', 'y', 'z'})
+        self.assertEqual(set(result.shadow_prices), {'a', 'b', 'c'})
+        self.assertEqual(result.reaction_index['z'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -160,3 +160,87 @@ class TestGLPKSolver(unittest.TestCase):
         
 
 
+
+    def _two_columns(self):
+        """Maximize 3x + 2y with x + y <= 4, x - y <= 10, x at most 3 and y at most 10"""
+        lp.load([[1.0, 1.0], [1.0, -1.0]], ['a', 'b'], ['x', 'y'])
+        lp.objective_coefficients([3.0, 2.0])
+        lp.row_bounds([(None, 4.0), (None, 10.0)])
+        lp.col_bounds([(0, 3.0), (0, 10.0)])
+        status, result = lp.solve()
+        self.assertEqual(status, 'opt')
+        self.assertAlmostEqual(result, 11.0, places=5)
+
+    def test_duals(self):
+        """Test the shadow prices of the rows and the reduced costs of the columns"""
+        self._two_columns()
+        # one more of a is worth 2 (more y), b has slack, and x is at its upper bound where it is worth 3 - 2
+        self.assertEqual(len(lp.row_duals()), 2)
+        self.assertEqual(set(lp.row_dual_hash()), {'a', 'b'})
+        assertDeepAlmostEqual(self, [2.0, 0.0], lp.row_duals(), places=5)
+        assertDeepAlmostEqual(self, {'a': 2.0, 'b': 0.0}, lp.row_dual_hash(), places=5)
+        self.assertEqual(len(lp.col_duals()), 2)
+        self.assertEqual(set(lp.col_dual_hash()), {'x', 'y'})
+        assertDeepAlmostEqual(self, [1.0, 0.0], lp.col_duals(), places=5)
+        assertDeepAlmostEqual(self, {'x': 1.0, 'y': 0.0}, lp.col_dual_hash(), places=5)
+
+    def test_change_col_bounds(self):
+        """Test changing the bounds of one column without loading the lp again"""
+        self._two_columns()
+        lp.change_col_bounds({0: (0, 1.0)})
+        status, result = lp.solve()
+        self.assertEqual(status, 'opt')
+        self.assertAlmostEqual(result, 9.0, places=5)
+        assertDeepAlmostEqual(self, {'x': 1.0, 'y': 3.0}, lp.col_primal_hash(), places=5)
+
+    def test_parsimonious(self):
+        """Test that parsimonious FBA removes a loop"""
+        # a is taken up and converted to b. a can also go around a loop a -> c -> a
+        mat = [
+                #  up    ab    ac    ca   out
+                [ 1.0, -1.0, -1.0,  1.0,  0.0],
+                [ 0.0,  1.0,  0.0,  0.0, -1.0],
+                [ 0.0,  0.0,  1.0, -1.0,  0.0],
+        ]
+        rh = ['a', 'b', 'c']
+        ch = ['up', 'ab', 'ac', 'ca', 'out']
+
+        lp.load(mat, rh, ch)
+        lp.objective_coefficients([0.0, 0.0, 0.0, 0.0, 1.0])
+        lp.row_bounds([(0.0, 0.0), (0.0, 0.0), (0.0, 0.0)])
+        lp.col_bounds([(0, 10.0), (0, 1000.0), (0, 1000.0), (-1000.0, 1000.0), (0, 1000.0)])
+        status, result = lp.solve()
+        self.assertEqual(status, 'opt')
+        self.assertAlmostEqual(result, 10.0, places=5)
+
+        status, total = lp.parsimonious()
+        self.assertEqual(status, 'opt')
+        # the objective may be a little (lp.glpk_solver.OBJECTIVE_TOLERANCE) below the maximum
+        self.assertAlmostEqual(total, 30.0, places=4)
+        col_pri = {'up': 10.0, 'ab': 10.0, 'ac': 0.0, 'ca': 0.0, 'out': 10.0}
+        assertDeepAlmostEqual(self, col_pri, lp.col_primal_hash(), places=4)
+        self.assertGreaterEqual(lp.col_primal_hash()['out'], 10.0 - lp.glpk_solver.OBJECTIVE_TOLERANCE * 11 - 1e-9)
+        self.assertEqual(len(lp.row_primals()), 3)
+
+    def test_minimize_indicators(self):
+        """Test that we use the cheapest columns, not the least flux"""
+        # a is taken up and converted to b either directly, or through c with a reversible reaction
+        mat = [
+                #  up    ab    ac    cb   out
+                [ 1.0, -1.0, -1.0,  0.0,  0.0],
+                [ 0.0,  1.0,  0.0,  1.0, -1.0],
+                [ 0.0,  0.0,  1.0, -1.0,  0.0],
+        ]
+        rh = ['a', 'b', 'c']
+        ch = ['up', 'ab', 'ac', 'cb', 'out']
+
+        lp.load(mat, rh, ch)
+        lp.row_bounds([(0.0, 0.0), (0.0, 0.0), (0.0, 0.0)])
+        lp.col_bounds([(0, 10.0), (0, 1000.0), (0, 1000.0), (-1000.0, 1000.0), (5.0, 1000.0)])
+        status, cost = lp.minimize_indicators([None, 0.8, 0.1, 0.1, None])
+        self.assertEqual(status, 'opt')
+        self.assertAlmostEqual(cost, 0.2, places=5)
+        fluxes = lp.col_primal_hash()
+        self.assertEqual(len(fluxes), 5)
+        self.assertAlmostEqual(fluxes['ab'], 0.0, places=5)
+        self.assertGreaterEqual(fluxes['cb'], 5.0 - 1e-5)
@@ -0,0 +1,52 @@
+import unittest
+
+import PyFBA
+from PyFBA.tests.toy_model import toy_compound, toy_reaction
+
+"""
+A class to test the growth tester, which skips the fba for knockouts of reactions that carried no flux
+"""
+
+
+class TestGrowthTester(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.compounds = {}
+        ae, ac, bc, xc = [toy_compound(self.compounds, 'growth tester ' + n, l)
+                          for n, l in [('a', 'e'), ('a', 'c'), ('b', 'c'), ('x', 'c')]]
+        self.reactions = {}
+        # a is taken up and made into b, which we need for growth. Nothing makes x, so tester_r2 never has flux
+        for r in [toy_reaction('tester_t1', ae, ac, '='), toy_reaction('tester_r1', ac, bc),
+                  toy_reaction('tester_r2', xc, bc)]:
+            self.reactions[r.name] = r
+        self.biomass = toy_reaction('BIOMASS_EQN', bc)
+        self.media = {ae}
+
+    def _run_fba(self, reactions_to_run):
+        status, value, growth = PyFBA.fba.run_fba(self.compounds, self.reactions, reactions_to_run, self.media,
+                                                  self.biomass)
+        return growth
+
+    def test_knockouts(self):
+        """Test that the tester gives the same answers as the fba, and only runs the fba when it has to"""
+        tester = PyFBA.fba.GrowthTester(self.compounds, self.reactions, self.media, self.biomass)
+        everything = set(self.reactions)
+        self.assertEqual(tester.grows(everything), self._run_fba(everything))
+        self.assertEqual((tester.solves, tester.saved), (1, 0))
+
+        # tester_r2 carried no flux, so the model still grows without it and we don't need the fba
+        without_r2 = everything - {'tester_r2'}
+        self.assertTrue(tester.grows(without_r2))
+        self.assertEqual((tester.solves, tester.saved), (1, 1))
+        self.assertTrue(self._run_fba(without_r2))
+
+        # tester_r1 carried the flux, so we have to run the fba, and the model does not grow
+        without_r1 = everything - {'tester_r1'}
+        self.assertFalse(tester.grows(without_r1))
+        self.assertEqual((tester.solves, tester.saved), (2, 1))
+        self.assertFalse(self._run_fba(without_r1))
+
+
+if __name__ == '__main__':
+    unittest.main()
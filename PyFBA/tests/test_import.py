@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import unittest
+
+"""
+A class to test that importing PyFBA is quick and has no side effects
+"""
+
+_check = """
+import sys, time
+start = time.time()
+import PyFBA
+elapsed = time.time() - start
+loaded = [m for m in sys.modules if m.startswith('PyFBA.') or m == 'glpk']
+print(elapsed)
+print(",".join(loaded))
+"""
+
+
+_check_parse = """
+import sys
+import PyFBA.parse
+print('multiprocessing.shared_memory' in sys.modules)
+"""
+
+
+class TestImport(unittest.TestCase):
+
+    def _run(self, code):
+        """Run some code in a new python without the ModelSEED database"""
+        env = dict(os.environ)
+        env.pop('ModelSEEDDatabase', None)
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env['PYTHONPATH'] = os.pathsep.join([root] + [p for p in env.get('PYTHONPATH', '').split(os.pathsep) if p])
+        result = subprocess.run([sys.executable, '-c', code], env=env, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, universal_newlines=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result
+
+    def test_import(self):
+        """Import PyFBA without the ModelSEED database, and check that we don't import the subpackages or glpk"""
+        result = self._run(_check)
+        elapsed, loaded = result.stdout.split("\n")[0:2]
+        self.assertEqual(loaded, "")
+        sys.stderr.write("import PyFBA took {:.4f} seconds\n".format(float(elapsed)))
+
+    def test_parse_without_shared_memory(self):
+        """Importing PyFBA.parse does not need multiprocessing.shared_memory, which is only in Python 3.8 and later"""
+        result = self._run(_check_parse)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+    def test_lazy_subpackages(self):
+        """The subpackages are imported when we use them"""
+        import PyFBA
+        self.assertIs(PyFBA.metabolism, sys.modules['PyFBA.metabolism'])
+        self.assertIn('lp', dir(PyFBA))
+        with self.assertRaises(AttributeError):
+            PyFBA.not_a_subpackage
+
+
+if __name__ == '__main__':
+    unittest.main()
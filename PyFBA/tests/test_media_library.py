@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import PyFBA
+
+"""
+A class to test the library of media
+"""
+
+
+class TestMediaLibrary(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.directory = tempfile.mkdtemp()
+        for name, compounds in [('glucose', ['D-Glucose', 'H2O']), ('acetate', ['Acetate', 'H2O'])]:
+            with open(os.path.join(self.directory, name + ".txt"), 'w') as out:
+                out.write("Compound\tName\tFormula\tCharge\n")
+                for c in compounds:
+                    out.write("cpd\t{}\t\t0\n".format(c))
+        self.library = PyFBA.parse.MediaLibrary(self.directory)
+
+    def tearDown(self):
+        """This method is called after every test_ method"""
+        shutil.rmtree(self.directory)
+
+    def test_medium(self):
+        """Test reading a medium from the library"""
+        self.assertEqual(self.library.names(), ['acetate', 'glucose'])
+        medium = self.library.medium('glucose')
+        self.assertEqual(medium.name, 'glucose')
+        self.assertIn(PyFBA.metabolism.Compound('D-Glucose', 'e'), medium)
+        self.assertEqual(medium, PyFBA.parse.read_media_file(os.path.join(self.directory, 'glucose.txt')))
+        self.assertIs(self.library.medium(os.path.join(self.directory, 'glucose.txt')), medium)
+        # the media share their compounds
+        water = [c for c in medium if c.name == 'H2O'][0]
+        self.assertIn(water, [c for c in self.library['acetate'] if c.name == 'H2O'])
+        self.assertNotIn('lactose', self.library)
+        self.assertRaises(IOError, self.library.medium, 'lactose')
+
+    def test_changed_file(self):
+        """Test that we read a media file again when it changes"""
+        medium = self.library.medium('glucose')
+        filename = os.path.join(self.directory, 'glucose.txt')
+        with open(filename, 'a') as out:
+            out.write("cpd\tFe2+\tFe\t2\n")
+        os.utime(filename, (time.time() + 10, time.time() + 10))
+        self.assertEqual(len(self.library.medium('glucose')), len(medium) + 1)
+
+    def test_fingerprint_and_bits(self):
+        """Test the fingerprints and bitsets of the media"""
+        glucose = self.library.medium('glucose')
+        self.assertEqual(glucose.fingerprint, PyFBA.parse.media_fingerprint(set(glucose)))
+        self.assertNotEqual(glucose.fingerprint, self.library.medium('acetate').fingerprint)
+        water = PyFBA.metabolism.compound_index(PyFBA.metabolism.Compound('H2O', 'e'))
+        self.assertTrue(glucose.bits & 1 << water)
+        self.assertEqual(glucose.bits, PyFBA.parse.media_bits(set(glucose)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+import PyFBA
+from PyFBA.tests.toy_model import toy_compound, toy_reaction
+
+"""
+A class to test screening the same reactions on several media
+"""
+
+
+class TestMediaScreen(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.compounds = {}
+        ae, ac, ce, cc, bc = [toy_compound(self.compounds, 'media screen ' + n, l)
+                              for n, l in [('a', 'e'), ('a', 'c'), ('c', 'e'), ('c', 'c'), ('b', 'c')]]
+        self.reactions = {}
+        # we can make b from a or from c, but only one of them is in each media
+        for r in [toy_reaction('screen_t1', ae, ac, '='), toy_reaction('screen_t2', ce, cc, '='),
+                  toy_reaction('screen_r1', ac, bc), toy_reaction('screen_r2', cc, bc)]:
+            self.reactions[r.name] = r
+        self.biomass = toy_reaction('BIOMASS_EQN', bc)
+        self.media_list = [{ae}, {ce}, set()]
+
+    def test_same_as_run_fba(self):
+        """Test that each media gives the same status, value and fluxes as running the fba on it"""
+        results = PyFBA.fba.screen_media(self.compounds, self.reactions, set(self.reactions), self.media_list,
+                                         self.biomass)
+        self.assertEqual(len(results), len(self.media_list))
+        self.assertEqual([r.growth for r in results], [True, True, False])
+        self.assertGreater(results[0].flux('screen_r1'), 0)
+        self.assertGreater(results[1].flux('screen_r2'), 0)
+        for media, result in zip(self.media_list, results):
+            status, value, growth = PyFBA.fba.run_fba(self.compounds, self.reactions, set(self.reactions), media,
+                                                      self.biomass)
+            fluxes = PyFBA.fba.reaction_fluxes()
+            self.assertEqual(result.status, status)
+            self.assertAlmostEqual(result.value, value, places=5)
+            self.assertEqual(result.growth, growth)
+            # the screen has uptake and secretion reactions for the compounds in all of the media
+            for r in set(fluxes) | set(result.fluxes):
+                self.assertAlmostEqual(result.fluxes.get(r, 0.0), fluxes.get(r, 0.0), places=5, msg=r)
+
+
+if __name__ == '__main__':
+    unittest.main()
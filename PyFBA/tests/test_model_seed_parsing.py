@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import sys
 import unittest
@@ -19,6 +20,14 @@ if not os.path.exists(MODELSEED_DIR):
     sys.exit(-1)
 
 
+def _reactions_in_worker(processes):
+    """
+    Parse the reactions in a worker of a multiprocessing.Pool, which can not start processes of its own
+    """
+    compounds, reactions = PyFBA.parse.model_seed.reactions(processes=processes)
+    return sorted((r, reactions[r].equation) for r in reactions)
+
+
 class TestModelSeedParsing(unittest.TestCase):
 
     def setUp(self):
@@ -94,6 +103,24 @@ class TestModelSeedParsing(unittest.TestCase):
         self.assertGreaterEqual(direction['>'], 12760)
         self.assertGreaterEqual(direction['='], 18608)
 
+    def test_reactions_in_parallel(self):
+        """Test that parsing the reactions in several processes gives the same reactions"""
+        compounds, reactions = PyFBA.parse.model_seed.reactions(processes=1)
+        pcompounds, preactions = PyFBA.parse.model_seed.reactions(processes=2)
+        self.assertEqual(list(reactions.keys()), list(preactions.keys()))
+        self.assertEqual(set(compounds.keys()), set(pcompounds.keys()))
+        for r in reactions:
+            self.assertEqual(reactions[r].equation, preactions[r].equation)
+            self.assertEqual(reactions[r].direction, preactions[r].direction)
+
+    def test_reactions_in_worker(self):
+        """Test that we parse the reactions in one process when we are in a worker of a multiprocessing.Pool"""
+        compounds, reactions = PyFBA.parse.model_seed.reactions(processes=1)
+        expected = sorted((r, reactions[r].equation) for r in reactions)
+        with multiprocessing.Pool(1) as pool:
+            for processes in (None, 2):
+                self.assertEqual(pool.apply(_reactions_in_worker, (processes,)), expected)
+
     def test_complexes(self):
         """Test parsing the complexes by parse.model_seed"""
         cmplxs = PyFBA.parse.model_seed.complexes()
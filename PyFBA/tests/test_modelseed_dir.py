@@ -0,0 +1,39 @@
+import os
+import unittest
+from unittest import mock
+
+import PyFBA
+
+"""
+A class to test that we tell the caller when the ModelSEED database is missing, instead of exiting
+"""
+
+
+class TestModelSeedDir(unittest.TestCase):
+
+    def _parsers(self):
+        model_seed = PyFBA.parse.model_seed
+        return [model_seed.compounds, model_seed.reactions, model_seed.complexes, model_seed.roles_ec,
+                model_seed.roles]
+
+    def test_unset(self):
+        """Test that every parser raises the IOError about the environment variable when it is not set"""
+        env = {k: v for k, v in os.environ.items() if k != 'ModelSEEDDatabase'}
+        with mock.patch.dict(os.environ, env, clear=True):
+            for parser in self._parsers():
+                with self.assertRaises(IOError) as cm:
+                    parser()
+                self.assertIn('ModelSEEDDatabase environment variable is not set', str(cm.exception))
+
+    def test_missing_directory(self):
+        """Test that every parser raises an IOError when the directory does not exist"""
+        missing = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'no such ModelSEED directory')
+        with mock.patch.dict(os.environ, {'ModelSEEDDatabase': missing}):
+            for parser in self._parsers():
+                with self.assertRaises(IOError) as cm:
+                    parser()
+                self.assertIn(missing, str(cm.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
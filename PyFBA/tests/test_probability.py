@@ -0,0 +1,93 @@
+import random
+import unittest
+
+import PyFBA
+
+"""
+A class to test the compound probabilities for gap-filling
+"""
+
+
+class TestProbability(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        rng = random.Random(38)
+        cpds = [PyFBA.metabolism.Compound('probability cpd{}'.format(i), rng.choice('ce')) for i in range(200)]
+        self.reactions = {}
+        for i in range(500):
+            r = PyFBA.metabolism.Reaction('prob{:04d}'.format(i))
+            # some reactions have nothing on one side
+            r.add_left_compounds(set(rng.sample(cpds, rng.randint(0, 4))))
+            r.add_right_compounds(set(rng.sample(cpds, rng.randint(1, 4))))
+            self.reactions[r.name] = r
+        self.reactions2run = set(rng.sample(sorted(self.reactions), 50))
+
+    def _old_scores(self, rids):
+        """
+        The scores the way we used to calculate them, with a set of compounds for each reaction
+        """
+        cpds = set()
+        for r in self.reactions2run:
+            cpds.update(self.reactions[r].all_compounds())
+        left, right = [], []
+        for r in rids:
+            for compounds, scores in ((self.reactions[r].left_compounds, left),
+                                      (self.reactions[r].right_compounds, right)):
+                if compounds:
+                    scores.append((1.0 * len(compounds) - len(compounds.difference(cpds))) / len(compounds))
+                else:
+                    scores.append(0)
+        return left, right
+
+    def _old_probability(self):
+        """
+        compound_probability without proteins, using the old scores
+        """
+        rtest = list(self.reactions)
+        left, right = self._old_scores(rtest)
+        pLR = dict(zip(rtest, left))
+        pRL = dict(zip(rtest, right))
+        cutoff = min(sum(pLR[r] for r in self.reactions2run) / len(self.reactions2run),
+                     sum(pRL[r] for r in self.reactions2run) / len(self.reactions2run))
+        return {r for r in self.reactions if r not in self.reactions2run and (pLR[r] > cutoff or pRL[r] > cutoff)}
+
+    def test_scores(self):
+        """Test that the scores are the same as the fraction of the compounds that are present"""
+        rids = sorted(self.reactions)
+        left, right = self._old_scores(rids)
+        new_left, new_right = PyFBA.gapfill.compound_scores(self.reactions, self.reactions2run, rids)
+        self.assertEqual(new_left, left)
+        self.assertEqual(new_right, right)
+        # a few reactions, in a different order
+        rids = rids[::-7]
+        left, right = self._old_scores(rids)
+        new_left, new_right = PyFBA.gapfill.compound_scores(self.reactions, self.reactions2run, rids)
+        self.assertEqual((new_left, new_right), (left, right))
+
+    def test_changed_reactions(self):
+        """Test that we score the reactions as they are now when they are replaced or changed"""
+        rids = sorted(self.reactions)
+        PyFBA.gapfill.compound_scores(self.reactions, self.reactions2run, rids)
+        present = self.reactions[sorted(self.reactions2run)[0]].right_compounds
+        # replace a reaction with one that only has present compounds on the left
+        r = PyFBA.metabolism.Reaction(rids[0])
+        r.add_left_compounds(set(present))
+        self.reactions[r.name] = r
+        # and change another so that it has only present compounds on the right
+        self.reactions[rids[1]].right_compounds = set(present)
+        left, right = self._old_scores(rids)
+        self.assertEqual((left[0], right[0]), (1.0, 0))
+        self.assertEqual(right[1], 1.0)
+        new_left, new_right = PyFBA.gapfill.compound_scores(self.reactions, self.reactions2run, rids)
+        self.assertEqual((new_left, new_right), (left, right))
+
+    def test_compound_probability(self):
+        """Test that compound_probability suggests the same reactions as before"""
+        suggested = PyFBA.gapfill.compound_probability(self.reactions, self.reactions2run, rxn_with_proteins=False)
+        self.assertEqual(suggested, self._old_probability())
+        self.assertTrue(suggested)
+
+
+if __name__ == '__main__':
+    unittest.main()
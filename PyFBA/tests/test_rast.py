@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import PyFBA
+
+"""
+A class to test reading RAST files
+"""
+
+
+class TestRast(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.directory = tempfile.mkdtemp()
+        self.files = []
+        for genome, functions in [('g1', ['Enolase (EC 4.2.1.11)', 'Thioredoxin / Glutaredoxin # a comment']),
+                                  ('g2', ['Enolase (EC 4.2.1.11)'])]:
+            filename = os.path.join(self.directory, genome + ".txt")
+            with open(filename, 'w') as out:
+                for i, f in enumerate(functions):
+                    out.write("fig|1.1.peg.{}\t{}\n".format(i, f))
+            self.files.append(filename)
+
+    def tearDown(self):
+        """This method is called after every test_ method"""
+        shutil.rmtree(self.directory)
+
+    def test_roles_of_function(self):
+        """Test splitting a function into roles"""
+        self.assertEqual(PyFBA.parse.roles_of_function('Thioredoxin / Glutaredoxin # a comment'),
+                         {'Thioredoxin', 'Glutaredoxin'})
+        self.assertEqual(PyFBA.parse.roles_of_function('Enolase; Enolase 2 @ Enolase 3'),
+                         {'Enolase', 'Enolase 2', 'Enolase 3'})
+        roles = PyFBA.parse.roles_of_function('Enolase')
+        roles.add('Changed')
+        self.assertEqual(PyFBA.parse.roles_of_function('Enolase'), {'Enolase'})
+
+    def test_stream_functions(self):
+        """Test streaming the functions from several files"""
+        records = list(PyFBA.parse.stream_functions(self.files))
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[1], ('g1', 'fig|1.1.peg.1', frozenset({'Thioredoxin', 'Glutaredoxin'})))
+        records = list(PyFBA.parse.stream_functions([('genome two', self.files[1])]))
+        self.assertEqual(records[0][0], 'genome two')
+
+    def test_genome_roles(self):
+        """Test reading the roles one genome at a time"""
+        genomes = list(PyFBA.parse.genome_roles(self.files))
+        self.assertEqual(genomes, [('g1', {'Enolase (EC 4.2.1.11)', 'Thioredoxin', 'Glutaredoxin'}),
+                                   ('g2', {'Enolase (EC 4.2.1.11)'})])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import itertools
+import os
+import random
+import tempfile
+import unittest
+
+import PyFBA
+
+
+class ReactionClustersTest(unittest.TestCase):
+    def setUp(self):
+        compounds = [PyFBA.metabolism.Compound('cluster test {}'.format(i), 'c') for i in range(8)]
+        self.reactions = {}
+        for name, cpds in [('r1', [0, 1, 2]), ('r2', [0, 1, 2, 3]), ('r3', [1, 2, 3]), ('r4', [5, 6]),
+                           ('r5', [5, 6, 7]), ('r6', [4])]:
+            r = PyFBA.metabolism.Reaction(name)
+            r.add_left_compounds({compounds[i] for i in cpds})
+            self.reactions[name] = r
+
+    def test_cluster_reactions(self):
+        clusters, number = PyFBA.gapfill.cluster_reactions(self.reactions, sorted(self.reactions), 0.5)
+        self.assertEqual(number, 3)
+        self.assertEqual(clusters['r1'], clusters['r2'])
+        self.assertEqual(clusters['r2'], clusters['r3'])
+        self.assertEqual(clusters['r4'], clusters['r5'])
+        self.assertNotEqual(clusters['r1'], clusters['r4'])
+        lista, listb = PyFBA.gapfill.optimize_split_by_rclust(['r4', 'r1', 'r5', 'r2', 'r3', 'r6'], clusters, 50)
+        self.assertEqual(lista, ['r1', 'r2', 'r3'])
+
+    def _partition(self, clusters):
+        members = {}
+        for r, c in clusters.items():
+            members.setdefault(c, set()).add(r)
+        return {frozenset(m) for m in members.values()}
+
+    def _dense_reactions(self):
+        """
+        Reactions of four or five compounds, most of them made from an earlier one by swapping, adding or removing one
+        compound, so there are chains of close reactions. Any two of them that are closer than 0.5 have a Jaccard
+        similarity of at least 0.6.
+        """
+        rng = random.Random(38)
+        compounds = [PyFBA.metabolism.Compound('dense cluster test {}'.format(i), 'c') for i in range(40)]
+        sets = []
+        for i in range(150):
+            if not sets or rng.random() < 0.3:
+                cpds = set(rng.sample(compounds, rng.randint(4, 5)))
+            else:
+                cpds = set(rng.choice(sets))
+                if len(cpds) == 5 and rng.random() < 0.3:
+                    cpds.remove(rng.choice(sorted(cpds, key=str)))
+                else:
+                    if len(cpds) == 5 or rng.random() >= 0.3:
+                        cpds.remove(rng.choice(sorted(cpds, key=str)))
+                    cpds.add(rng.choice([c for c in compounds if c not in cpds]))
+            sets.append(frozenset(cpds))
+        reactions = {}
+        for i, cpds in enumerate(sets):
+            r = PyFBA.metabolism.Reaction('dense{:03d}'.format(i))
+            r.add_left_compounds(set(cpds))
+            reactions[r.name] = r
+        return reactions
+
+    def test_single_linkage(self):
+        """Test that the clusters are the same as single linkage clustering of every pair of reactions"""
+        reactions = self._dense_reactions()
+        rids = sorted(reactions)
+        parent = {r: r for r in rids}
+
+        def find(r):
+            while parent[r] != r:
+                r = parent[r]
+            return r
+
+        for r1, r2 in itertools.combinations(rids, 2):
+            c1, c2 = reactions[r1].left_compounds, reactions[r2].left_compounds
+            similarity = 1.0 * len(c1 & c2) / len(c1 | c2)
+            if similarity > 0.5:
+                # so with 32 bands of 2 hashes LSH misses each close pair with a chance of at most 0.64 ** 32
+                self.assertGreaterEqual(similarity, 0.6)
+                parent[find(r1)] = find(r2)
+        expected = self._partition({r: find(r) for r in rids})
+        self.assertGreater(len(rids), len(expected))
+        self.assertGreater(max(len(m) for m in expected), 10)
+
+        clusters, number = PyFBA.gapfill.cluster_reactions(reactions, rids, 0.5)
+        self.assertEqual(self._partition(clusters), expected)
+        self.assertEqual(number, len(expected))
+
+        # only comparing with the first reaction in each bucket can't join more reactions
+        clusters, fewer = PyFBA.gapfill.cluster_reactions(reactions, rids, 0.5, max_bucket_size=1)
+        self.assertGreaterEqual(fewer, number)
+
+    def test_write_clusters(self):
+        clusters, number = PyFBA.gapfill.cluster_reactions(self.reactions)
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            PyFBA.gapfill.write_clusters(clusters, filename)
+            self.assertEqual(PyFBA.gapfill.read_clusters(filename), clusters)
+        finally:
+            os.remove(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
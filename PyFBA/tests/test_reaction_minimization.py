@@ -0,0 +1,203 @@
+import itertools
+import unittest
+from unittest import mock
+
+import PyFBA
+from PyFBA.gapfill import reaction_minimization
+from PyFBA.tests.toy_model import toy_compound, toy_reaction
+
+"""
+A class to test minimizing the reactions that we need for growth
+"""
+
+
+class TestEarlyStopping(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.growth_media = [frozenset(['growth 0']), frozenset(['growth 1'])]
+        self.no_growth_media = [frozenset(['no growth 0']), frozenset(['no growth 1'])]
+        self.left = frozenset(['left'])
+        self.right = frozenset(['right'])
+
+    def _outcomes(self):
+        """
+        Every combination of growth and no growth of the two halves on the four media
+
+        :return: a dict of (reactions, media) and whether the model grows
+        """
+        media = self.growth_media + self.no_growth_media
+        for grows in itertools.product([False, True], repeat=2 * len(media)):
+            yield dict(zip(itertools.product([self.left, self.right], media), grows))
+
+    def _run(self, outcomes, choose, minimum_tp):
+        """
+        Test the halves with and without stopping early, using the outcomes instead of running the fba
+
+        :return: the decision when we stop early, the decision with all the media, and the number of fba we ran early
+        """
+        calls = []
+
+        def run_fba(compounds, reactions, reactions2run, media, biomass_eqn):
+            calls.append(reactions2run)
+            return 'opt', 0.0, outcomes[(reactions2run, media)]
+
+        decide = lambda left, right: choose(left, right, minimum_tp)
+        with mock.patch.object(PyFBA.fba, 'run_fba', run_fba):
+            early, counts = reaction_minimization._test_reaction_sets([self.left, self.right], {}, {},
+                                                                     self.growth_media, self.no_growth_media, None,
+                                                                     decide)
+            early_calls = len(calls)
+            complete, counts = reaction_minimization._test_reaction_sets([self.left, self.right], {}, {},
+                                                                        self.growth_media, self.no_growth_media, None)
+        return early, choose(counts[0], counts[1], minimum_tp), early_calls
+
+    def test_choose_half(self):
+        """Test that stopping early chooses the same half as testing all the media"""
+        stopped = 0
+        for outcomes in self._outcomes():
+            for minimum_tp in (0, 1, 2):
+                early, complete, calls = self._run(outcomes, reaction_minimization._choose_half, minimum_tp)
+                self.assertIsNotNone(complete)
+                self.assertEqual(early, complete)
+                if calls < 8:
+                    stopped += 1
+        self.assertGreater(stopped, 0)
+
+    def test_choose_uneven(self):
+        """Test that stopping early chooses the same part of an uneven split as testing all the media"""
+        for outcomes in self._outcomes():
+            for minimum_tp in (0, 1, 2):
+                early, complete, calls = self._run(outcomes, reaction_minimization._choose_uneven, minimum_tp)
+                self.assertEqual(early, complete)
+
+    def test_ties(self):
+        """Test that when both halves are as good we choose the right half, whether or not we stop early"""
+        left = reaction_minimization._PrecisionRecall(self.growth_media, self.no_growth_media)
+        right = reaction_minimization._PrecisionRecall(self.growth_media, self.no_growth_media)
+        for counts in (left, right):
+            counts.add(True, True)
+            counts.add(True, True)
+            counts.add(False, False)
+        self.assertIsNone(reaction_minimization._choose_half(left, right, 1))
+        left.add(False, True)
+        right.add(False, True)
+        self.assertEqual(reaction_minimization._choose_half(left, right, 1), 'right')
+
+    def test_minimum_tp(self):
+        """Test that we don't choose a half until we know it has more than minimum_tp true positives"""
+        left = reaction_minimization._PrecisionRecall(self.growth_media, self.no_growth_media)
+        right = reaction_minimization._PrecisionRecall(self.growth_media, self.no_growth_media)
+        left.add(True, True)
+        right.add(True, False)
+        # the right half can not get more than 1 true positive, but the left might still only get 1
+        self.assertIsNone(reaction_minimization._choose_half(left, right, 1))
+        left.add(True, True)
+        self.assertEqual(reaction_minimization._choose_half(left, right, 1), 'left')
+        # with a minimum of 2 neither half can be above it
+        self.assertEqual(reaction_minimization._choose_half(left, right, 2), 'neither')
+
+
+class _RequiredReactions:
+    """
+    A stand in for PyFBA.fba.GrowthTester that grows if all of the required reactions are there
+    """
+
+    required = set()
+
+    def __init__(self, compounds, reactions, media, biomass_eqn):
+        self.solves = 0
+        self.saved = 0
+
+    def grows(self, reactions_to_run):
+        self.solves += 1
+        _RequiredReactions.tests += 1
+        return self.required.issubset(reactions_to_run)
+
+
+class TestGroupTesting(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.optional = ['rxn{:05d}'.format(i) for i in range(200)]
+        _RequiredReactions.tests = 0
+
+    def _group_test(self, required, **kwargs):
+        """
+        Run the group testing with the required reactions hidden in the growth tester
+
+        :return: the reactions that group testing found, and the number of tests it needed
+        """
+        _RequiredReactions.required = set(required)
+        _RequiredReactions.tests = 0
+        with mock.patch.object(PyFBA.fba, 'GrowthTester', _RequiredReactions):
+            found = PyFBA.gapfill.reaction_minimization.group_test_reactions({'base'}, set(self.optional), {}, {},
+                                                                             set(), None, **kwargs)
+        return found, _RequiredReactions.tests
+
+    def test_group_testing(self):
+        """Test that group testing finds the required reactions with fewer tests than reactions"""
+        required = {'rxn00003', 'rxn00077', 'rxn00078', 'rxn00150', 'rxn00199'}
+        found, tests = self._group_test(required)
+        self.assertEqual(found, required)
+        self.assertLess(tests, len(self.optional))
+        found, tests = self._group_test(required, expected_required=5)
+        self.assertEqual(found, required)
+        self.assertLess(tests, len(self.optional) / 4)
+
+    def test_nothing_required(self):
+        """Test group testing when the base reactions grow on their own"""
+        found, tests = self._group_test(set())
+        self.assertEqual(found, set())
+        self.assertLess(tests, len(self.optional))
+
+    def test_everything_required(self):
+        """Test group testing when every optional reaction is required"""
+        self.optional = self.optional[:10]
+        found, tests = self._group_test(self.optional)
+        self.assertEqual(found, set(self.optional))
+
+
+class TestFluxSupport(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.compounds = {}
+        ae, ac, bc, xc, yc, zc, wc = [toy_compound(self.compounds, 'flux test ' + n, l)
+                                      for n, l in [('a', 'e'), ('a', 'c'), ('b', 'c'), ('x', 'c'), ('y', 'c'),
+                                                   ('z', 'c'), ('w', 'c')]]
+        self.reactions = {}
+        # the only way to make b from a is the transport and flux_r1. Nothing makes x, and nothing uses w
+        for r in [toy_reaction('flux_t1', ae, ac, '='), toy_reaction('flux_r1', ac, bc),
+                  toy_reaction('flux_r2', xc, yc), toy_reaction('flux_r3', yc, zc), toy_reaction('flux_r4', ac, wc),
+                  toy_reaction('flux_r5', xc, bc), toy_reaction('flux_r6', zc, bc)]:
+            self.reactions[r.name] = r
+        self.biomass = toy_reaction('BIOMASS_EQN', bc)
+        self.media = {ae}
+
+    def test_flux_support_grows(self):
+        """Test that the optional reactions with flux still grow"""
+        status, value, growth = PyFBA.fba.run_fba(self.compounds, self.reactions, set(self.reactions), self.media,
+                                                  self.biomass)
+        self.assertTrue(growth)
+        fluxes = PyFBA.fba.reaction_fluxes()
+        support = {r for r in self.reactions if fluxes.get(r, 0.0) != 0.0}
+        self.assertLess(len(support), len(self.reactions))
+        status, value, growth = PyFBA.fba.run_fba(self.compounds, self.reactions, support, self.media, self.biomass)
+        self.assertTrue(growth)
+
+    def test_same_minimal_set(self):
+        """Test that starting from the reactions with flux gives the same reactions as starting from all of them"""
+        for method in ('bisection', 'group_testing'):
+            with_flux = PyFBA.gapfill.minimize_additional_reactions(set(), set(self.reactions), self.compounds,
+                                                                    self.reactions, self.media, self.biomass,
+                                                                    method=method, use_flux=True)
+            without_flux = PyFBA.gapfill.minimize_additional_reactions(set(), set(self.reactions), self.compounds,
+                                                                       self.reactions, self.media, self.biomass,
+                                                                       method=method, use_flux=False)
+            self.assertEqual(with_flux, {'flux_t1', 'flux_r1'})
+            self.assertEqual(with_flux, without_flux)
+
+
+if __name__ == '__main__':
+    unittest.main()
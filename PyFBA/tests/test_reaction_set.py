@@ -0,0 +1,52 @@
+import pickle
+import unittest
+
+import PyFBA
+
+"""
+A class to test the ReactionSet bitset
+"""
+
+
+class TestReactionSet(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.left = PyFBA.metabolism.ReactionSet(['rxn00001', 'rxn00002', 'rxn00003'])
+        self.right = PyFBA.metabolism.ReactionSet({'rxn00003', 'rxn00004'})
+
+    def test_membership(self):
+        """Test iterating over and looking things up in a ReactionSet"""
+        self.assertEqual(len(self.left), 3)
+        self.assertIn('rxn00001', self.left)
+        self.assertNotIn('rxn00004', self.left)
+        self.assertNotIn('not a reaction we have ever seen', self.left)
+        self.assertEqual(set(self.left), {'rxn00001', 'rxn00002', 'rxn00003'})
+        self.assertFalse(PyFBA.metabolism.ReactionSet())
+
+    def test_set_operations(self):
+        """Test union, intersection and difference"""
+        self.assertEqual(self.left | self.right, {'rxn00001', 'rxn00002', 'rxn00003', 'rxn00004'})
+        self.assertEqual(self.left & self.right, {'rxn00003'})
+        self.assertEqual(self.left - self.right, {'rxn00001', 'rxn00002'})
+        self.assertEqual(self.left.union(['rxn00005']), {'rxn00001', 'rxn00002', 'rxn00003', 'rxn00005'})
+        self.assertEqual({'rxn00001', 'rxn00006'} - self.left, {'rxn00006'})
+        self.assertTrue(PyFBA.metabolism.ReactionSet(['rxn00003']).issubset(self.right))
+        self.assertTrue(self.left.isdisjoint({'rxn00004'}))
+
+    def test_hash(self):
+        """Test that equal sets hash the same and survive pickling"""
+        same = PyFBA.metabolism.ReactionSet(['rxn00003', 'rxn00002', 'rxn00001'])
+        self.assertEqual(self.left, same)
+        self.assertEqual(hash(self.left), hash(same))
+        self.assertEqual(len({self.left, same, self.right}), 2)
+        self.assertEqual(pickle.loads(pickle.dumps(self.left)), self.left)
+        # a ReactionSet and a frozenset with the same reactions are equal, so they must find each other in a dict
+        frozen = frozenset(['rxn00001', 'rxn00002', 'rxn00003'])
+        self.assertEqual(hash(self.left), hash(frozen))
+        self.assertEqual({frozen: 1}[self.left], 1)
+        self.assertIn(frozen, {self.left})
+
+
+if __name__ == '__main__':
+    unittest.main()
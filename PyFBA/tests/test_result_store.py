@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import PyFBA
+
+"""
+A class to test the persistent store of fba results
+"""
+
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.directory = tempfile.mkdtemp()
+        self.store = PyFBA.fba.ResultStore(os.path.join(self.directory, "results.sqlite"), store_fluxes=True)
+        self.result = PyFBA.fba.FBAResult('opt', 10.0, True, ['A (location: c)'], ['rxn1', 'BIOMASS_EQN'],
+                                          [10.0, 10.0], [0.5], [0.0, 0.0])
+
+    def tearDown(self):
+        """This method is called after every test_ method"""
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_get_and_put(self):
+        """Test storing and finding results"""
+        self.assertIsNone(self.store.get('one'))
+        self.store.put('one', ('opt', 0.0, False))
+        self.assertEqual(self.store.get('one'), ('opt', 0.0, False))
+        self.assertIsNone(self.store.get('one', solution=True))
+        self.store.put('two', self.result)
+        result = self.store.get('two', solution=True)
+        self.assertEqual(tuple(result), ('opt', 10.0, True))
+        self.assertEqual(result.fluxes, self.result.fluxes)
+        self.assertEqual(result.shadow_prices, {'A (location: c)': 0.5})
+        stats = self.store.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['results']), (2, 2, 2))
+
+    def test_persistent(self):
+        """Test that the results are still there when we open the store again"""
+        self.store.put('one', self.result)
+        with PyFBA.fba.ResultStore(self.store.path) as store:
+            self.assertEqual(tuple(store.get('one')), ('opt', 10.0, True))
+            self.assertEqual(store.get('one', solution=True).fluxes, self.result.fluxes)
+
+    def test_evict(self):
+        """Test removing the results that were used longest ago"""
+        for key in ['one', 'two', 'three']:
+            self.store.put(key, ('opt', 1.0, True))
+        self.store.get('one')
+        size = self.store.size()
+        self.assertEqual(self.store.evict(size - 1), 1)
+        self.assertIsNone(self.store.get('two'))
+        self.assertIsNotNone(self.store.get('one'))
+        self.assertEqual(len(self.store), 2)
+
+    def test_key(self):
+        """Test that the key changes when the bounds of a reaction change"""
+        try:
+            import glpk
+        except ImportError:
+            self.skipTest("glpk is not installed")
+        a = PyFBA.metabolism.Compound('A', 'e')
+        r = PyFBA.metabolism.Reaction('rxn1')
+        r.add_left_compounds({a})
+        r.set_left_compound_abundance(a, 1)
+        biomass = PyFBA.metabolism.Reaction('BIOMASS')
+        key = PyFBA.fba.fba_key({'rxn1': r}, {'rxn1'}, {a}, biomass)
+        self.assertEqual(key, PyFBA.fba.fba_key({'rxn1': r}, {'rxn1'}, {a}, biomass))
+        r.upper_bound = 10
+        self.assertNotEqual(key, PyFBA.fba.fba_key({'rxn1': r}, {'rxn1'}, {a}, biomass))
+        self.assertNotEqual(key, PyFBA.fba.fba_key({'rxn1': r}, {'rxn1'}, set(), biomass))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import PyFBA
+
+"""
+A class to test reading and caching the subsystems
+"""
+
+
+class TestSubsystems(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.directory = tempfile.mkdtemp()
+        self.old_cache = os.environ.get('PYFBA_CACHE_DIR')
+        os.environ['PYFBA_CACHE_DIR'] = os.path.join(self.directory, 'cache')
+        self.ssfile = os.path.join(self.directory, 'SS_functions.txt')
+        with open(self.ssfile, 'w') as out:
+            out.write("#Function\tSubsystem\tClassification 1\tClassification 2\n")
+            out.write("Role A / Role B\tSubsystem 1\tCategory\tSubcategory\n")
+            out.write("Role C\tSubsystem 1\tCategory\t\n")
+            out.write("Role A\tSubsystem 2\t\t\n")
+
+    def tearDown(self):
+        """This method is called after every test_ method"""
+        if self.old_cache is None:
+            del os.environ['PYFBA_CACHE_DIR']
+        else:
+            os.environ['PYFBA_CACHE_DIR'] = self.old_cache
+        PyFBA.parse.subsystems._indexes.clear()
+        shutil.rmtree(self.directory)
+
+    def test_subsystem_index(self):
+        """Test reading the subsystems, and reading them again from the cache"""
+        index = PyFBA.parse.subsystem_index(self.ssfile)
+        self.assertEqual(index.subsystems, {'Subsystem 1': {'Role A', 'Role B', 'Role C'}, 'Subsystem 2': {'Role A'}})
+        self.assertEqual(index.role_subsystems['Role A'], {'Subsystem 1', 'Subsystem 2'})
+        self.assertEqual(index.roles['Role C'], {('Category', 'Unknown', 'Subsystem 1')})
+        self.assertIs(PyFBA.parse.subsystem_index(self.ssfile), index)
+        self.assertEqual(len(os.listdir(os.environ['PYFBA_CACHE_DIR'])), 1)
+
+        PyFBA.parse.subsystems._indexes.clear()
+        cached = PyFBA.parse.subsystem_index(self.ssfile)
+        self.assertIsNot(cached, index)
+        self.assertEqual(cached.roles, index.roles)
+
+    def test_roles_to_subsystem(self):
+        """Test finding the subsystems for some roles"""
+        ss = PyFBA.parse.roles_to_subsystem({'not a role we have'})
+        self.assertEqual(ss, {'not a role we have': {('Unknown', 'Unknown', 'Unknown')}})
+
+
+if __name__ == '__main__':
+    unittest.main()
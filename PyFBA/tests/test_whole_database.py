@@ -0,0 +1,57 @@
+import unittest
+
+import PyFBA
+from PyFBA.tests.toy_model import toy_compound, toy_reaction
+
+"""
+A class to test gapfilling against the whole database with one lp
+"""
+
+
+class TestWholeDatabase(unittest.TestCase):
+
+    def setUp(self):
+        """This method is called before every test_ method"""
+        self.compounds = {}
+        ae, ac, bc, be = [toy_compound(self.compounds, 'whole database ' + n, l)
+                          for n, l in [('a', 'e'), ('a', 'c'), ('b', 'c'), ('b', 'e')]]
+        self.reactions = {}
+        # we can take up a, and make b from it with either wdb_r1 or wdb_r2
+        for r in [toy_reaction('wdb_t1', ae, ac), toy_reaction('wdb_r1', ac, bc), toy_reaction('wdb_r2', ac, bc),
+                  toy_reaction('wdb_loop', bc, ac, '='), toy_reaction('wdb_t2', be, bc)]:
+            self.reactions[r.name] = r
+        self.biomass = toy_reaction('BIOMASS_EQN', bc)
+        self.media = {ae}
+        self.model = {'wdb_t1'}
+
+    def test_suggest(self):
+        """Test that the suggestions make the model grow"""
+        suggested = PyFBA.gapfill.suggest_from_whole_database(self.compounds, self.reactions, self.model,
+                                                              self.media, self.biomass)
+        self.assertTrue(suggested)
+        self.assertNotIn('wdb_t1', suggested)
+        status, value, growth = PyFBA.fba.run_fba(self.compounds, self.reactions, self.model | suggested,
+                                                  self.media, self.biomass)
+        self.assertTrue(growth)
+
+    def test_costs(self):
+        """Test that we choose the cheapest reaction"""
+        # wdb_loop can also make b from a, so we make it expensive
+        suggested = PyFBA.gapfill.suggest_from_whole_database(self.compounds, self.reactions, self.model,
+                                                              self.media, self.biomass,
+                                                              reaction_costs={'wdb_r1': 5.0, 'wdb_r2': 1.0, 'wdb_loop': 10.0})
+        self.assertEqual(suggested, {'wdb_r2'})
+        suggested = PyFBA.gapfill.suggest_from_whole_database(self.compounds, self.reactions, self.model,
+                                                              self.media, self.biomass,
+                                                              reaction_costs={'wdb_r1': 1.0, 'wdb_r2': 5.0, 'wdb_loop': 10.0})
+        self.assertEqual(suggested, {'wdb_r1'})
+
+    def test_no_growth(self):
+        """Test that we suggest nothing when nothing in the database can make the model grow"""
+        suggested = PyFBA.gapfill.suggest_from_whole_database(self.compounds, self.reactions, self.model,
+                                                              set(), self.biomass)
+        self.assertEqual(suggested, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
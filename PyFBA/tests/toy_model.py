@@ -0,0 +1,51 @@
+import PyFBA
+
+"""
+Make the compounds and reactions of the small models that we test the fba and gap-filling on
+"""
+
+
+def toy_compound(compounds, name, location):
+    """
+    Make a compound and add it to the compounds dict
+
+    :param compounds: The compounds dict, which we add to
+    :type compounds: dict
+    :param name: The name of the compound. Use a name that is only in your tests
+    :type name: str
+    :param location: The location of the compound, e.g. 'c' or 'e'
+    :type location: str
+    :return: The compound
+    :rtype: PyFBA.metabolism.Compound
+    """
+    c = PyFBA.metabolism.Compound(name, location)
+    compounds[str(c)] = c
+    return c
+
+
+def toy_reaction(name, left, right=None, direction='>'):
+    """
+    Make a reaction that converts one of a compound to one of another. The compounds know that they are in the
+    reaction.
+
+    :param name: The name of the reaction
+    :type name: str
+    :param left: The compound on the left
+    :type left: PyFBA.metabolism.Compound
+    :param right: The compound on the right, if there is one
+    :type right: PyFBA.metabolism.Compound
+    :param direction: The direction of the reaction
+    :type direction: str
+    :return: The reaction
+    :rtype: PyFBA.metabolism.Reaction
+    """
+    r = PyFBA.metabolism.Reaction(name)
+    r.add_left_compounds({left})
+    r.set_left_compound_abundance(left, 1)
+    if right is not None:
+        r.add_right_compounds({right})
+        r.set_right_compound_abundance(right, 1)
+    r.set_direction(direction)
+    for c in r.all_compounds():
+        c.add_reactions({name})
+    return r
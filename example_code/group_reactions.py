@@ -1,6 +1,9 @@
 """
 Given a set of reactions (e.g. all of our biochemistry) can we come up with some sane groups of reactions?
 This should segregate reactions based on common compounds, but not those that are present in everything (e.g. H2O)
+
+By default we use PyFBA.gapfill.cluster_reactions. The -f and -d options compare every pair of reactions, and are
+only practical for small sets of reactions.
 """
 import argparse
 import sys
@@ -169,27 +172,27 @@ def read_distance_calculate_clusters(filename, reactions, threshold):
     return cluster, current_cluster - 1
 
 
-def group_reactions(reactions, rcts, compound_threshold, verbose=False):
+def group_reactions(reactions, rcts, threshold, verbose=False):
     """
-    Group the reactions based on the connectivity of compounds. Only compounds with a distance < threshold are
-    considered and we use greedy clustering (ie. if any compound is in a group we add it).
+    Group the reactions based on the connectivity of compounds. Reactions with a distance < threshold are
+    joined using single linkage clustering (ie. if any reaction in a group is close we add it).
 
     The distance is calculated using the Jaccard distance (appropriate for two sets) - the length of the intersection/
-    the length of the union
+    the length of the union. We use PyFBA.gapfill.cluster_reactions, which only compares reactions that are likely to
+    be close, so this works for the whole database.
 
     :param rcts: A list of the reactions in reactions
     :type rcts: list
     :param reactions: the reactions dictionary
     :type reactions: dict
-    :param compound_threshold: The threshold for the number of reactions a compound is in
-    :type compound_threshold: int
+    :param threshold: The threshold for the distance between reactions
+    :type threshold: float
     :param verbose: Whether to print out more stuff
     :type verbose: bool
     :return: A hash of rxn ids and the group they are in and the number of clusters
     :rtype: (dict, int)
     """
-    d = calculate_distances(reactions, verbose)
-    return calculate_clusters(rcts, d, compound_threshold)
+    return PyFBA.gapfill.cluster_reactions(reactions, rcts, threshold, verbose=verbose)
 
 
 def read_distance_file(dist_file, threshold):
@@ -227,6 +230,8 @@ if __name__ == "__main__":
     parser.add_argument('-c', help="Count the number of reactions in clusters with different threshold sizes",
                         action='store_true')
     parser.add_argument('-t', help="Threshold for clustering. Default = 0.5", type=float, default=0.5)
+    parser.add_argument('-b', help="Write the clusters to this binary file for PyFBA.gapfill.read_clusters")
+    parser.add_argument('-v', help="Verbose output", action='store_true')
     args = parser.parse_args()
 
     compounds, allreactions, enzymes = PyFBA.parse.model_seed.compounds_reactions_enzymes()
@@ -258,6 +263,9 @@ if __name__ == "__main__":
         for c in clusters:
             print("\t".join([args.d, c, str(clusters[c])]))
     else:
-        clusters = group_reactions(allreactions, reaction_keys, args.t)
-        for c in clusters:
-            print("\t".join([c, str(clusters[c])]))
+        clusters, cluster_len = group_reactions(allreactions, reaction_keys, args.t, args.v)
+        if args.b:
+            PyFBA.gapfill.write_clusters(clusters, args.b)
+        else:
+            for c in clusters:
+                print("\t".join([c, str(clusters[c])]))
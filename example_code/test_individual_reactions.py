@@ -44,6 +44,5 @@ if __name__ == '__main__':
     for r in ori_reactions:
         reactions_to_run = copy.copy(ori_reactions)
         reactions_to_run.remove(r)
-        reactions = PyFBA.fba.remove_uptake_and_secretion_reactions(reactions)
         status, value, growth = PyFBA.fba.run_fba(compounds, reactions, reactions_to_run, media, biomass_eqn)
         print("{}\t{}".format(r, growth))